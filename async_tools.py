@@ -0,0 +1,144 @@
+"""Asyncio counterparts of the deterministic tools.
+
+Every tool in `dataops`, `mlops`, `vizops` and `reviewer` blocks; awaiting the `*_async`
+version here keeps the agent's event loop free while the work runs elsewhere:
+- DB tools run on a bounded thread pool (`async_tools.db_workers`). `execute_sql_async`
+  sets a server-side `statement_timeout` and, when the awaiting task is cancelled or
+  times out, cancels the query in Postgres with `pg_cancel_backend`.
+- File tools (pandas over CSV artifacts) run on a separate bounded thread pool
+  (`async_tools.file_workers`) so they cannot starve the DB pool.
+- CPU tools (training, tuning, scoring, bootstrap, charts) run on a spawn process pool
+  (`async_tools.cpu_workers`). A timeout or cancellation abandons the result; a task
+  that already started runs to completion in its worker.
+
+Usage:
+    paths = await asyncio.gather(execute_sql_async(q1, timeout=60), execute_sql_async(q2))
+"""
+
+import asyncio
+import atexit
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import dataops
+import mlops
+import reviewer
+import vizops
+from orchestrator import CONFIG, process_pool, console, _call_tool
+from tracing import current_span
+
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+def _executor(kind: str):
+    """Returns the shared executor for a tool kind ("db", "file" or "cpu"), creating it on first use."""
+    with _EXECUTORS_LOCK:
+        if kind not in _EXECUTORS:
+            async_config = CONFIG.get("async_tools", {})
+            if kind == "cpu":
+                _EXECUTORS[kind] = process_pool(async_config.get("cpu_workers") or os.cpu_count())
+            else:
+                _EXECUTORS[kind] = ThreadPoolExecutor(
+                    max_workers=async_config.get(f"{kind}_workers", 8),
+                    thread_name_prefix=f"async-{kind}"
+                )
+        return _EXECUTORS[kind]
+
+def shutdown_executors(wait: bool = True):
+    """Shuts down the shared executors (they are recreated on next use)."""
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+atexit.register(shutdown_executors)
+
+async def _run_tool(func, kind: str, args: tuple, kwargs: dict, timeout: float = None):
+    loop = asyncio.get_running_loop()
+    if kind == "cpu":
+        # Spawned workers adopt this run directory through the pool initializer (orchestrator.process_pool)
+        call = functools.partial(_call_tool, func, list(args), kwargs, func.__name__, current_span().key)
+    else:
+        # Carry the caller's trace span into the worker thread
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await asyncio.wait_for(loop.run_in_executor(_executor(kind), call), timeout)
+
+def _async_tool(func, kind: str):
+    """Wraps a blocking tool as a coroutine function with an optional `timeout` (seconds)."""
+    @functools.wraps(func)
+    async def wrapper(*args, timeout: float = None, **kwargs):
+        return await _run_tool(func, kind, args, kwargs, timeout)
+    wrapper.__doc__ = f"Async version of `{func.__module__}.{func.__name__}` ({kind} executor).\n\n{func.__doc__ or ''}"
+    return wrapper
+
+async def execute_sql_async(query: str, timeout: float = None) -> str:
+    """
+    Runs a SQL query without blocking the event loop and returns the path to the saved CSV result.
+
+    Args:
+        query: A valid SQL SELECT statement.
+        timeout: Seconds before the query is cancelled (default: database.statement_timeout_ms).
+
+    Returns:
+        str: File path to the saved CSV containing the query results.
+    """
+    if timeout is None:
+        timeout_ms = CONFIG.get("database", {}).get("statement_timeout_ms")
+        timeout = timeout_ms / 1000 if timeout_ms else None
+    backend = {"pid": None, "cancelled": False}
+
+    def on_backend_pid(pid):
+        backend["pid"] = pid
+        if backend["cancelled"]:
+            raise RuntimeError("Query cancelled before it started.")
+
+    def run():
+        return dataops._execute_sql(query, int(timeout * 1000) if timeout else None, on_backend_pid)
+
+    loop = asyncio.get_running_loop()
+    try:
+        call = functools.partial(contextvars.copy_context().run, run)
+        return await asyncio.wait_for(loop.run_in_executor(_executor("db"), call), timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        backend["cancelled"] = True
+        if backend["pid"] is not None:
+            # The worker thread is still blocked on the query; stop it server-side
+            try:
+                await asyncio.shield(loop.run_in_executor(None, dataops.cancel_backend, backend["pid"]))
+            except Exception as e:
+                console.print(f"[yellow]Could not cancel backend {backend['pid']}:[/yellow] {e}")
+        raise
+
+# DB tools
+get_table_schema_async = _async_tool(dataops.get_table_schema, "db")
+extract_table_async = _async_tool(dataops.extract_table, "db")
+sample_sql_async = _async_tool(dataops.sample_sql, "db")
+
+# File tools
+profile_dataset_async = _async_tool(dataops.profile_dataset, "file")
+join_datasets_async = _async_tool(dataops.join_datasets, "file")
+create_derived_feature_async = _async_tool(dataops.create_derived_feature, "file")
+aggregate_dataset_async = _async_tool(dataops.aggregate_dataset, "file")
+extract_date_features_async = _async_tool(dataops.extract_date_features, "file")
+bin_numeric_feature_async = _async_tool(dataops.bin_numeric_feature, "file")
+split_data_time_series_async = _async_tool(mlops.split_data_time_series, "file")
+
+# CPU tools
+train_model_async = _async_tool(mlops.train_model, "cpu")
+run_backtest_async = _async_tool(mlops.run_backtest, "cpu")
+optimize_hyperparameters_async = _async_tool(mlops.optimize_hyperparameters, "cpu")
+score_population_async = _async_tool(mlops.score_population, "cpu")
+explain_predictions_async = _async_tool(mlops.explain_predictions, "cpu")
+monitor_drift_async = _async_tool(mlops.monitor_drift, "cpu")
+bootstrap_metrics_async = _async_tool(reviewer.bootstrap_metrics, "cpu")
+compare_models_async = _async_tool(reviewer.compare_models, "cpu")
+plot_roc_curve_async = _async_tool(vizops.plot_roc_curve, "cpu")
+plot_confusion_matrix_async = _async_tool(vizops.plot_confusion_matrix, "cpu")
+plot_feature_importance_async = _async_tool(vizops.plot_feature_importance, "cpu")
+plot_calibration_curve_async = _async_tool(vizops.plot_calibration_curve, "cpu")
+plot_shap_summary_async = _async_tool(vizops.plot_shap_summary, "cpu")
+plot_drift_summary_async = _async_tool(vizops.plot_drift_summary, "cpu")
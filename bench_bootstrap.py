@@ -0,0 +1,52 @@
+import time
+import numpy as np
+from sklearn.metrics import roc_auc_score
+from rich.console import Console
+from rich.table import Table
+import reviewer
+
+console = Console()
+
+def naive_bootstrap(y_true, y_prob, n_resamples, seed=42):
+    """Reference implementation: one roc_auc_score call per resample."""
+    rng = np.random.default_rng(seed)
+    n = len(y_true)
+    aucs = []
+    for _ in range(n_resamples):
+        idx = rng.integers(0, n, n)
+        aucs.append(roc_auc_score(y_true[idx], y_prob[idx]))
+    return np.array(aucs)
+
+def benchmark(n_samples: int = 200_000, n_resamples: int = 1000, naive_resamples: int = 20):
+    rng = np.random.default_rng(0)
+    y_true = rng.random(n_samples) < 0.15
+    y_prob = np.clip(0.2 * y_true + rng.random(n_samples) * 0.8, 0, 1)
+
+    start = time.perf_counter()
+    naive_bootstrap(y_true, y_prob, naive_resamples)
+    naive_seconds = (time.perf_counter() - start) * n_resamples / naive_resamples
+
+    start = time.perf_counter()
+    _, replicates = reviewer._bootstrap(y_true, [y_prob], n_resamples, 0.5, "poisson", 42, -1, 256)
+    vectorized_seconds = time.perf_counter() - start
+
+    y_prob_b = np.clip(y_prob + rng.normal(0, 0.05, n_samples), 0, 1)
+    paired_seconds = {}
+    for method in ["poisson", "multinomial"]:
+        start = time.perf_counter()
+        reviewer._bootstrap(y_true, [y_prob, y_prob_b], n_resamples, 0.5, method, 42, -1, 256)
+        paired_seconds[method] = time.perf_counter() - start
+
+    table = Table(title=f"Bootstrap AUC: {n_samples:,} rows x {n_resamples:,} resamples")
+    table.add_column("Method", style="cyan")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_row(f"naive loop (extrapolated from {naive_resamples})", f"{naive_seconds:.1f}", "1.0x")
+    table.add_row("vectorized (AUC/F1/precision/recall)", f"{vectorized_seconds:.1f}", f"{naive_seconds / vectorized_seconds:.1f}x")
+    for method, seconds in paired_seconds.items():
+        table.add_row(f"vectorized paired, {method} (2 models)", f"{seconds:.1f}", f"{naive_seconds / seconds:.1f}x")
+    console.print(table)
+    console.print(f"AUC 95% CI: {np.percentile(replicates[0]['auc'], [2.5, 97.5])}")
+
+if __name__ == "__main__":
+    benchmark()
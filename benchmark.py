@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""End-to-end tool benchmarks on synthetic star-schema claims.
+
+Loads `synthetic.py` data at the requested scale into a warehouse (the embedded SQLite
+stand-in by default, or the Postgres in config.yaml with --postgres), then runs every
+DataOps, MLOps, Reviewer and VizOps tool the way the readmission workflow chains them
+(warehouse extracts and samples, features, training, scoring, explanations, drift and plots).
+Each tool's wall time, peak RSS growth and throughput are written to
+`benchmarks/<git sha>_<rows>.json`, so regressions show up when two commits are compared.
+
+Usage:
+    python benchmark.py --rows 10000
+    python benchmark.py --rows 1000000 --postgres
+    python benchmark.py --rows 10000 --compare benchmarks/abc1234_10000.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+import pandas as pd
+from rich.console import Console
+from rich.table import Table
+
+import orchestrator
+from orchestrator import CONFIG, save_dataframe_to_csv, wait_for_artifacts
+import synthetic
+import tracing
+
+console = Console()
+
+SCALES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000, "50m": 50_000_000}
+
+# Inpatient stays with member risk features (the readmission modeling grain)
+STAYS_QUERY = """
+SELECT c.claim_id, c.member_id, c.claim_date, c.claim_type, c.claim_amount, c.hcg_units_days,
+       c.ms_drg_mdc, m.ra_mm, m.high_cost_member, m.call_count, m.app_login_count,
+       m.wisconsin_area_deprivation_index, m.enrollment_length_continuous
+FROM fct_claim c
+JOIN dim_member m ON c.member_id = m.member_id
+WHERE c.claim_type = 'Inpatient'
+"""
+
+def git_revision() -> str:
+    """Short commit sha of the working tree, suffixed with '-dirty' if it has local changes."""
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return f"{sha}-dirty" if dirty else sha
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+class Bench:
+    """Times steps and records wall time, peak RSS growth (tracing.RssWatch) and throughput per step."""
+
+    def __init__(self):
+        self.results = {}
+
+    def run(self, name: str, fn, *args, rows: int = None, **kwargs):
+        rss = tracing.RssWatch()
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        wait_for_artifacts()
+        seconds = time.perf_counter() - start
+        self.results[name] = {
+            "seconds": seconds,
+            "peak_rss_delta_mb": rss.stop(),
+            "rows": rows,
+            "rows_per_sec": rows / seconds if rows and seconds > 0 else None,
+        }
+        console.print(f"[dim]{name}: {seconds:.2f}s[/dim]")
+        return result
+
+def _prepare_stays(stays_path: str) -> pd.DataFrame:
+    """Labels 30-day readmissions and encodes the MDC (harness step, not a tool)."""
+    stays = pd.read_csv(stays_path, parse_dates=["claim_date"])
+    stays = synthetic.label_readmissions(stays)
+    stays["mdc"] = stays["ms_drg_mdc"].str.extract(r"(\d+)", expand=False).astype(float)
+    stays["high_cost_member"] = stays["high_cost_member"].astype(int)
+    return stays.drop(columns=["claim_type", "ms_drg_mdc"])
+
+def run_benchmarks(n_rows: int, seed: int = 42, postgres: bool = False, n_trials: int = 3,
+                   n_resamples: int = 200) -> dict:
+    """
+    Generates the synthetic warehouse and benchmarks every tool end to end.
+
+    Args:
+        n_rows: fct_claim rows.
+        seed: Generator seed.
+        postgres: Use the configured Postgres instead of the embedded SQLite stand-in.
+        n_trials: Optuna trials for optimize_hyperparameters.
+        n_resamples: Bootstrap resamples for the reviewer tools.
+
+    Returns:
+        dict: Benchmark record (also written to benchmarks/).
+    """
+    import dataops
+    import mlops
+    import reviewer
+    import vizops
+
+    run_dir = orchestrator.get_run_context()["dir"]
+    if not postgres:
+        CONFIG["database"] = {"type": "sqlite", "path": os.path.join(run_dir, "warehouse.sqlite")}
+    bench = Bench()
+    engine = dataops.get_db_engine()
+    schema = CONFIG["database"].get("schema") if postgres else None
+
+    bench.run("generate_synthetic", synthetic.load_synthetic_warehouse, engine, n_rows, seed, schema=schema, rows=n_rows)
+    bench.run("get_table_schema", dataops.get_table_schema, "fct_claim")
+    bench.run("extract_table", dataops.extract_table, "fct_claim",
+              ["claim_id", "member_id", "claim_date", "claim_type", "paid_amount"], rows=n_rows)
+    bench.run("sample_sql", dataops.sample_sql, "SELECT member_id, claim_type, paid_amount FROM fct_claim",
+              fraction=0.1, method="member", aggregates={"paid_amount": ["sum", "mean"]}, group_by=["claim_type"],
+              rows=n_rows)
+    star_path = bench.run("execute_sql:star_claims", dataops.execute_sql, "SELECT * FROM star_claims", rows=n_rows)
+    stays_path = bench.run("execute_sql:inpatient_stays", dataops.execute_sql, STAYS_QUERY)
+    stays = _prepare_stays(stays_path)
+    stays_path = save_dataframe_to_csv(stays, "benchmark_stays")
+    n_stays = len(stays)
+
+    bench.run("profile_dataset", dataops.profile_dataset, star_path, rows=n_rows)
+    member_path = bench.run("aggregate_dataset", dataops.aggregate_dataset, star_path, ["member_id"],
+                            {"paid_amount": "sum", "allowed_amount": "mean"}, rows=n_rows)
+    joined_path = bench.run("join_datasets", dataops.join_datasets, stays_path, member_path, ["member_id"], "left", rows=n_stays)
+    derived_path = bench.run("create_derived_feature", dataops.create_derived_feature, joined_path,
+                             "claim_amount / (hcg_units_days + 1)", "amount_per_day", rows=n_stays)
+    dated_path = bench.run("extract_date_features", dataops.extract_date_features, derived_path, "claim_date",
+                           ["month", "weekday"], rows=n_stays)
+    binned_path = bench.run("bin_numeric_feature", dataops.bin_numeric_feature, dated_path, "ra_mm", 10, rows=n_stays)
+
+    cutoff = str(stays["claim_date"].quantile(0.8).date())
+    split = bench.run("split_data_time_series", mlops.split_data_time_series, binned_path, "claim_date", cutoff, rows=n_stays)
+    target = "readmission_30d"
+    params = {"n_estimators": 100, "max_depth": 4}
+    xgb_path = bench.run("train_model:xgboost", mlops.train_model, split["train"], target, "xgboost", params, rows=n_stays)
+    lgb_path = bench.run("train_model:lightgbm", mlops.train_model, split["train"], target, "lightgbm",
+                         {**params, "verbose": -1}, rows=n_stays)
+    bench.run("optimize_hyperparameters", mlops.optimize_hyperparameters, split["train"], target, n_trials, rows=n_stays)
+    backtest = bench.run("run_backtest", mlops.run_backtest, xgb_path, split["test"], target)
+    backtest_lgb = mlops.run_backtest(lgb_path, split["test"], target)
+    bench.run("score_population", mlops.score_population, xgb_path, binned_path, rows=n_stays)
+    n_test = len(pd.read_csv(split["test"], usecols=[target]))
+    explained = bench.run("explain_predictions", mlops.explain_predictions, xgb_path, split["test"],
+                          scores_path=backtest["scores_file"], rows=n_test)
+    drift = bench.run("monitor_drift", mlops.monitor_drift, xgb_path, split["test"], chart=False, rows=n_test)
+
+    bench.run("bootstrap_metrics", reviewer.bootstrap_metrics, backtest["scores_file"], n_resamples)
+    bench.run("compare_models", reviewer.compare_models, backtest["scores_file"], backtest_lgb["scores_file"], n_resamples)
+
+    bench.run("plot_roc_curve", vizops.plot_roc_curve, xgb_path, split["test"])
+    bench.run("plot_confusion_matrix", vizops.plot_confusion_matrix, xgb_path, split["test"])
+    bench.run("plot_feature_importance", vizops.plot_feature_importance, xgb_path)
+    bench.run("plot_calibration_curve", vizops.plot_calibration_curve, xgb_path, split["test"])
+    bench.run("plot_shap_summary", vizops.plot_shap_summary, explained["summary_file"])
+    bench.run("plot_drift_summary", vizops.plot_drift_summary, drift["report_file"])
+
+    record = {
+        "git_sha": git_revision(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "rows": n_rows,
+        "inpatient_stays": n_stays,
+        "seed": seed,
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "backtest_auc": backtest["metrics"]["auc"],
+        "results": bench.results,
+    }
+    os.makedirs("benchmarks", exist_ok=True)
+    out_path = os.path.join("benchmarks", f"{record['git_sha']}_{n_rows}.json")
+    with open(out_path, "w") as f:
+        json.dump(record, f, indent=2)
+    console.print(f"[dim]Saved Benchmark:[/dim] {out_path}")
+    record["results_file"] = out_path
+    return record
+
+def compare(current: dict, baseline: dict, threshold: float = 0.10) -> list:
+    """Per-step time ratios against a baseline record; steps slower by more than threshold are flagged."""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        ratio = result["seconds"] / base["seconds"] if base and base["seconds"] > 0 else None
+        rows.append({"step": name, "seconds": result["seconds"], "baseline": base["seconds"] if base else None,
+                     "ratio": ratio, "regression": ratio is not None and ratio > 1 + threshold})
+    return rows
+
+def print_results(record: dict, comparison: list = None):
+    table = Table(title=f"Benchmarks @ {record['git_sha']} ({record['rows']:,} rows, {record['database']})")
+    table.add_column("Step", style="cyan")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Peak RSS Δ (MB)", justify="right")
+    table.add_column("Rows/sec", justify="right")
+    if comparison:
+        table.add_column("vs Baseline", justify="right")
+    ratios = {c["step"]: c for c in comparison or []}
+    for name, r in record["results"].items():
+        row = [name, f"{r['seconds']:.2f}", f"{r['peak_rss_delta_mb']:.0f}",
+               f"{r['rows_per_sec']:,.0f}" if r["rows_per_sec"] else "-"]
+        if comparison:
+            c = ratios.get(name, {})
+            row.append("-" if c.get("ratio") is None else
+                       f"[{'red' if c['regression'] else 'green'}]{c['ratio']:.2f}x[/]")
+        table.add_row(*row)
+    console.print(table)
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end tool benchmarks on synthetic claims.")
+    parser.add_argument("--rows", default="10k", help="fct_claim rows: 10k, 1m, 10m, 50m or an integer.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--postgres", action="store_true", help="Benchmark against the Postgres in config.yaml.")
+    parser.add_argument("--trials", type=int, default=3, help="Optuna trials.")
+    parser.add_argument("--resamples", type=int, default=200, help="Bootstrap resamples.")
+    parser.add_argument("--compare", help="Baseline benchmark JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown ratio flagged as a regression.")
+    args = parser.parse_args()
+
+    n_rows = SCALES.get(str(args.rows).lower()) or int(args.rows)
+    record = run_benchmarks(n_rows, args.seed, args.postgres, args.trials, args.resamples)
+    comparison = None
+    if args.compare:
+        with open(args.compare) as f:
+            comparison = compare(record, json.load(f), args.threshold)
+    print_results(record, comparison)
+
+if __name__ == "__main__":
+    main()
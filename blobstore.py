@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Content-addressed artifact store shared by all runs.
+
+Every artifact saved through `orchestrator.save_*` (and `incrementer.export`) is stored
+once under its SHA-256, as `<blobstore.dir>/<sha[:2]>/<sha>` (default `<output.root_dir>/blobs`).
+The step-named file in the run directory is a hardlink to that blob, so saving the same extract, split or model
+again costs no disk space.
+
+- Existence check: writers hash small artifacts in memory (`blobstore.spool_mb`). When
+  the blob already exists, they only create a link, and nothing is written. Larger
+  artifacts stream to a temp file that becomes the blob or, if it is a duplicate,
+  is dropped.
+- Reference counting: a blob's hardlink count is its reference count. Deleting a run
+  directory releases its references, and a blob with a count of 1 is unreferenced.
+- Garbage collection (`collect`): unreferenced blobs are compressed to `<sha>.zst`
+  (zstandard, optional) so a deleted artifact can still be restored from its filename
+  hash (`restore`). They are deleted after `blobstore.retention_days`.
+
+An artifact and its blob are one inode, so permissions cannot protect one without the
+other. Shared content must never be modified in place: tools always write new artifacts,
+and `save_*` publishes with a rename, which replaces the link instead of writing through it.
+
+Usage:
+    python blobstore.py stats
+    python blobstore.py gc --retention-days 7
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+_SETTINGS = {
+    "enabled": True,
+    "dir": os.path.join("output", "blobs"),
+    "compression": "zstd",
+    "level": 3,
+    "spool_mb": 8,
+    "retention_days": 30,
+}
+_DEVICE_CACHE = {}
+_LOCK = threading.Lock()
+
+def configure(**settings):
+    """Applies the `blobstore` section of config.yaml (unknown keys are ignored)."""
+    _SETTINGS.update({k: v for k, v in settings.items() if k in _SETTINGS and v is not None})
+    _DEVICE_CACHE.clear()
+
+def configure_from(config: dict):
+    """Applies config.yaml: the `blobstore` section, with the store under `output.root_dir` unless `dir` is set."""
+    root_dir = config.get("output", {}).get("root_dir", "output")
+    configure(**{"dir": os.path.join(root_dir, "blobs"), **config.get("blobstore", {})})
+
+def settings() -> dict:
+    """The current settings, e.g. to hand to a worker process."""
+    return dict(_SETTINGS)
+
+def is_enabled() -> bool:
+    return bool(_SETTINGS["enabled"])
+
+def spool_bytes() -> int:
+    """Artifacts up to this size are hashed in memory before anything is written."""
+    return int(_SETTINGS["spool_mb"] * 2**20) if is_enabled() else 0
+
+def root() -> str:
+    return _SETTINGS["dir"]
+
+def blob_path(sha256: str) -> str:
+    return os.path.join(root(), sha256[:2], sha256)
+
+def _packed_path(sha256: str) -> str:
+    return blob_path(sha256) + ".zst"
+
+def exists(sha256: str) -> bool:
+    """True if the content is stored (linkable or compressed)."""
+    return os.path.exists(blob_path(sha256)) or os.path.exists(_packed_path(sha256))
+
+def _can_link(dest: str) -> bool:
+    """Hardlinks need the run directory and the store on the same filesystem."""
+    dest_dir = os.path.dirname(os.path.abspath(dest))
+    with _LOCK:
+        if dest_dir not in _DEVICE_CACHE:
+            try:
+                os.makedirs(root(), exist_ok=True)
+                _DEVICE_CACHE[dest_dir] = os.stat(root()).st_dev == os.stat(dest_dir).st_dev
+            except OSError:
+                _DEVICE_CACHE[dest_dir] = False
+        return _DEVICE_CACHE[dest_dir]
+
+def _adopt(path: str, sha256: str) -> bool:
+    """Makes path the blob for sha256 unless one already exists; True if it was adopted."""
+    blob = blob_path(sha256)
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+    try:
+        os.link(path, blob)
+    except FileExistsError:
+        return False
+    if os.path.exists(_packed_path(sha256)):
+        os.remove(_packed_path(sha256))
+    return True
+
+def _link(sha256: str, dest: str):
+    """Links dest to the blob, replacing an existing dest (link to a temp name, then rename)."""
+    temp_path = os.path.join(os.path.dirname(os.path.abspath(dest)), f".link_{os.getpid()}_{threading.get_ident()}")
+    os.link(blob_path(sha256), temp_path)
+    try:
+        os.replace(temp_path, dest)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def put_file(src: str, sha256: str, dest: str) -> int:
+    """
+    Publishes a finished temp file as dest, deduplicated against the store.
+
+    Returns:
+        int: Bytes added to the store (0 for a duplicate).
+    """
+    size = os.path.getsize(src)
+    if not is_enabled() or not _can_link(dest):
+        os.replace(src, dest)
+        return size
+    if os.path.exists(blob_path(sha256)):
+        _link(sha256, dest)
+        os.remove(src)
+        return 0
+    adopted = _adopt(src, sha256)
+    os.replace(src, dest)  # dest and the blob now share one inode
+    return size if adopted else 0
+
+def put_bytes(data: bytes, sha256: str, dest: str) -> int:
+    """
+    Publishes in-memory content as dest; writes nothing when the blob already exists.
+
+    Returns:
+        int: Bytes written (0 for a duplicate).
+    """
+    if is_enabled() and _can_link(dest):
+        if os.path.exists(blob_path(sha256)):
+            _link(sha256, dest)
+            return 0
+        os.makedirs(os.path.dirname(blob_path(sha256)), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".blob_", dir=os.path.dirname(blob_path(sha256)))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if not _adopt(temp_path, sha256):
+            os.remove(temp_path)
+            _link(sha256, dest)
+            return 0
+        os.replace(temp_path, dest)
+        return len(data)
+    # A new file, never a write through an existing dest (it may be linked to a blob)
+    fd, temp_path = tempfile.mkstemp(prefix=".blob_", dir=os.path.dirname(os.path.abspath(dest)))
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, dest)
+    return len(data)
+
+def _find(hash_prefix: str):
+    """Full SHA-256 of the stored blob whose hash starts with hash_prefix (None if absent)."""
+    shard = os.path.join(root(), hash_prefix[:2])
+    if not os.path.isdir(shard):
+        return None
+    for name in os.listdir(shard):
+        if name.startswith(hash_prefix) and not name.startswith("."):
+            return name.removesuffix(".zst")
+    return None
+
+def restore(dest: str, hash_prefix: str = None) -> str:
+    """
+    Recreates a deleted artifact from the store, using the content hash in its
+    standardized filename (or hash_prefix).
+
+    Returns:
+        str: dest.
+    """
+    if hash_prefix is None:
+        from orchestrator import parse_artifact_hash
+        hash_prefix = parse_artifact_hash(dest)
+    sha256 = _find(hash_prefix) if hash_prefix else None
+    if sha256 is None:
+        raise FileNotFoundError(f"No stored blob for '{dest}'.")
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    if not os.path.exists(blob_path(sha256)):
+        import zstandard
+        fd, temp_path = tempfile.mkstemp(prefix=".blob_", dir=os.path.dirname(blob_path(sha256)))
+        with open(_packed_path(sha256), "rb") as src, os.fdopen(fd, "wb") as out:
+            zstandard.ZstdDecompressor().copy_stream(src, out)
+        _adopt(temp_path, sha256)
+        os.remove(temp_path)
+    if _can_link(dest):
+        _link(sha256, dest)
+    else:
+        import shutil
+        shutil.copyfile(blob_path(sha256), dest)
+    return dest
+
+def _compress(sha256: str) -> int:
+    """Replaces an unreferenced blob with its zstd-compressed form; returns bytes saved."""
+    import zstandard
+    blob, packed = blob_path(sha256), _packed_path(sha256)
+    fd, temp_path = tempfile.mkstemp(prefix=".blob_", dir=os.path.dirname(blob))
+    with open(blob, "rb") as src, os.fdopen(fd, "wb") as out:
+        zstandard.ZstdCompressor(level=int(_SETTINGS["level"])).copy_stream(src, out)
+    os.replace(temp_path, packed)
+    saved = os.path.getsize(blob) - os.path.getsize(packed)
+    os.remove(blob)
+    return saved
+
+def _iter_blobs():
+    if not os.path.isdir(root()):
+        return
+    for shard in os.scandir(root()):
+        if shard.is_dir():
+            for entry in os.scandir(shard.path):
+                if not entry.name.startswith("."):
+                    yield entry
+
+def collect(retention_days: float = None, compress: bool = True) -> dict:
+    """
+    Garbage-collects the store.
+
+    - An unreferenced blob (link count 1) is compressed, if zstandard is installed.
+    - A blob unreferenced for longer than retention_days is deleted. The default is
+      blobstore.retention_days, and None keeps blobs forever.
+    - Temp files left by interrupted writers are removed.
+
+    Returns:
+        dict: Blobs compressed/deleted and bytes reclaimed.
+    """
+    retention_days = _SETTINGS["retention_days"] if retention_days is None else retention_days
+    cutoff = time.time() - retention_days * 86400 if retention_days is not None else None
+    try:
+        import zstandard  # noqa: F401
+        can_compress = compress and _SETTINGS["compression"] == "zstd"
+    except ImportError:
+        can_compress = False
+
+    result = {"compressed": 0, "deleted": 0, "bytes_reclaimed": 0}
+    for entry in list(_iter_blobs()):
+        stat = entry.stat()
+        if entry.name.endswith(".zst") or stat.st_nlink == 1:
+            # ctime changes when the last run link is removed: "unreferenced since"
+            if cutoff is not None and stat.st_ctime < cutoff:
+                os.remove(entry.path)
+                result["deleted"] += 1
+                result["bytes_reclaimed"] += stat.st_size
+            elif can_compress and not entry.name.endswith(".zst"):
+                result["bytes_reclaimed"] += _compress(entry.name)
+                result["compressed"] += 1
+    for shard in os.scandir(root()) if os.path.isdir(root()) else []:
+        for entry in os.scandir(shard.path) if shard.is_dir() else []:
+            if entry.name.startswith(".blob_") and entry.stat().st_mtime < time.time() - 3600:
+                os.remove(entry.path)
+    return result
+
+def stats() -> dict:
+    """Blob counts, stored bytes, and bytes saved by deduplication (extra links x size)."""
+    result = {"blobs": 0, "referenced": 0, "compressed": 0, "stored_bytes": 0, "deduplicated_bytes": 0}
+    for entry in _iter_blobs():
+        stat = entry.stat()
+        result["blobs"] += 1
+        result["stored_bytes"] += stat.st_size
+        if entry.name.endswith(".zst"):
+            result["compressed"] += 1
+        elif stat.st_nlink > 1:
+            result["referenced"] += 1
+            result["deduplicated_bytes"] += (stat.st_nlink - 2) * stat.st_size
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed artifact store maintenance.")
+    parser.add_argument("command", choices=["stats", "gc"])
+    parser.add_argument("--retention-days", type=float, help="Delete blobs unreferenced for longer than this.")
+    parser.add_argument("--no-compress", action="store_true", help="Do not compress unreferenced blobs.")
+    args = parser.parse_args()
+
+    from orchestrator import CONFIG, console
+    configure_from(CONFIG)
+    if args.command == "gc":
+        console.print(collect(args.retention_days, compress=not args.no_compress))
+    console.print(stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Cached schema catalog for the warehouse.
+
+The whole schema (`database.schema`, e.g. `dw`) is reflected in one catalog query:
+- Postgres: `information_schema.columns`, joined with `pg_stats` (n_distinct, null_frac)
+  and `pg_class` (estimated rows).
+- SQLite stand-in: `sqlite_master` x `pragma_table_info`.
+
+The result is kept in memory and on disk (`catalog.dir`), so repeated `get_table_schema`
+calls, even from new processes, are dictionary lookups. Within `catalog.ttl_seconds` the
+database is not contacted at all. After that, a cheap DDL fingerprint (`pg_attribute`
+or `sqlite_master`) is compared, and the schema is reflected again only if it changed.
+
+The catalog also drives dtype-aware loading (`pandas_dtypes`) and pushdown planning
+(`estimate_rows`) for `dataops.extract_table`.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from orchestrator import CONFIG, console
+from tracing import span
+
+_CATALOGS = {}
+_CATALOGS_LOCK = threading.RLock()
+
+_PG_COLUMNS_SQL = """
+SELECT c.table_name, c.column_name, c.data_type, c.is_nullable, c.ordinal_position,
+       c.character_maximum_length, c.numeric_precision, c.numeric_scale,
+       s.n_distinct, s.null_frac, pc.reltuples
+FROM information_schema.columns c
+-- pg_stats has a second (inherited) row for inheritance/partition parents; keep one,
+-- preferring the inherited one since it covers the child rows the parent returns
+LEFT JOIN LATERAL (
+    SELECT ps.n_distinct, ps.null_frac
+    FROM pg_stats ps
+    WHERE ps.schemaname = c.table_schema AND ps.tablename = c.table_name AND ps.attname = c.column_name
+    ORDER BY ps.inherited DESC
+    LIMIT 1
+) s ON TRUE
+LEFT JOIN pg_namespace pn ON pn.nspname = c.table_schema
+LEFT JOIN pg_class pc ON pc.relnamespace = pn.oid AND pc.relname = c.table_name
+WHERE c.table_schema = :schema
+ORDER BY c.table_name, c.ordinal_position
+"""
+
+# Changes whenever a table, view or column in the schema is created, dropped or retyped
+_PG_FINGERPRINT_SQL = """
+SELECT md5(string_agg(a.attrelid::text || '.' || a.attname || '.' || a.atttypid::text || '.' || a.atttypmod::text,
+                      ',' ORDER BY a.attrelid, a.attnum))
+FROM pg_attribute a
+JOIN pg_class c ON c.oid = a.attrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = :schema AND a.attnum > 0 AND NOT a.attisdropped AND c.relkind IN ('r', 'v', 'm', 'p', 'f')
+"""
+
+_SQLITE_COLUMNS_SQL = """
+SELECT m.name AS table_name, p.name AS column_name, p.type AS data_type, p."notnull" AS not_null,
+       p.cid + 1 AS ordinal_position
+FROM sqlite_master m
+JOIN pragma_table_info(m.name) p
+WHERE m.type IN ('table', 'view') AND m.name NOT LIKE 'sqlite_%'
+ORDER BY m.name, p.cid
+"""
+
+_SQLITE_FINGERPRINT_SQL = "SELECT group_concat(type || ':' || name || ':' || coalesce(sql, ''), ';') FROM sqlite_master"
+
+# information_schema data_type -> the type names SQLAlchemy reflection reports
+_PG_TYPE_NAMES = {
+    "character varying": "VARCHAR",
+    "character": "CHAR",
+    "timestamp without time zone": "TIMESTAMP",
+    "timestamp with time zone": "TIMESTAMP WITH TIME ZONE",
+    "time without time zone": "TIME",
+}
+
+def _settings() -> dict:
+    return CONFIG.get("catalog", {})
+
+def _database_key(schema: str) -> str:
+    """Identifies the database + schema a catalog belongs to (credentials excluded)."""
+    db_config = CONFIG.get("database", {})
+    if db_config.get("type") == "sqlite":
+        source = f"sqlite:{os.path.abspath(db_config.get('path', 'output/warehouse.sqlite'))}"
+    else:
+        source = f"postgresql:{db_config.get('host')}:{db_config.get('port')}/{db_config.get('database')}"
+    return f"{source}#{schema or ''}"
+
+def _cache_path(key: str) -> str:
+    root_dir = CONFIG.get("output", {}).get("root_dir", "output")
+    cache_dir = _settings().get("dir") or os.path.join(root_dir, "catalog")
+    return os.path.join(cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()[:16]}.json")
+
+def _type_name(row: dict) -> str:
+    data_type = row["data_type"] or ""
+    name = _PG_TYPE_NAMES.get(data_type, data_type.upper())
+    if data_type in ("character varying", "character") and row.get("character_maximum_length"):
+        return f"{name}({row['character_maximum_length']})"
+    if data_type == "numeric" and row.get("numeric_precision") is not None:
+        return f"{name}({row['numeric_precision']}, {row['numeric_scale'] or 0})"
+    return name
+
+def _reflect(engine, schema: str) -> dict:
+    """Reads every table's columns (and Postgres planner statistics) in one query."""
+    from sqlalchemy import text
+    postgres = engine.dialect.name == "postgresql"
+    with engine.connect() as conn:
+        if postgres:
+            rows = conn.execute(text(_PG_COLUMNS_SQL), {"schema": schema}).mappings().all()
+        else:
+            rows = conn.execute(text(_SQLITE_COLUMNS_SQL)).mappings().all()
+
+    tables = {}
+    for row in rows:
+        table = tables.setdefault(row["table_name"], {"rows": None, "columns": {}})
+        reltuples = row.get("reltuples")
+        if reltuples is not None and reltuples >= 0:
+            table["rows"] = int(reltuples)
+        n_distinct = row.get("n_distinct")
+        if n_distinct is not None and n_distinct < 0 and table["rows"] is not None:
+            # Negative n_distinct is a fraction of the row count
+            n_distinct = -n_distinct * table["rows"]
+        table["columns"][row["column_name"]] = {
+            "type": _type_name(row) if postgres else (row["data_type"] or "").upper(),
+            "nullable": row["is_nullable"] == "YES" if postgres else not row["not_null"],
+            "position": int(row["ordinal_position"]),
+            "n_distinct": None if n_distinct is None else float(n_distinct),
+            "null_frac": None if row.get("null_frac") is None else float(row["null_frac"]),
+        }
+    return tables
+
+def _fingerprint(engine, schema: str) -> str:
+    from sqlalchemy import text
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            value = conn.execute(text(_PG_FINGERPRINT_SQL), {"schema": schema}).scalar()
+        else:
+            value = conn.execute(text(_SQLITE_FINGERPRINT_SQL)).scalar()
+    return hashlib.md5((value or "").encode()).hexdigest()
+
+def _read_cache(path: str, key: str):
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        return cached if cached.get("key") == key else None
+    except (OSError, ValueError):
+        return None
+
+def _write_cache(path: str, catalog: dict):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".catalog_", suffix=".tmp", dir=os.path.dirname(path))
+        with os.fdopen(fd, "w") as f:
+            json.dump(catalog, f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        console.print(f"[yellow]Could not write schema catalog cache:[/yellow] {e}")
+
+def _default_schema():
+    db_config = CONFIG.get("database", {})
+    return None if db_config.get("type") == "sqlite" else db_config.get("schema", "public")
+
+def get_catalog(schema: str = None, refresh: bool = False) -> dict:
+    """
+    Returns the schema catalog, reflecting the database only when the cached copy is
+    missing, past its TTL with a changed DDL fingerprint, or refresh is requested.
+
+    Args:
+        schema: Schema to describe (default: database.schema; ignored for SQLite).
+        refresh: Re-reflect regardless of the cache.
+
+    Returns:
+        dict: {"key", "fingerprint", "reflected_at", "validated_at",
+        "tables": {table: {"rows", "columns": {column: {"type", "nullable", "position",
+        "n_distinct", "null_frac"}}}}}.
+    """
+    schema = schema or _default_schema()
+    key = _database_key(schema)
+    ttl = _settings().get("ttl_seconds", 900)
+    with _CATALOGS_LOCK:
+        catalog = None if refresh else _CATALOGS.get(key)
+        if catalog is None and not refresh:
+            catalog = _read_cache(_cache_path(key), key)
+        if catalog is not None and time.time() - catalog["validated_at"] < ttl:
+            _CATALOGS[key] = catalog
+            return catalog
+
+        from dataops import get_db_engine
+        engine = get_db_engine()
+        with span("catalog.refresh", cat="db", schema=schema) as s:
+            fingerprint = _fingerprint(engine, schema)
+            if catalog is not None and _settings().get("check_ddl", True) and catalog["fingerprint"] == fingerprint:
+                catalog = dict(catalog, validated_at=time.time())
+                s.set(reflected=False)
+            else:
+                now = time.time()
+                catalog = {"key": key, "fingerprint": fingerprint, "reflected_at": now, "validated_at": now,
+                           "tables": _reflect(engine, schema)}
+                s.set(reflected=True, tables=len(catalog["tables"]))
+        _CATALOGS[key] = catalog
+        _write_cache(_cache_path(key), catalog)
+        return catalog
+
+def invalidate(schema: str = None):
+    """Drops the cached catalog (memory and disk), e.g. after loading or altering tables."""
+    schema = schema or _default_schema()
+    key = _database_key(schema)
+    with _CATALOGS_LOCK:
+        _CATALOGS.pop(key, None)
+        try:
+            os.remove(_cache_path(key))
+        except FileNotFoundError:
+            pass
+
+def get_table(table_name: str) -> dict:
+    """
+    Catalog entry for a table ('fct_claim' or 'dw.fct_claim'). A table missing from a
+    cached catalog triggers one refresh before it is reported as unknown.
+    """
+    schema = None
+    if "." in table_name:
+        schema, table_name = table_name.split(".", 1)
+    table = get_catalog(schema)["tables"].get(table_name)
+    if table is None:
+        table = get_catalog(schema, refresh=True)["tables"].get(table_name)
+    if table is None:
+        raise ValueError(f"Table '{table_name}' not found in the schema catalog.")
+    return table
+
+def table_columns(table_name: str) -> dict:
+    """Column name -> type name, in table order."""
+    columns = get_table(table_name)["columns"]
+    return {name: col["type"] for name, col in sorted(columns.items(), key=lambda c: c[1]["position"])}
+
+def _pandas_dtype(type_name: str) -> str:
+    base = type_name.split("(")[0].strip()
+    if "INT" in base or "SERIAL" in base:
+        return "Int64"
+    if base.startswith(("NUMERIC", "DECIMAL", "REAL", "DOUBLE", "FLOAT")):
+        return "float64"
+    if base.startswith("BOOL"):
+        return "boolean"
+    if base.startswith(("DATE", "TIMESTAMP")):
+        return "datetime64[ns]"
+    return "object"
+
+def pandas_dtypes(table_name: str, columns: list = None) -> dict:
+    """
+    Pandas dtypes for a table's columns from their SQL types: integers as nullable Int64
+    (no float upcast on NULLs), numerics as float64, dates as datetime64, booleans as boolean.
+    """
+    types = table_columns(table_name)
+    return {col: _pandas_dtype(types[col]) for col in (columns or types)}
+
+def estimate_rows(table_name: str, filters: dict = None):
+    """
+    Estimated result rows for equality/IN filters using planner statistics
+    (rows x 1/n_distinct per filtered column); None when statistics are unavailable.
+    """
+    table = get_table(table_name)
+    rows = table["rows"]
+    if rows is None:
+        return None
+    estimate = float(rows)
+    for column, value in (filters or {}).items():
+        col = table["columns"][column]
+        if value is None:
+            estimate *= col["null_frac"] if col["null_frac"] is not None else 1.0
+            continue
+        if not col["n_distinct"]:
+            continue
+        n_values = len(value) if isinstance(value, (list, tuple, set)) else 1
+        estimate *= min(n_values / col["n_distinct"], 1.0) * (1 - (col["null_frac"] or 0.0))
+    return int(round(estimate))
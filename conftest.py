@@ -0,0 +1,10 @@
+import pytest
+import blobstore
+
+@pytest.fixture(scope="session", autouse=True)
+def temporary_blob_store(tmp_path_factory):
+    """Tests write their artifacts into a throwaway blob store, not the working tree's output/blobs."""
+    original = blobstore.settings()
+    blobstore.configure(dir=str(tmp_path_factory.mktemp("blobs")))
+    yield
+    blobstore.configure(**original)
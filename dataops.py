@@ -1,17 +1,87 @@
+import threading
+import time
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, inspect, text
 from orchestrator import CONFIG, save_dataframe_to_csv, log_analysis
+from tracing import traced, current_span
+import governor
+import catalog
+import sampling
+
+# One engine (and connection pool) per URL; SQLAlchemy is imported on the first DB call
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
 
 def get_db_engine():
-    """Creates a SQLAlchemy engine based on config.yaml."""
+    """Returns the SQLAlchemy engine for the database in config.yaml (created on first use)."""
     db_config = CONFIG.get("database", {})
     if not db_config:
         raise ValueError("Database configuration not found.")
-        
-    # Construct connection string for PostgreSQL
-    url = f"postgresql+psycopg2://{db_config['username']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
-    return create_engine(url)
 
+    # Embedded stand-in for benchmarks and offline work
+    if db_config.get("type") == "sqlite":
+        url = f"sqlite:///{db_config.get('path', 'output/warehouse.sqlite')}"
+    else:
+        # Construct connection string for PostgreSQL
+        url = f"postgresql+psycopg2://{db_config['username']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
+
+    with _ENGINES_LOCK:
+        if url not in _ENGINES:
+            from sqlalchemy import create_engine, event
+            _ENGINES[url] = create_engine(url)
+            if url.startswith("sqlite"):
+                event.listen(_ENGINES[url], "connect", sampling.register_sqlite_functions)
+        return _ENGINES[url]
+
+def _read_query(query, statement_timeout_ms: int = None, on_backend_pid=None) -> pd.DataFrame:
+    """
+    Runs a query and returns the result frame.
+
+    Args:
+        query: A valid SQL SELECT statement (or a SQLAlchemy select with bound parameters).
+        statement_timeout_ms: Server-side timeout for this query (Postgres `statement_timeout`).
+        on_backend_pid: Called with the connection's backend pid before the query starts,
+            so a caller on another thread can cancel it with `pg_cancel_backend`.
+    """
+    from sqlalchemy import text
+    engine = get_db_engine()
+    postgres = engine.dialect.name == "postgresql"
+    with engine.connect() as conn:
+        if postgres and "schema" in CONFIG.get("database", {}):
+            conn.execute(text(f"SET search_path TO {CONFIG['database']['schema']}"))
+        if postgres and statement_timeout_ms:
+            # SET LOCAL expires with the transaction, so pooled connections are not affected
+            conn.execute(text(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}"))
+        if postgres and on_backend_pid is not None:
+            on_backend_pid(conn.execute(text("SELECT pg_backend_pid()")).scalar())
+
+        # Split server/transfer time from client-side frame construction
+        start = time.perf_counter()
+        result = conn.exec_driver_sql(query) if isinstance(query, str) else conn.execute(query)
+        rows = result.fetchall()
+        fetched = time.perf_counter()
+        df = pd.DataFrame.from_records(rows, columns=list(result.keys()), coerce_float=True)
+
+    span = current_span()
+    span.add("db_ms", (fetched - start) * 1000)
+    span.add("client_ms", (time.perf_counter() - fetched) * 1000)
+    span.add("rows_in", len(df))
+    return df
+
+def _read_csv(file_path: str) -> pd.DataFrame:
+    """Reads a CSV artifact and records its row count on the active trace span."""
+    df = pd.read_csv(file_path)
+    current_span().add("rows_in", len(df))
+    return df
+
+def cancel_backend(pid: int) -> bool:
+    """Asks Postgres to cancel the query running on the given backend pid."""
+    from sqlalchemy import text
+    engine = get_db_engine()
+    with engine.connect() as conn:
+        return bool(conn.execute(text("SELECT pg_cancel_backend(:pid)"), {"pid": pid}).scalar())
+
+@traced
 def execute_sql(query: str) -> str:
     """
     Runs a SQL query against the warehouse and returns the path to the saved CSV result.
@@ -22,18 +92,17 @@ def execute_sql(query: str) -> str:
     Returns:
         str: File path to the saved CSV containing the query results.
     """
-    engine = get_db_engine()
-    with engine.connect() as conn:
-        if "schema" in CONFIG.get("database", {}):
-            conn.execute(text(f"SET search_path TO {CONFIG['database']['schema']}"))
-        
-        df = pd.read_sql(query, conn)
-    
+    return _execute_sql(query, CONFIG.get("database", {}).get("statement_timeout_ms"))
+
+def _execute_sql(query: str, statement_timeout_ms: int = None, on_backend_pid=None) -> str:
+    """Body of execute_sql, shared with async_tools.execute_sql_async (see _read_query for the arguments)."""
+    df = _read_query(query, statement_timeout_ms, on_backend_pid)
     return save_dataframe_to_csv(df, "query_result")
 
+@traced
 def get_table_schema(table_name: str) -> dict:
     """
-    Returns column names and types for a given table.
+    Returns column names and types for a given table, served from the cached schema catalog.
 
     Args:
         table_name: The name of the table (e.g., 'fct_claim' or 'dw.fct_claim').
@@ -41,136 +110,451 @@ def get_table_schema(table_name: str) -> dict:
     Returns:
         dict: A dictionary mapping column names to their data types.
     """
-    engine = get_db_engine()
-    inspector = inspect(engine)
-    
-    schema = CONFIG.get("database", {}).get("schema")
-    if "." in table_name:
-        schema, table_name = table_name.split(".", 1)
-        
-    columns = inspector.get_columns(table_name, schema=schema)
-    schema_info = {col["name"]: str(col["type"]) for col in columns}
-    return schema_info
+    return catalog.table_columns(table_name)
+
+@traced
+def sample_sql(query: str, fraction: float = None, method: str = None, aggregates: dict = None,
+               group_by: list = None, scale_columns: list = None, target_relative_ci: float = None,
+               seed: int = None, table: str = "fct_claim", key: str = "member_id") -> dict:
+    """
+    Runs a query on a warehouse-side sample of a base table (default fct_claim) and returns
+    the sampled result with its scale-up factor and aggregate estimates with confidence intervals.
+
+    Args:
+        query: A valid SQL SELECT statement reading `table`.
+        fraction: Sampling fraction (default: sampling.fraction). Calling again with a larger
+            fraction and the same seed returns a superset of the previous sample.
+        method: "member" (hash on `key`, keeps member histories whole), "bernoulli" or
+            "system" (Postgres TABLESAMPLE). Default: sampling.method.
+        aggregates: Column -> "count"/"sum"/"mean" (or a list) to estimate from the sampled
+            rows; "*" counts rows. Select `key` too for member-level (clustered) intervals.
+        group_by: Result columns to estimate the aggregates within.
+        scale_columns: Columns the query already aggregates as counts/sums; they are multiplied
+            by the scale factor in the saved result.
+        target_relative_ci: Refine (grow the fraction by sampling.refine_factor) until every
+            interval's half-width is within this fraction of its estimate, or the table is exhausted.
+        seed: Sample seed (default: sampling.seed).
+        table: Base table to sample.
+        key: Member key column for the "member" method.
+
+    Returns:
+        dict: path (sampled result CSV), method, fraction, scale_factor, rows, estimates
+        (estimate, ci_low, ci_high, relative_ci per group/column/aggregate) and the
+        refinement history.
+    """
+    settings = CONFIG.get("sampling", {})
+    fraction = fraction or settings.get("fraction", 0.01)
+    method = method or settings.get("method", "member")
+    seed = settings.get("seed", 42) if seed is None else seed
+    dialect = get_db_engine().dialect.name
+    timeout_ms = CONFIG.get("database", {}).get("statement_timeout_ms")
 
+    history = []
+    while True:
+        sampled_query, effective = sampling.rewrite(query, fraction, method, seed, table, key, dialect)
+        df = _read_query(sampled_query, timeout_ms)
+        cluster_col = key if method == "member" and key in df.columns else None
+        estimates = sampling.estimate(df, effective, aggregates, group_by, cluster_col) if aggregates else []
+        widest = max((e["relative_ci"] for e in estimates if not np.isnan(e["relative_ci"])), default=0.0)
+        history.append({"fraction": effective, "rows": len(df), "max_relative_ci": widest})
+        if target_relative_ci is None or effective >= 1 or widest <= target_relative_ci:
+            break
+        fraction = min(1.0, effective * settings.get("refine_factor", 5))
+
+    scale_factor = 1.0 / effective
+    if scale_columns:
+        df[scale_columns] = df[scale_columns] * scale_factor
+    return {
+        "path": save_dataframe_to_csv(df, "sample_result"),
+        "method": method,
+        "fraction": effective,
+        "scale_factor": scale_factor,
+        "rows": len(df),
+        "cluster": cluster_col or "row",
+        "estimates": estimates,
+        "history": history,
+    }
+
+def _result(path: str, execution: dict, report: bool):
+    """Path-returning tools return {"path", "execution"} when the caller asks for the report."""
+    return {"path": path, "execution": execution} if report else path
+
+def _apply_dtypes(df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    """Casts result columns to their catalog dtypes, leaving a column as-is if it does not fit."""
+    for col, dtype in dtypes.items():
+        if dtype == "object" or col not in df.columns:
+            continue
+        try:
+            df[col] = pd.to_datetime(df[col]) if dtype.startswith("datetime") else df[col].astype(dtype)
+        except (TypeError, ValueError):
+            pass
+    return df
+
+@traced
+def extract_table(table_name: str, columns: list = None, filters: dict = None, limit: int = None,
+                  report: bool = False) -> str:
+    """
+    Extracts rows from a warehouse table with the column selection and filters pushed down
+    into the query, validated against the schema catalog before anything is sent.
+
+    Args:
+        table_name: The table (e.g., 'fct_claim' or 'dw.fct_claim').
+        columns: Columns to select (default: all, in table order).
+        filters: Column -> value (equality), list of values (IN) or None (IS NULL).
+        limit: Maximum rows to return.
+        report: Return {"path", "execution"} with the pushdown plan and row estimate.
+
+    Returns:
+        str: File path to the saved CSV.
+    """
+    from sqlalchemy import column, select, table as sql_table
+
+    info = catalog.get_table(table_name)
+    known = info["columns"]
+    filters = filters or {}
+    columns = list(columns) if columns else sorted(known, key=lambda c: known[c]["position"])
+    unknown = [c for c in dict.fromkeys([*columns, *filters]) if c not in known]
+    if unknown:
+        raise ValueError(f"Unknown columns for '{table_name}': {unknown}")
+
+    schema, name = table_name.split(".", 1) if "." in table_name else (None, table_name)
+    source = sql_table(name, *[column(c) for c in dict.fromkeys([*columns, *filters])], schema=schema)
+    query = select(*[source.c[c] for c in columns])
+    for col, value in filters.items():
+        if value is None:
+            query = query.where(source.c[col].is_(None))
+        elif isinstance(value, (list, tuple, set)):
+            query = query.where(source.c[col].in_(list(value)))
+        else:
+            query = query.where(source.c[col] == value)
+    if limit is not None:
+        query = query.limit(int(limit))
+
+    execution = {
+        "strategy": "pushdown",
+        "columns": len(columns),
+        "table_columns": len(known),
+        "filters": list(filters),
+        "estimated_rows": catalog.estimate_rows(table_name, filters),
+    }
+    df = _read_query(query, CONFIG.get("database", {}).get("statement_timeout_ms"))
+    df = _apply_dtypes(df, catalog.pandas_dtypes(table_name, columns))
+    execution["rows"] = len(df)
+    return _result(save_dataframe_to_csv(df, f"{name}_extract"), execution, report)
+
+def _profile_out_of_core(file_path: str, execution: dict, sample_rows: int = 100_000) -> dict:
+    """
+    Streams the file once: row count, null counts and numeric count/mean/std/min/max
+    are exact; cardinality and quartiles come from a uniform row sample.
+    """
+    rng = np.random.default_rng(0)
+    fraction = min(1.0, sample_rows / max(sum(execution["estimated_rows"]), 1))
+    rows, null_counts, moments, samples = 0, None, {}, []
+    for chunk in governor.iter_csv(file_path, execution["chunk_rows"]):
+        rows += len(chunk)
+        nulls = chunk.isnull().sum()
+        null_counts = nulls if null_counts is None else null_counts.add(nulls, fill_value=0)
+        for col in chunk.select_dtypes(include="number").columns:
+            values = chunk[col].dropna().to_numpy(dtype=np.float64)
+            n, total, sq, lo, hi = moments.get(col, (0, 0.0, 0.0, np.inf, -np.inf))
+            if len(values):
+                lo, hi = min(lo, values.min()), max(hi, values.max())
+            moments[col] = (n + len(values), total + values.sum(), sq + (values ** 2).sum(), lo, hi)
+        samples.append(chunk[rng.random(len(chunk)) < fraction])
+    current_span().add("rows_in", rows)
+
+    sample = pd.concat(samples, ignore_index=True)
+    quartiles = sample.describe().to_dict()
+    numeric_stats = {}
+    for col, (n, total, sq, lo, hi) in moments.items():
+        mean = total / n if n else np.nan
+        std = np.sqrt(max(sq - n * mean ** 2, 0.0) / (n - 1)) if n > 1 else np.nan
+        q = quartiles.get(col, {})
+        numeric_stats[col] = {"count": float(n), "mean": float(mean), "std": float(std), "min": float(lo),
+                              "25%": q.get("25%"), "50%": q.get("50%"), "75%": q.get("75%"), "max": float(hi)}
+    execution["approximate"] = ["cardinality", "numeric_stats.25%", "numeric_stats.50%", "numeric_stats.75%"]
+    execution["sample_rows"] = len(sample)
+    return {
+        "rows": rows,
+        "columns": list(sample.columns),
+        "null_counts": {k: int(v) for k, v in null_counts.items()},
+        "cardinality": sample.nunique().to_dict(),
+        "numeric_stats": numeric_stats,
+    }
+
+@traced
 def profile_dataset(file_path: str) -> dict:
     """
     Returns summary statistics (mean, null counts, cardinality) for a dataset.
+    Over the memory budget, the file is streamed and cardinality/quartiles are sampled.
 
     Args:
         file_path: Path to the CSV file to profile.
 
     Returns:
-        dict: A dictionary containing row count, column list, null counts, cardinality, and numeric stats.
+        dict: A dictionary containing row count, column list, null counts, cardinality, and numeric stats,
+        plus 'execution' (strategy, estimated vs actual peak MB).
     """
-    df = pd.read_csv(file_path)
-    profile = {
-        "rows": len(df),
-        "columns": list(df.columns),
-        "null_counts": df.isnull().sum().to_dict(),
-        "cardinality": df.nunique().to_dict(),
-        "numeric_stats": df.describe().to_dict()
-    }
+    execution = governor.plan([file_path], factor=3, fallback="sampled")
+    with governor.track(execution, "profile_dataset"):
+        if execution["strategy"] == "in_memory":
+            df = _read_csv(file_path)
+            profile = {
+                "rows": len(df),
+                "columns": list(df.columns),
+                "null_counts": df.isnull().sum().to_dict(),
+                "cardinality": df.nunique().to_dict(),
+                "numeric_stats": df.describe().to_dict()
+            }
+        else:
+            profile = _profile_out_of_core(file_path, execution)
+    profile["execution"] = execution
     return profile
 
-def join_datasets(left_path: str, right_path: str, on: list, how: str = "inner") -> str:
+def _join_partitioned(left_path: str, right_path: str, on: list, how: str, execution: dict) -> str:
+    """Hash-partitions both sides by the join keys into spill files and joins partition by partition."""
+    n, chunk_rows = execution["partitions"], execution["chunk_rows"]
+    left_empty = pd.read_csv(left_path, nrows=0)
+    right_empty = pd.read_csv(right_path, nrows=0)
+    with governor.spill_dir() as spill:
+        lefts = governor.partition_csv(left_path, on, n, chunk_rows, spill, "left")
+        rights = governor.partition_csv(right_path, on, n, chunk_rows, spill, "right")
+
+        def joined_partitions():
+            for left_part, right_part in zip(lefts, rights):
+                if left_part is None and (right_part is None or how in ("inner", "left")):
+                    continue
+                if right_part is None and how in ("inner", "right"):
+                    continue
+                df_left = _read_csv(left_part) if left_part else left_empty
+                df_right = _read_csv(right_part) if right_part else right_empty
+                yield pd.merge(df_left, df_right, on=on, how=how)
+
+        return governor.write_csv_chunks(joined_partitions(), "joined_data")
+
+@traced
+def join_datasets(left_path: str, right_path: str, on: list, how: str = "inner", report: bool = False) -> str:
     """
     Merges two datasets and returns the new file path.
+    Over the memory budget, both sides are hash-partitioned to disk and joined per partition.
 
     Args:
         left_path: Path to the left CSV file.
         right_path: Path to the right CSV file.
         on: List of column names to join on (must exist in both files).
         how: Type of join ('inner', 'left', 'right', 'outer'). Defaults to 'inner'.
+        report: Return {"path", "execution"} instead of the path.
 
     Returns:
         str: File path to the merged CSV.
     """
-    df_left = pd.read_csv(left_path)
-    df_right = pd.read_csv(right_path)
-    
-    merged_df = pd.merge(df_left, df_right, on=on, how=how)
-    
-    return save_dataframe_to_csv(merged_df, "joined_data")
+    execution = governor.plan([left_path, right_path], factor=3, fallback="partitioned_join")
+    with governor.track(execution, "join_datasets"):
+        if execution["strategy"] == "in_memory":
+            df_left = _read_csv(left_path)
+            df_right = _read_csv(right_path)
 
-def create_derived_feature(file_path: str, expression: str, new_col_name: str) -> str:
+            merged_df = pd.merge(df_left, df_right, on=on, how=how)
+
+            path = save_dataframe_to_csv(merged_df, "joined_data")
+        else:
+            path = _join_partitioned(left_path, right_path, on, how, execution)
+    return _result(path, execution, report)
+
+@traced
+def create_derived_feature(file_path: str, expression: str, new_col_name: str, report: bool = False) -> str:
     """
     Adds a new column based on a pandas-compatible expression.
+    Over the memory budget, the file is processed in streamed chunks (row-wise expressions only).
 
     Args:
         file_path: Path to the CSV file.
         expression: A string expression to evaluate (e.g., "total_amount / 100" or "col_a + col_b").
         new_col_name: The name of the new column to create.
+        report: Return {"path", "execution"} instead of the path.
 
     Returns:
         str: File path to the CSV with the new feature.
     """
-    df = pd.read_csv(file_path)
-    try:
-        df[new_col_name] = df.eval(expression)
-    except Exception as e:
-        raise ValueError(f"Failed to evaluate expression '{expression}': {e}")
-        
-    return save_dataframe_to_csv(df, "derived_feature")
+    def derive(df):
+        try:
+            df[new_col_name] = df.eval(expression)
+        except Exception as e:
+            raise ValueError(f"Failed to evaluate expression '{expression}': {e}")
+        return df
+
+    execution = governor.plan([file_path], factor=2, fallback="streamed")
+    with governor.track(execution, "create_derived_feature"):
+        if execution["strategy"] == "in_memory":
+            path = save_dataframe_to_csv(derive(_read_csv(file_path)), "derived_feature")
+        else:
+            chunks = governor.iter_csv(file_path, execution["chunk_rows"])
+            path = governor.write_csv_chunks(map(derive, chunks), "derived_feature")
+    return _result(path, execution, report)
+
+# Aggregations that can be computed per chunk and combined exactly
+_PARTIAL_AGGREGATIONS = {"sum": "sum", "count": "sum", "size": "sum", "min": "min", "max": "max",
+                         "first": "first", "last": "last"}
 
-def aggregate_dataset(file_path: str, group_by: list, aggregations: dict) -> str:
+def _aggregate_chunked(file_path: str, group_by: list, aggregations: dict, execution: dict):
+    """
+    Aggregates chunk by chunk and combines the partial results (mean = sum / count).
+    The partials hold one row per group, so they are bounded like a chunk (a quarter of
+    the headroom); returns None as soon as the groups alone exceed that.
+    """
+    partial_specs, combine = {}, {}
+    for col, func in aggregations.items():
+        if func == "mean":
+            partial_specs[f"{col}__sum"], partial_specs[f"{col}__count"] = (col, "sum"), (col, "count")
+            combine[f"{col}__sum"], combine[f"{col}__count"] = "sum", "sum"
+        else:
+            partial_specs[f"{col}__{func}"] = (col, func)
+            combine[f"{col}__{func}"] = _PARTIAL_AGGREGATIONS[func]
+
+    partials = []
+    for chunk in governor.iter_csv(file_path, execution["chunk_rows"]):
+        current_span().add("rows_in", len(chunk))
+        partials.append(chunk.groupby(group_by).agg(**partial_specs))
+        if sum(len(p) for p in partials) > execution["chunk_rows"]:
+            # Re-reduce so the partials stay bounded even with many groups
+            reduced = pd.concat(partials).groupby(level=group_by).agg(combine)
+            if reduced.memory_usage(deep=True).sum() / 2**20 > execution["headroom_mb"] / 4:
+                return None
+            partials = [reduced]
+    combined = pd.concat(partials).groupby(level=group_by).agg(combine)
+
+    result = pd.DataFrame(index=combined.index)
+    for col, func in aggregations.items():
+        if func == "mean":
+            result[col] = combined[f"{col}__sum"] / combined[f"{col}__count"]
+        else:
+            result[col] = combined[f"{col}__{func}"]
+    return result.reset_index()
+
+def _aggregate_partitioned(file_path: str, group_by: list, aggregations: dict, execution: dict) -> str:
+    """Hash-partitions rows by the group keys into spill files and aggregates each partition exactly."""
+    with governor.spill_dir() as spill:
+        parts = governor.partition_csv(file_path, group_by, execution["partitions"], execution["chunk_rows"], spill, "rows")
+        aggregated = (_read_csv(p).groupby(group_by).agg(aggregations).reset_index() for p in parts if p)
+        return governor.write_csv_chunks(aggregated, "aggregated_data")
+
+@traced
+def aggregate_dataset(file_path: str, group_by: list, aggregations: dict, report: bool = False) -> str:
     """
     Aggregates a dataset by grouping columns and applying aggregation functions.
+    Over the memory budget, decomposable aggregations (sum, count, mean, min, max, first, last)
+    are combined across chunks; any other function, or too many groups to hold the
+    partial results, runs per hash partition spilled to disk.
 
     Args:
         file_path: Path to the CSV file.
         group_by: List of column names to group by.
         aggregations: Dictionary mapping columns to functions (e.g., {'amount': 'sum', 'id': 'count'}).
+        report: Return {"path", "execution"} instead of the path.
 
     Returns:
         str: File path to the aggregated CSV.
     """
-    df = pd.read_csv(file_path)
-    agg_df = df.groupby(group_by).agg(aggregations).reset_index()
-    
-    return save_dataframe_to_csv(agg_df, "aggregated_data")
+    decomposable = all(isinstance(f, str) and (f == "mean" or f in _PARTIAL_AGGREGATIONS) for f in aggregations.values())
+    execution = governor.plan([file_path], factor=2,
+                              fallback="chunked_aggregate" if decomposable else "partitioned_aggregate")
+    with governor.track(execution, "aggregate_dataset"):
+        if execution["strategy"] == "in_memory":
+            df = _read_csv(file_path)
+            agg_df = df.groupby(group_by).agg(aggregations).reset_index()
+            path = save_dataframe_to_csv(agg_df, "aggregated_data")
+        elif execution["strategy"] == "chunked_aggregate":
+            agg_df = _aggregate_chunked(file_path, group_by, aggregations, execution)
+            if agg_df is None:
+                # Too many groups to combine in memory: spill them by hash partition instead
+                execution["strategy"] = "partitioned_aggregate"
+            else:
+                path = save_dataframe_to_csv(agg_df, "aggregated_data")
+        if execution["strategy"] == "partitioned_aggregate":
+            path = _aggregate_partitioned(file_path, group_by, aggregations, execution)
+    return _result(path, execution, report)
 
-def extract_date_features(file_path: str, date_col: str, features: list = ["year", "month", "day", "weekday"]) -> str:
+@traced
+def extract_date_features(file_path: str, date_col: str, features: list = ["year", "month", "day", "weekday"],
+                          report: bool = False) -> str:
     """
     Extracts date components from a datetime column.
+    Over the memory budget, the file is processed in streamed chunks.
 
     Args:
         file_path: Path to the CSV file.
         date_col: The name of the column containing date/datetime values.
         features: List of features to extract. Options: "year", "month", "day", "weekday".
+        report: Return {"path", "execution"} instead of the path.
 
     Returns:
         str: File path to the CSV with added date features.
     """
-    df = pd.read_csv(file_path)
-    df[date_col] = pd.to_datetime(df[date_col])
-    
-    for feature in features:
-        if feature == "year":
-            df[f"{date_col}_year"] = df[date_col].dt.year
-        elif feature == "month":
-            df[f"{date_col}_month"] = df[date_col].dt.month
-        elif feature == "day":
-            df[f"{date_col}_day"] = df[date_col].dt.day
-        elif feature == "weekday":
-            df[f"{date_col}_weekday"] = df[date_col].dt.weekday
-            
-    return save_dataframe_to_csv(df, "date_features")
-
-def bin_numeric_feature(file_path: str, col_name: str, bins: int = 10, labels: list = None) -> str:
+    def extract(df):
+        df[date_col] = pd.to_datetime(df[date_col])
+
+        for feature in features:
+            if feature == "year":
+                df[f"{date_col}_year"] = df[date_col].dt.year
+            elif feature == "month":
+                df[f"{date_col}_month"] = df[date_col].dt.month
+            elif feature == "day":
+                df[f"{date_col}_day"] = df[date_col].dt.day
+            elif feature == "weekday":
+                df[f"{date_col}_weekday"] = df[date_col].dt.weekday
+        return df
+
+    execution = governor.plan([file_path], factor=2, fallback="streamed")
+    with governor.track(execution, "extract_date_features"):
+        if execution["strategy"] == "in_memory":
+            path = save_dataframe_to_csv(extract(_read_csv(file_path)), "date_features")
+        else:
+            chunks = governor.iter_csv(file_path, execution["chunk_rows"])
+            path = governor.write_csv_chunks(map(extract, chunks), "date_features")
+    return _result(path, execution, report)
+
+@traced
+def bin_numeric_feature(file_path: str, col_name: str, bins: int = 10, labels: list = None,
+                        report: bool = False) -> str:
     """
     Bins a numeric column into discrete intervals.
+    Over the memory budget, a first streamed pass finds the range and a second writes the bins.
 
     Args:
         file_path: Path to the CSV file.
         col_name: The numeric column to bin.
         bins: Number of bins to create.
         labels: Optional list of labels for the bins.
+        report: Return {"path", "execution"} instead of the path.
 
     Returns:
         str: File path to the CSV with the new binned column.
     """
-    df = pd.read_csv(file_path)
     new_col = f"{col_name}_bin"
-    df[new_col] = pd.cut(df[col_name], bins=bins, labels=labels)
-    
-    return save_dataframe_to_csv(df, "binned_feature")
+    execution = governor.plan([file_path], factor=2, fallback="streamed")
+    with governor.track(execution, "bin_numeric_feature"):
+        if execution["strategy"] == "in_memory":
+            df = _read_csv(file_path)
+            df[new_col] = pd.cut(df[col_name], bins=bins, labels=labels)
+            path = save_dataframe_to_csv(df, "binned_feature")
+        else:
+            edges = bins
+            if isinstance(bins, int):
+                # Same edges pd.cut derives from the full column: equal widths, lowest edge widened by 0.1%
+                lo, hi = np.inf, -np.inf
+                for chunk in pd.read_csv(file_path, usecols=[col_name], chunksize=execution["chunk_rows"]):
+                    lo, hi = min(lo, chunk[col_name].min()), max(hi, chunk[col_name].max())
+                if lo == hi:
+                    adjust = 0.001 * abs(lo) if lo != 0 else 0.001
+                    edges = np.linspace(lo - adjust, hi + adjust, bins + 1)
+                else:
+                    edges = np.linspace(lo, hi, bins + 1)
+                    edges[0] -= (hi - lo) * 0.001
+
+            def cut(df):
+                df[new_col] = pd.cut(df[col_name], bins=edges, labels=labels)
+                return df
+
+            chunks = governor.iter_csv(file_path, execution["chunk_rows"])
+            path = governor.write_csv_chunks(map(cut, chunks), "binned_feature")
+    return _result(path, execution, report)
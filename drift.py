@@ -0,0 +1,211 @@
+"""Mergeable distribution sketches for data drift monitoring.
+
+`build_reference` summarizes the training data per feature. `train_model` saves it
+next to the model and links it in the registry metadata (`drift_reference`).
+- Numeric: counts over the reference's quantile bins, coarse (`drift.psi_bins`) for
+  PSI and fine (`drift.ks_bins`) for the KS statistic, plus missing count, sum and
+  sum of squares. The outer bins are open-ended, so new values outside the training
+  range still land in a bin.
+- Categorical (up to `drift.max_categories` levels): counts per category. New data
+  always keeps the reference's levels, adds unseen levels until the state holds
+  max_categories, and pools any further unseen levels as "__other__".
+
+New data is summarized with the same bins (`empty_like` + `update` per chunk), so
+memory is constant and time is linear in the rows. States are plain counts: `merge`
+adds them, so daily states can be combined into a weekly one.
+
+`compare` computes per feature:
+- PSI over the bins, with missing values as an extra bin.
+- KS, the largest CDF gap at the fine bin edges. For continuous features this
+  under-states the exact statistic by at most about 1 / ks_bins.
+- For categoricals, the largest absolute change in a category's share.
+"""
+
+import numpy as np
+import pandas as pd
+
+OTHER = "__other__"
+# Floor for empty bins in PSI, so a bin seen on one side only stays finite
+_EPSILON = 1e-4
+
+def _interior_edges(values: np.ndarray, n_bins: int) -> list:
+    if not len(values):
+        return []
+    return np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])).tolist()
+
+def _is_categorical(series: pd.Series) -> bool:
+    return not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
+
+def _numeric(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+
+def build_reference(df: pd.DataFrame, psi_bins: int = 10, ks_bins: int = 100, max_categories: int = 50) -> dict:
+    """
+    Builds the reference sketch of a training set.
+
+    Args:
+        df: Training rows (features only).
+        psi_bins: Quantile bins for PSI.
+        ks_bins: Quantile bins for the KS statistic.
+        max_categories: Categorical columns with more distinct values (ids, dates)
+            are skipped.
+
+    Returns:
+        dict: JSON-serializable sketch with rows and per-feature counts.
+    """
+    features = {}
+    for col in df.columns:
+        series = df[col]
+        if _is_categorical(series):
+            if series.nunique() <= max_categories:
+                features[col] = {"kind": "categorical"}
+        else:
+            present = _numeric(series)
+            present = present[~np.isnan(present)]
+            features[col] = {"kind": "numeric", "psi_edges": _interior_edges(present, psi_bins),
+                             "ks_edges": _interior_edges(present, ks_bins)}
+    return update(empty_like({"max_categories": max_categories, "features": features}), df)
+
+def empty_like(reference: dict) -> dict:
+    """A zero-count state over the reference's features and bins."""
+    features = {}
+    for col, feature in reference["features"].items():
+        if feature["kind"] == "numeric":
+            features[col] = {
+                "kind": "numeric",
+                "psi_edges": feature["psi_edges"],
+                "ks_edges": feature["ks_edges"],
+                "psi_counts": [0] * (len(feature["psi_edges"]) + 1),
+                "ks_counts": [0] * (len(feature["ks_edges"]) + 1),
+                "missing": 0, "sum": 0.0, "sum_sq": 0.0,
+            }
+        else:
+            # Reference levels start at zero, so they are never pooled into "__other__"
+            features[col] = {"kind": "categorical", "counts": dict.fromkeys(feature.get("counts", {}), 0),
+                             "missing": 0}
+    return {"rows": 0, "max_categories": reference.get("max_categories", 50), "features": features}
+
+def _add_level(counts: dict, level: str, n: int, max_categories: int):
+    if level not in counts and len(counts) - (OTHER in counts) >= max_categories:
+        level = OTHER
+    counts[level] = counts.get(level, 0) + n
+
+def update(state: dict, chunk: pd.DataFrame) -> dict:
+    """
+    Adds a chunk of rows to a state in place. A feature missing from the chunk is
+    left unchanged. Reference levels are always counted; an unseen level is kept
+    until the state holds max_categories levels, after that it goes to "__other__".
+
+    Returns:
+        dict: state.
+    """
+    state["rows"] += len(chunk)
+    for col, feature in state["features"].items():
+        if col not in chunk.columns:
+            continue
+        if feature["kind"] == "numeric":
+            values = _numeric(chunk[col])
+            missing = np.isnan(values)
+            present = values[~missing]
+            for name in ("psi", "ks"):
+                bins = np.searchsorted(feature[f"{name}_edges"], present, side="right")
+                counts = np.bincount(bins, minlength=len(feature[f"{name}_counts"]))
+                feature[f"{name}_counts"] = (np.asarray(feature[f"{name}_counts"]) + counts).tolist()
+            feature["missing"] += int(missing.sum())
+            feature["sum"] += float(present.sum())
+            feature["sum_sq"] += float(np.square(present).sum())
+        else:
+            series = chunk[col]
+            counts = feature["counts"]
+            for level, n in series.dropna().astype(str).value_counts().items():
+                _add_level(counts, level, int(n), state["max_categories"])
+            feature["missing"] += int(series.isna().sum())
+    return state
+
+def merge(a: dict, b: dict) -> dict:
+    """Combines two states built over the same reference (counts add, with the same category cap)."""
+    merged = empty_like(a)
+    merged["rows"] = a["rows"] + b["rows"]
+    for col, feature in merged["features"].items():
+        fa, fb = a["features"][col], b["features"][col]
+        feature["missing"] = fa["missing"] + fb["missing"]
+        if feature["kind"] == "numeric":
+            for key in ("psi_counts", "ks_counts"):
+                feature[key] = (np.asarray(fa[key]) + np.asarray(fb[key])).tolist()
+            feature["sum"] = fa["sum"] + fb["sum"]
+            feature["sum_sq"] = fa["sum_sq"] + fb["sum_sq"]
+        else:
+            feature["counts"] = dict(fa["counts"])
+            for level, n in fb["counts"].items():
+                _add_level(feature["counts"], level, n, merged["max_categories"])
+    return merged
+
+def _psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    p = np.maximum(expected / max(expected.sum(), 1), _EPSILON)
+    q = np.maximum(actual / max(actual.sum(), 1), _EPSILON)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+def _moments(feature: dict) -> tuple:
+    n = sum(feature["psi_counts"])
+    if not n:
+        return None, None
+    mean = feature["sum"] / n
+    return mean, float(np.sqrt(max(feature["sum_sq"] / n - mean ** 2, 0.0)))
+
+def compare(reference: dict, current: dict, psi_warn: float = 0.1, psi_alert: float = 0.25,
+            ks_alert: float = 0.1, share_alert: float = 0.05, top_shifts: int = 5) -> list:
+    """
+    Drift statistics for every feature in both states.
+
+    Returns:
+        list: One dict per feature with psi, ks (numeric), missing rates, mean/std
+        (numeric) or the largest share shifts (categorical), and a status of
+        "stable", "warn" or "drift".
+    """
+    rows = []
+    for col, ref in reference["features"].items():
+        cur = current["features"].get(col)
+        if cur is None:
+            continue
+        ref_rows = reference["rows"] or 1
+        cur_rows = current["rows"] or 1
+        row = {
+            "feature": col,
+            "kind": ref["kind"],
+            "missing_rate_reference": ref["missing"] / ref_rows,
+            "missing_rate_current": cur["missing"] / cur_rows,
+        }
+        if ref["kind"] == "numeric":
+            expected = np.append(ref["psi_counts"], ref["missing"]).astype(float)
+            actual = np.append(cur["psi_counts"], cur["missing"]).astype(float)
+            ref_cdf = np.cumsum(ref["ks_counts"]) / max(sum(ref["ks_counts"]), 1)
+            cur_cdf = np.cumsum(cur["ks_counts"]) / max(sum(cur["ks_counts"]), 1)
+            ks = float(np.max(np.abs(ref_cdf - cur_cdf))) if sum(cur["ks_counts"]) else None
+            (ref_mean, ref_std), (cur_mean, cur_std) = _moments(ref), _moments(cur)
+            row.update(psi=_psi(expected, actual), ks=ks, mean_reference=ref_mean, mean_current=cur_mean,
+                       std_reference=ref_std, std_current=cur_std)
+            breached = ks is not None and ks >= ks_alert
+        else:
+            levels = sorted({**ref["counts"], **cur["counts"]})
+            expected = np.array([ref["counts"].get(k, 0) for k in levels] + [ref["missing"]], dtype=float)
+            actual = np.array([cur["counts"].get(k, 0) for k in levels] + [cur["missing"]], dtype=float)
+            ref_share = expected[:-1] / max(expected[:-1].sum(), 1)
+            cur_share = actual[:-1] / max(actual[:-1].sum(), 1)
+            delta = cur_share - ref_share
+            order = np.argsort(-np.abs(delta), kind="stable")[:top_shifts]
+            row.update(psi=_psi(expected, actual), ks=None, shifts=[
+                {"category": levels[i], "share_reference": float(ref_share[i]),
+                 "share_current": float(cur_share[i]), "delta": float(delta[i])}
+                for i in order
+            ])
+            breached = bool(len(delta)) and float(np.max(np.abs(delta))) >= share_alert
+        if not current["rows"]:
+            row["status"] = "no_data"
+        elif row["psi"] >= psi_alert or breached:
+            row["status"] = "drift"
+        elif row["psi"] >= psi_warn:
+            row["status"] = "warn"
+        else:
+            row["status"] = "stable"
+        rows.append(row)
+    return rows
@@ -0,0 +1,153 @@
+"""Run-level memory budget for the file-based tools.
+
+Before loading an artifact, a tool estimates its in-memory footprint from the file
+size and a sample of rows (dtypes included) and asks `plan` whether that fits in the
+headroom left under `memory.budget_mb`. If it does not, the tool switches to an
+out-of-core path built from the helpers here:
+- `iter_csv`: stream fixed-size chunks.
+- `write_csv_chunks`: append chunks to one hashed artifact.
+- `partition_csv`: hash-partition rows by key columns into spill files, so each
+  partition can be joined or aggregated on its own.
+
+`track` measures the actual peak RSS while the tool runs (tracing.RssWatch), and the result reports the
+chosen strategy with estimated vs actual peak (see `execution`).
+"""
+
+import math
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from orchestrator import CONFIG, ArtifactFile, get_run_context, console
+from tracing import RssWatch, current_rss_mb
+
+def budget_mb():
+    """The run's memory budget in MB (None when unbounded)."""
+    return CONFIG.get("memory", {}).get("budget_mb")
+
+def estimate_csv(file_path: str, sample_rows: int = 5_000) -> dict:
+    """
+    Estimates the in-memory size of a CSV from its file size and a parsed sample.
+
+    Returns:
+        dict: Estimated rows, MB in memory, MB per row and the sampled dtypes.
+    """
+    file_bytes = os.path.getsize(file_path)
+    sample = pd.read_csv(file_path, nrows=sample_rows)
+    with open(file_path, "rb") as f:
+        header = f.readline()
+        sample_bytes = sum(len(f.readline()) for _ in range(len(sample)))
+    bytes_per_row = sample_bytes / len(sample) if len(sample) else 1
+    rows = int((file_bytes - len(header)) / bytes_per_row) if bytes_per_row else 0
+    mb_per_row = sample.memory_usage(deep=True, index=False).sum() / 2**20 / max(len(sample), 1)
+    return {
+        "rows": rows,
+        "mb": rows * mb_per_row,
+        "mb_per_row": mb_per_row,
+        "dtypes": {col: str(dtype) for col, dtype in sample.dtypes.items()},
+    }
+
+def plan(file_paths: list, factor: float, fallback: str) -> dict:
+    """
+    Decides between in-memory and out-of-core execution.
+
+    Args:
+        file_paths: Artifacts the tool will load.
+        factor: Peak working set as a multiple of the loaded data (copies, outputs).
+        fallback: Name of the tool's out-of-core strategy (e.g. "partitioned_join").
+
+    Returns:
+        dict: The execution record: strategy ("in_memory" or the fallback), estimated
+        peak, budget, headroom, and chunk_rows/partitions for the out-of-core path.
+    """
+    estimates = [estimate_csv(p) for p in file_paths]
+    estimated_mb = factor * sum(e["mb"] for e in estimates)
+    budget = budget_mb()
+    headroom = None if budget is None else max(budget - current_rss_mb(), 0.0)
+    execution = {
+        "strategy": "in_memory",
+        "estimated_peak_mb": round(estimated_mb, 1),
+        "budget_mb": budget,
+        "headroom_mb": None if headroom is None else round(headroom, 1),
+        "estimated_rows": [e["rows"] for e in estimates],
+    }
+    if headroom is not None and estimated_mb > headroom:
+        mb_per_row = max(e["mb_per_row"] for e in estimates) or 1e-6
+        # A chunk (and its intermediate copies) uses at most a quarter of the headroom
+        execution["strategy"] = fallback
+        execution["chunk_rows"] = max(1_000, int(headroom / 4 / (factor * mb_per_row)))
+        execution["partitions"] = max(2, math.ceil(estimated_mb / max(headroom / 2, 1.0)))
+    return execution
+
+@contextmanager
+def track(execution: dict, label: str):
+    """Measures the actual peak RSS increase of the enclosed work into execution."""
+    if execution["strategy"] != "in_memory":
+        console.print(f"[yellow]{label}: estimated {execution['estimated_peak_mb']:,.0f} MB exceeds "
+                      f"{execution['headroom_mb']:,.0f} MB headroom; using {execution['strategy']}[/yellow]")
+    rss = RssWatch()
+    try:
+        yield execution
+    finally:
+        execution["actual_peak_mb"] = round(rss.stop(), 1)
+
+def iter_csv(file_path: str, chunk_rows: int):
+    """Yields CSV chunks of chunk_rows rows."""
+    yield from pd.read_csv(file_path, chunksize=chunk_rows)
+
+def write_csv_chunks(chunks, prefix: str, subdir: str = "dataops", columns: list = None) -> str:
+    """Writes an iterable of frames as one CSV artifact (header from the first chunk)."""
+    artifact = ArtifactFile(prefix, "csv", subdir, text=True, label="CSV")
+    try:
+        header = True
+        for chunk in chunks:
+            if columns is not None:
+                chunk = chunk.reindex(columns=columns)
+            chunk.to_csv(artifact.handle, index=False, header=header)
+            if header:
+                columns = list(chunk.columns)
+            header = False
+        if header:
+            raise ValueError(f"No rows to write for '{prefix}'.")
+    except BaseException:
+        artifact.discard()
+        raise
+    return artifact.commit()
+
+@contextmanager
+def spill_dir():
+    """Temporary directory for spill files inside the run directory, removed afterwards."""
+    path = tempfile.mkdtemp(prefix=".spill_", dir=get_run_context()["dir"])
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+def _partition_ids(chunk: pd.DataFrame, keys: list, n_partitions: int) -> np.ndarray:
+    # Numeric keys hash as float64 so int and float columns (e.g. after NaNs) agree across files
+    normalized = pd.DataFrame({
+        k: chunk[k].astype("float64") if is_numeric_dtype(chunk[k]) else chunk[k].astype(str)
+        for k in keys
+    })
+    return (pd.util.hash_pandas_object(normalized, index=False).to_numpy() % n_partitions).astype(int)
+
+def partition_csv(file_path: str, keys: list, n_partitions: int, chunk_rows: int, out_dir: str, name: str) -> list:
+    """
+    Hash-partitions a CSV by key columns into n_partitions spill files, streaming it in
+    chunks. Rows with equal keys always land in the same partition.
+
+    Returns:
+        list: Partition file paths (a partition with no rows has no file).
+    """
+    paths = [os.path.join(out_dir, f"{name}_{i:04d}.csv") for i in range(n_partitions)]
+    written = set()
+    for chunk in iter_csv(file_path, chunk_rows):
+        ids = _partition_ids(chunk, keys, n_partitions)
+        for i, part in chunk.groupby(ids, sort=False):
+            part.to_csv(paths[i], mode="a", index=False, header=i not in written)
+            written.add(i)
+    return [p if i in written else None for i, p in enumerate(paths)]
@@ -63,27 +63,28 @@ def _infer_ext(data: Any) -> str:
         return "png"
     return "txt"
 
-def _save(full_path: str, data: Any, ext: str) -> None:
-    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+# Formats written as bytes; everything else is UTF-8 text
+_BINARY_EXTS = ("npy", "png")
+
+def _save(f, data: Any, ext: str) -> None:
     if ext == "csv":
-        data.to_csv(full_path, index=False)
+        data.to_csv(f, index=False)
     elif ext == "npy":
-        np.save(full_path, data)
+        np.save(f, data)
     elif ext == "json":
-        with open(full_path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        json.dump(data, f, indent=2, default=str)
     elif ext == "png":
         # Support matplotlib Figure, PIL Image, or numpy array (HxWxC or HxW)
         if mpl_figure and isinstance(data, mpl_figure.Figure):
-            data.savefig(full_path, bbox_inches="tight")
+            data.savefig(f, format="png", bbox_inches="tight")
         elif PILImage and isinstance(data, PILImage):
-            data.save(full_path)
+            data.save(f, format="PNG")
         elif isinstance(data, np.ndarray):
             try:
                 # Attempt to save via PIL if available
                 if PILImage:
                     img = PILImage.fromarray(data)
-                    img.save(full_path)
+                    img.save(f, format="PNG")
                 else:
                     # Fallback: write raw bytes if already bytes
                     raise ValueError("PIL not available to save numpy array as PNG")
@@ -92,8 +93,13 @@ def _save(full_path: str, data: Any, ext: str) -> None:
         else:
             raise ValueError("Unsupported data type for PNG export")
     else:
-        with open(full_path, "w") as f:
-            f.write(str(data))
+        f.write(str(data))
+
+def _save_deduplicated(full_path: str, data: Any, ext: str) -> None:
+    """Hashes while writing, then publishes the file as a link into the shared blob store (see blobstore.py)."""
+    # Importing orchestrator also loads config.yaml and applies its blobstore settings (once per process)
+    from orchestrator import write_deduplicated
+    write_deduplicated(lambda f: _save(f, data, ext), full_path, text=ext not in _BINARY_EXTS)
 
 def export(data: Any, name: Optional[str] = None, subdir: Optional[str] = None, ext: Optional[str] = None) -> Any:
     """
@@ -128,7 +134,7 @@ def export(data: Any, name: Optional[str] = None, subdir: Optional[str] = None,
             else:
                 data = str(data)
 
-        _save(full_path, data, ext)
+        _save_deduplicated(full_path, data, ext)
         print(f"Saved: {full_path}")
     except Exception as e:
         print(f"Error saving data: {e}")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Load generator for scoring_service.py.
+
+Replays member feature rows from a CSV against a running scoring service with a
+fixed number of concurrent clients, then prints client-side and server-side
+latency/throughput.
+
+Usage:
+    python loadgen_scoring.py --features output/<run>/mlops/<test_split>.csv --concurrency 32 --requests 5000
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+def _post(url: str, payload: dict) -> dict:
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+def run_load(url: str, rows: list, concurrency: int, n_requests: int) -> dict:
+    """Sends n_requests single-member payloads from `concurrency` threads."""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(i):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            _post(f"{url}/score", rows[i % len(rows)])
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(n_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies)
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000) if len(latencies) else None,
+        "p99_ms": float(np.percentile(latencies, 99) * 1000) if len(latencies) else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the local scoring service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--features", required=True, help="CSV of member feature rows to replay.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.features).select_dtypes(include=["number"])
+    rows = [{k: (None if pd.isna(v) else v) for k, v in r.items()} for r in df.to_dict(orient="records")]
+
+    client = run_load(args.url, rows, args.concurrency, args.requests)
+    with urllib.request.urlopen(f"{args.url}/metrics") as response:
+        server = json.loads(response.read())
+
+    table = Table(title=f"Scoring load test ({args.concurrency} concurrent clients)")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Client", justify="right")
+    table.add_column("Server", justify="right")
+    table.add_row("p50 latency (ms)", f"{client['p50_ms']:.2f}", f"{server['p50_ms']:.2f}")
+    table.add_row("p99 latency (ms)", f"{client['p99_ms']:.2f}", f"{server['p99_ms']:.2f}")
+    table.add_row("throughput (req/s)", f"{client['throughput_rps']:,.0f}", f"{server['throughput_rps']:,.0f}")
+    table.add_row("mean batch size", "", f"{server['mean_batch_size']:.1f}")
+    table.add_row("errors", str(client["errors"]), "")
+    console.print(table)
+
+if __name__ == "__main__":
+    main()
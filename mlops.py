@@ -1,34 +1,42 @@
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import xgboost as xgb
-import lightgbm as lgb
-from sklearn.metrics import roc_auc_score, f1_score, precision_score, recall_score, roc_curve
-from sklearn.calibration import calibration_curve
-from sklearn.model_selection import cross_val_score
-import optuna
-import joblib
-from orchestrator import save_model, save_dataframe_to_csv, save_metrics
+import numpy as np
+from orchestrator import (CONFIG, save_model, save_dataframe_to_csv, save_metrics,
+                          ArtifactFile, artifact_hash, console,
+                          submit_artifact)
+from registry import build_metadata, register_model, load_model, get_model_metadata
+from tracing import traced, current_span
 
+@traced
 def split_data_time_series(file_path: str, date_col: str, cutoff_date: str) -> dict:
     """
     Splits data into train/test paths based on time.
     """
     df = pd.read_csv(file_path)
+    current_span().add("rows_in", len(df))
     df[date_col] = pd.to_datetime(df[date_col])
     cutoff = pd.to_datetime(cutoff_date)
     
     train_df = df[df[date_col] < cutoff]
     test_df = df[df[date_col] >= cutoff]
     
-    train_path = save_dataframe_to_csv(train_df, "train_split", subdir="mlops")
+    # The train split is flushed in the background (if enabled) while the test split is written
+    train_future = submit_artifact(save_dataframe_to_csv, train_df, "train_split", subdir="mlops")
     test_path = save_dataframe_to_csv(test_df, "test_split", subdir="mlops")
     
-    return {"train": train_path, "test": test_path}
+    return {"train": train_future.result(), "test": test_path}
 
+@traced
 def train_model(train_path: str, target: str, algorithm: str, params: dict) -> str:
     """
     Trains a model (XGBoost/LGBM) and returns the model artifact path.
     """
     df = pd.read_csv(train_path)
+    current_span().add("rows_in", len(df))
     X = df.drop(columns=[target])
     y = df[target]
     
@@ -36,24 +44,46 @@ def train_model(train_path: str, target: str, algorithm: str, params: dict) -> s
     # Dropping non-numeric columns to avoid errors if not handled
     X = X.select_dtypes(include=['number'])
     
+    # Frameworks are imported on first use so importing mlops stays cheap
     if algorithm.lower() == "xgboost":
+        import xgboost as xgb
         model = xgb.XGBClassifier(**params)
         model.fit(X, y)
     elif algorithm.lower() == "lightgbm":
+        import lightgbm as lgb
         model = lgb.LGBMClassifier(**params)
         model.fit(X, y)
     else:
         raise ValueError(f"Unsupported algorithm: {algorithm}")
         
-    return save_model(model, f"{algorithm}_model", subdir="mlops")
+    # Reference sketch of the training distribution for monitor_drift
+    import drift
+    id_cols = [c for c in CONFIG.get("data", {}).get("id_columns", []) if c in df.columns]
+    settings = CONFIG.get("drift", {})
+    reference = drift.build_reference(df.drop(columns=[target] + id_cols), psi_bins=settings.get("psi_bins", 10),
+                                      ks_bins=settings.get("ks_bins", 100),
+                                      max_categories=settings.get("max_categories", 50))
+    reference_future = submit_artifact(save_metrics, reference, "drift_reference", subdir="mlops")
 
+    model_path = save_model(model, f"{algorithm}_model", subdir="mlops")
+    metadata = build_metadata(model, X, train_path, algorithm, params, target)
+    metadata["drift_reference"] = reference_future.result()
+    register_model(model, model_path, metadata)
+    return model_path
+
+@traced
 def run_backtest(model_path: str, test_path: str, target_col: str = "readmission_30d") -> dict:
     """
     Generates predictions and returns a dictionary of metrics.
-    Saves metrics and plot data to JSON files in output/mlops/.
+    Saves metrics and plot data to JSON files in output/mlops/, and the scored
+    test set (id columns, y_true, y_prob) to CSV for downstream review tools.
     """
-    model = joblib.load(model_path)
+    from sklearn.calibration import calibration_curve
+    from sklearn.metrics import roc_auc_score, f1_score, precision_score, recall_score, roc_curve
+
+    model = load_model(model_path)
     df = pd.read_csv(test_path)
+    current_span().add("rows_in", len(df))
     
     if target_col not in df.columns:
         raise ValueError(f"Target column '{target_col}' not found in test data.")
@@ -75,7 +105,7 @@ def run_backtest(model_path: str, test_path: str, target_col: str = "readmission
         "recall": float(recall_score(y_test, y_pred))
     }
     
-    metrics_path = save_metrics(metrics, "evaluation_metrics", subdir="mlops")
+    metrics_future = submit_artifact(save_metrics, metrics, "evaluation_metrics", subdir="mlops")
     
     # 2. Curve Data (ROC & Calibration)
     fpr, tpr, thresh_roc = roc_curve(y_test, y_prob)
@@ -91,19 +121,33 @@ def run_backtest(model_path: str, test_path: str, target_col: str = "readmission
         "calibration_curve": cal_data
     }
     
-    plots_path = save_metrics(plots_data, "plots_data", subdir="mlops")
+    plots_future = submit_artifact(save_metrics, plots_data, "plots_data", subdir="mlops")
+    
+    # 3. Scored Test Set (consumed by reviewer bootstrap/paired comparisons)
+    id_cols = [c for c in CONFIG.get("data", {}).get("id_columns", []) if c in df.columns]
+    scored_df = df[id_cols].copy()
+    scored_df["y_true"] = y_test.to_numpy()
+    scored_df["y_prob"] = y_prob
+    scores_path = save_dataframe_to_csv(scored_df, "scored_test", subdir="mlops")
     
     return {
         "metrics": metrics,
-        "metrics_file": metrics_path,
-        "plots_file": plots_path
+        "metrics_file": metrics_future.result(),
+        "plots_file": plots_future.result(),
+        "scores_file": scores_path
     }
 
+@traced
 def optimize_hyperparameters(train_path: str, target: str, n_trials: int) -> dict:
     """
     Runs an Optuna study and returns the best parameters.
     """
+    import optuna
+    import xgboost as xgb
+    from sklearn.model_selection import cross_val_score
+
     df = pd.read_csv(train_path)
+    current_span().add("rows_in", len(df))
     X = df.drop(columns=[target])
     X = X.select_dtypes(include=['number'])
     y = df[target]
@@ -138,3 +182,527 @@ def optimize_hyperparameters(train_path: str, target: str, n_trials: int) -> dic
     study.optimize(objective, n_trials=n_trials)
     
     return study.best_params
+
+def _iter_feature_chunks(source: str, chunk_size: int):
+    """
+    Yields DataFrame chunks from a local CSV/Parquet artifact, or from the warehouse
+    (a table name or SELECT statement) using a server-side cursor.
+    """
+    if os.path.exists(source):
+        if source.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(source, chunksize=chunk_size)
+        return
+
+    from sqlalchemy import text
+    from dataops import get_db_engine
+    query = source if source.lstrip().lower().startswith(("select", "with")) else f"SELECT * FROM {source}"
+    engine = get_db_engine()
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size) as conn:
+        if engine.dialect.name == "postgresql" and "schema" in CONFIG.get("database", {}):
+            conn.execute(text(f"SET search_path TO {CONFIG['database']['schema']}"))
+        yield from pd.read_sql(text(query), conn, chunksize=chunk_size)
+
+def _model_features(model) -> list:
+    """Returns the feature names (in training order) the model was fitted on."""
+    if hasattr(model, "feature_names_in_"):
+        return list(model.feature_names_in_)
+    if hasattr(model, "get_booster"):
+        return list(model.get_booster().feature_names)
+    raise ValueError("Model does not expose its training feature names.")
+
+def _private_booster(model, n_threads: int):
+    """
+    A copy of an XGBoost model's booster with its own thread count (None for other models).
+    XGBoost reads nthread from the booster, and the registry cache shares one model object
+    across callers, so the cached booster itself is never reconfigured.
+    """
+    if not hasattr(model, "get_booster"):
+        return None
+    booster = model.get_booster().copy()
+    booster.set_param({"nthread": n_threads})
+    return booster
+
+def _predict_positive(model, X: pd.DataFrame, n_threads: int, booster=None) -> np.ndarray:
+    """
+    Positive-class probabilities using the booster's batched, multi-threaded predictor.
+    Pass booster (from _private_booster) when predicting repeatedly with the same model.
+    """
+    if hasattr(model, "get_booster"):
+        return (booster or _private_booster(model, n_threads)).inplace_predict(X)
+    if hasattr(model, "booster_"):
+        return model.booster_.predict(X, num_threads=n_threads)
+    return model.predict_proba(X)[:, 1]
+
+@traced
+def score_population(model_path: str, source: str, id_cols: list = None, chunk_size: int = 100_000,
+                     destination: str = "parquet", table: str = "member_scores", n_threads: int = -1) -> dict:
+    """
+    Streams feature rows through a trained model in chunks and writes the scores in bulk.
+    The model is loaded once; each chunk is aligned to the training features (the same
+    numeric-only encoding train_model used), scored, written and dropped, so memory
+    stays flat regardless of population size.
+
+    Args:
+        model_path: Path to the model artifact returned by train_model.
+        source: A local CSV/Parquet artifact, a warehouse table name, or a SELECT statement.
+        id_cols: Identifier columns to carry into the scores (default: config data.id_columns present in the source).
+        chunk_size: Rows per chunk.
+        destination: 'parquet' (columnar artifact in output/mlops/) or 'postgres' (COPY into the scores table).
+        table: Scores table name when destination is 'postgres'.
+        n_threads: Prediction threads (-1 uses all cores).
+
+    Returns:
+        dict: Destination, row count, elapsed seconds and throughput (rows/sec).
+    """
+    if destination not in ("parquet", "postgres"):
+        raise ValueError(f"Unsupported destination: {destination}")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    model = load_model(model_path)
+    features = _model_features(model)
+    model_hash = artifact_hash(model_path)
+    n_threads = os.cpu_count() if n_threads in (None, -1) else n_threads
+    booster = _private_booster(model, n_threads)
+    scored_at = pd.Timestamp.now(tz="UTC")
+
+    writer = None
+    raw_conn = None
+    artifact = None
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk in _iter_feature_chunks(source, chunk_size):
+            if id_cols is None:
+                id_cols = [c for c in CONFIG.get("data", {}).get("id_columns", []) if c in chunk.columns]
+            X = chunk.reindex(columns=features).apply(pd.to_numeric, errors="coerce")
+            scores = chunk[id_cols].astype(str)
+            scores["score"] = _predict_positive(model, X, n_threads, booster).astype(np.float64)
+            scores["model_hash"] = model_hash
+            scores["scored_at"] = scored_at
+
+            if destination == "parquet":
+                batch = pa.Table.from_pandas(scores, preserve_index=False)
+                if writer is None:
+                    artifact = ArtifactFile("population_scores", "parquet", "mlops", label="Scores")
+                    writer = pq.ParquetWriter(artifact.handle, batch.schema)
+                writer.write_table(batch)
+            else:
+                if raw_conn is None:
+                    raw_conn = _open_scores_table(table, id_cols)
+                _copy_scores(raw_conn, table, scores)
+            rows += len(scores)
+
+        if destination == "parquet":
+            if writer is None:
+                raise ValueError(f"No rows found in source: {source}")
+            writer.close()
+            writer = None
+            output = artifact.commit()
+        else:
+            if raw_conn is None:
+                raise ValueError(f"No rows found in source: {source}")
+            raw_conn.commit()
+            output = f"{CONFIG.get('database', {}).get('schema', 'public')}.{table}"
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        if artifact is not None:
+            artifact.discard()
+        raise
+    finally:
+        if raw_conn is not None:
+            raw_conn.close()
+
+    seconds = time.perf_counter() - start
+    rows_per_sec = rows / seconds if seconds > 0 else float("inf")
+    current_span().set(rows_in=rows, rows_out=rows)
+    console.print(f"[dim]Scored {rows:,} rows in {seconds:.1f}s ({rows_per_sec:,.0f} rows/sec)[/dim]")
+    return {
+        "destination": output,
+        "model_hash": model_hash,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows_per_sec,
+    }
+
+def _open_scores_table(table: str, id_cols: list):
+    """Opens a raw DBAPI connection and creates the scores table if needed."""
+    from dataops import get_db_engine
+    schema = CONFIG.get("database", {}).get("schema", "public")
+    columns = ", ".join([f"{c} TEXT" for c in id_cols] + [
+        "score DOUBLE PRECISION", "model_hash TEXT", "scored_at TIMESTAMPTZ"
+    ])
+    raw_conn = get_db_engine().raw_connection()
+    with raw_conn.cursor() as cur:
+        cur.execute(f"CREATE TABLE IF NOT EXISTS {schema}.{table} ({columns})")
+    return raw_conn
+
+def _copy_scores(raw_conn, table: str, scores: pd.DataFrame):
+    """Bulk-loads one chunk of scores with Postgres COPY."""
+    schema = CONFIG.get("database", {}).get("schema", "public")
+    buf = io.StringIO()
+    scores.to_csv(buf, index=False, header=False)
+    buf.seek(0)
+    with raw_conn.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {schema}.{table} ({', '.join(scores.columns)}) FROM STDIN WITH (FORMAT csv)", buf
+        )
+
+def _contributions(model, X: pd.DataFrame, n_threads: int, booster=None) -> np.ndarray:
+    """
+    Exact tree SHAP values from the booster's built-in contribution predictor, in
+    log-odds. The last column is the bias (expected margin), so each row sums to the
+    model's raw score. For XGBoost the thread count comes from the booster (the DMatrix
+    nthread only covers its construction), so pass a booster from _private_booster.
+    """
+    if hasattr(model, "get_booster"):
+        import xgboost as xgb
+        booster = booster or _private_booster(model, n_threads)
+        return booster.predict(xgb.DMatrix(X, nthread=n_threads), pred_contribs=True)
+    if hasattr(model, "booster_"):
+        return model.booster_.predict(X, pred_contrib=True, num_threads=n_threads)
+    raise ValueError("Explanations need an XGBoost or LightGBM model (tree contributions).")
+
+def _dependence_edges(X: pd.DataFrame, n_bins: int) -> list:
+    """Interior quantile edges per feature; equal quantiles collapse (binary flags get 2 bins)."""
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    edges = []
+    for col in X.columns:
+        values = X[col].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        edges.append(np.unique(np.quantile(values, quantiles)) if len(values) else np.array([]))
+    return edges
+
+def _explain_slice(model, X: pd.DataFrame, edges: list, top_k: int, n_threads: int, booster=None) -> dict:
+    """
+    Contributions for one slice of rows, plus its mergeable partial aggregates: per-feature
+    sums for the global ranking and per-bin sums for the dependence summaries.
+    """
+    contribs = _contributions(model, X, n_threads, booster).astype(np.float32)
+    phi = contribs[:, :-1]
+    values = X.to_numpy(dtype=np.float32)
+
+    dependence = []
+    for j, feature_edges in enumerate(edges):
+        x = values[:, j]
+        missing = np.isnan(x)
+        bins = np.where(missing, len(feature_edges) + 1, np.searchsorted(feature_edges, x, side="right"))
+        size = len(feature_edges) + 2  # value bins + a trailing "missing" bin
+        dependence.append(np.stack([
+            np.bincount(bins, minlength=size),
+            np.bincount(bins, weights=np.where(missing, 0, x), minlength=size),
+            np.bincount(bins, weights=phi[:, j], minlength=size),
+            np.bincount(bins, weights=phi[:, j].astype(np.float64) ** 2, minlength=size),
+        ]))
+
+    # Reason codes: the k largest risk-increasing contributions per row
+    k = min(top_k, phi.shape[1])
+    top = np.argpartition(-phi, k - 1, axis=1)[:, :k] if k < phi.shape[1] else np.argsort(-phi, axis=1)
+    rows = np.arange(len(phi))[:, None]
+    top = np.take_along_axis(top, np.argsort(-phi[rows, top], axis=1), axis=1)[:, :k]
+    return {
+        "contribs": contribs,
+        "abs_sum": np.abs(phi).sum(axis=0, dtype=np.float64),
+        "sum": phi.sum(axis=0, dtype=np.float64),
+        "dependence": dependence,
+        "top": top,
+        "top_shap": phi[rows, top],
+        "top_value": values[rows, top],
+    }
+
+def _scores_for_chunk(scores: pd.DataFrame, keyed: bool, id_cols: list, chunk: pd.DataFrame, offset: int) -> pd.DataFrame:
+    """
+    The scored-test rows for a chunk of the test split: looked up by id when the
+    scores are keyed (indexed by their unique id columns), otherwise the rows at the
+    same positions, whose ids must then match.
+    """
+    if not set(id_cols) <= set(chunk.columns):
+        raise ValueError(f"Test split lacks the scored test set's id columns {id_cols}.")
+    ids = chunk[id_cols].astype(str)
+    if keyed:
+        positions = scores.index.get_indexer(pd.MultiIndex.from_frame(ids))
+        if (positions < 0).any():
+            raise ValueError("Scored test set has no row for some test-split ids.")
+        return scores.iloc[positions]
+    batch = scores.iloc[offset:offset + len(chunk)]
+    if len(batch) != len(chunk):
+        raise ValueError("Scored test set has fewer rows than the test split.")
+    if id_cols and not batch[id_cols].astype(str).reset_index(drop=True).equals(ids.reset_index(drop=True)):
+        raise ValueError("Scored test set rows are not in test-split order (ids differ).")
+    return batch
+
+@traced
+def explain_predictions(model_path: str, test_path: str, scores_path: str = None, top_k: int = 3,
+                        chunk_size: int = 50_000, n_threads: int = -1, dependence_bins: int = 10,
+                        dependence_top: int = 10) -> dict:
+    """
+    Explains a model's predictions with exact tree SHAP values from the booster's own
+    contribution predictor (XGBoost `pred_contribs`, LightGBM `pred_contrib`), which is
+    orders of magnitude faster than a generic SHAP explainer.
+    Rows stream in chunks; each chunk is split into slices explained concurrently on a
+    thread pool (the boosters release the GIL), and only mergeable sums are kept across
+    chunks, so memory stays flat regardless of the test set size.
+
+    Outputs (float32, columnar):
+    - `shap_values` Parquet: id columns, one contribution column per feature (suffixed `_shap`
+      when the model also uses an id column as a feature), and `base_value`.
+    - `shap_reasons` Parquet: id columns, `y_true`/`y_prob` from the scored test set (when
+      given), `score`, and the top-k risk-increasing features per member (`reason_1`,
+      `reason_1_shap`, `reason_1_value`, ...). Reasons are null when fewer than k features
+      push the risk up.
+    - `shap_summary` JSON: global mean |SHAP| ranking and, for the top features,
+      dependence summaries (mean SHAP per value bin; bin edges are quantiles of the
+      first chunk, with missing values in their own bin).
+
+    Args:
+        model_path: Path to the model artifact returned by train_model (XGBoost or LightGBM).
+        test_path: The test split (CSV/Parquet) the model was backtested on.
+        scores_path: Optional scored test set from run_backtest ('scores_file'), matched on the
+            id columns (by row when it has none or they are not unique).
+        top_k: Reason codes per member (at least 1).
+        chunk_size: Rows read per chunk.
+        n_threads: Total threads (-1 uses all cores).
+        dependence_bins: Quantile bins per feature for the dependence summaries.
+        dependence_top: Number of top-ranked features with dependence summaries.
+
+    Returns:
+        dict: Paths to the values, reasons and summary artifacts, row count, the top
+        features, and throughput (rows/sec).
+    """
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1.")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    model = load_model(model_path)
+    features = [str(f) for f in _model_features(model)]
+    model_hash = artifact_hash(model_path)
+    n_threads = os.cpu_count() if n_threads in (None, -1) else max(1, n_threads)
+    scores, score_ids, keyed = None, [], False
+    if scores_path:
+        scores = pd.read_csv(scores_path)
+        score_ids = [c for c in CONFIG.get("data", {}).get("id_columns", []) if c in scores.columns]
+        keyed = bool(score_ids) and not scores.duplicated(subset=score_ids).any()
+        if keyed:
+            scores.index = pd.MultiIndex.from_frame(scores[score_ids].astype(str))
+
+    writers = {}
+    artifacts = {}
+    edges = None
+    totals = {"abs_sum": 0.0, "sum": 0.0, "dependence": None}
+    base_value = None
+    boosters = {}  # private XGBoost booster per slice thread count, shared by the slices
+    rows = 0
+    start = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=n_threads)
+    try:
+        for chunk in _iter_feature_chunks(test_path, chunk_size):
+            id_cols = [c for c in CONFIG.get("data", {}).get("id_columns", []) if c in chunk.columns]
+            X = chunk.reindex(columns=features).apply(pd.to_numeric, errors="coerce")
+            if edges is None:
+                edges = _dependence_edges(X, dependence_bins)
+
+            # One slice per worker; each native call gets an equal share of the threads
+            n_slices = max(1, min(n_threads, len(X) // 1_000))
+            bounds = np.linspace(0, len(X), n_slices + 1, dtype=int)
+            threads_per_slice = max(1, n_threads // n_slices)
+            if threads_per_slice not in boosters:
+                boosters[threads_per_slice] = _private_booster(model, threads_per_slice)
+            booster = boosters[threads_per_slice]
+            parts = list(pool.map(
+                lambda b: _explain_slice(model, X.iloc[b[0]:b[1]], edges, top_k, threads_per_slice, booster),
+                zip(bounds[:-1], bounds[1:])
+            ))
+
+            contribs = np.concatenate([p["contribs"] for p in parts])
+            for key in ("abs_sum", "sum"):
+                totals[key] = totals[key] + sum(p[key] for p in parts)
+            dependence = [sum(p["dependence"][j] for p in parts) for j in range(len(features))]
+            totals["dependence"] = dependence if totals["dependence"] is None else [
+                a + b for a, b in zip(totals["dependence"], dependence)
+            ]
+            if base_value is None:
+                base_value = float(contribs[0, -1])
+
+            ids = chunk[id_cols].astype(str).reset_index(drop=True)
+            value_columns = [f"{f}_shap" if f in id_cols else f for f in features]
+            values = pd.concat([ids, pd.DataFrame(contribs[:, :-1], columns=value_columns)], axis=1)
+            values["base_value"] = contribs[:, -1]
+
+            reasons = ids.copy()
+            if scores is not None:
+                batch_scores = _scores_for_chunk(scores, keyed, score_ids, chunk, rows)
+                for col in ("y_true", "y_prob"):
+                    if col in batch_scores.columns:
+                        reasons[col] = batch_scores[col].to_numpy(dtype=np.float32 if col == "y_prob" else None)
+            reasons["score"] = (1.0 / (1.0 + np.exp(-contribs.sum(axis=1, dtype=np.float64)))).astype(np.float32)
+            top = np.concatenate([p["top"] for p in parts])
+            top_shap = np.concatenate([p["top_shap"] for p in parts])
+            top_value = np.concatenate([p["top_value"] for p in parts])
+            names = np.asarray(features, dtype=object)[top]
+            for i in range(top.shape[1]):
+                pushes_up = top_shap[:, i] > 0
+                reasons[f"reason_{i + 1}"] = pd.array(np.where(pushes_up, names[:, i], None), dtype="string")
+                reasons[f"reason_{i + 1}_shap"] = np.where(pushes_up, top_shap[:, i], np.nan).astype(np.float32)
+                reasons[f"reason_{i + 1}_value"] = np.where(pushes_up, top_value[:, i], np.nan).astype(np.float32)
+
+            for prefix, frame in (("shap_values", values), ("shap_reasons", reasons)):
+                batch = pa.Table.from_pandas(frame, preserve_index=False)
+                if prefix not in writers:
+                    artifacts[prefix] = ArtifactFile(prefix, "parquet", "mlops", label="Explanations")
+                    writers[prefix] = pq.ParquetWriter(artifacts[prefix].handle, batch.schema)
+                writers[prefix].write_table(batch)
+            rows += len(chunk)
+
+        if not writers:
+            raise ValueError(f"No rows found in test set: {test_path}")
+        if scores is not None and not keyed and len(scores) != rows:
+            raise ValueError("Scored test set and test split have different row counts.")
+        paths = {}
+        for prefix in list(writers):
+            writers.pop(prefix).close()
+            paths[prefix] = artifacts[prefix].commit()
+    except BaseException:
+        for prefix, writer in writers.items():
+            writer.close()
+            artifacts[prefix].discard()
+        raise
+    finally:
+        pool.shutdown()
+
+    mean_abs = totals["abs_sum"] / rows
+    ranking = np.argsort(-mean_abs, kind="stable")
+    dependence = {}
+    for j in ranking[:dependence_top]:
+        counts, value_sums, shap_sums, shap_squares = totals["dependence"][j]
+        feature_edges = edges[j].tolist()
+        bins = []
+        for b in np.flatnonzero(counts):
+            mean_shap = shap_sums[b] / counts[b]
+            bins.append({
+                "bin_low": None if b == 0 or b > len(feature_edges) else feature_edges[b - 1],
+                "bin_high": feature_edges[b] if b < len(feature_edges) else None,
+                "missing": bool(b == len(feature_edges) + 1),
+                "rows": int(counts[b]),
+                "mean_value": float(value_sums[b] / counts[b]) if b <= len(feature_edges) else None,
+                "mean_shap": float(mean_shap),
+                "std_shap": float(np.sqrt(max(shap_squares[b] / counts[b] - mean_shap ** 2, 0.0))),
+            })
+        dependence[features[j]] = bins
+
+    summary = {
+        "model_hash": model_hash,
+        "test_file": test_path,
+        "rows": rows,
+        "base_value": base_value,
+        "global": [
+            {"rank": rank + 1, "feature": features[j], "mean_abs_shap": float(mean_abs[j]),
+             "mean_shap": float(totals["sum"][j] / rows)}
+            for rank, j in enumerate(ranking)
+        ],
+        "dependence": dependence,
+    }
+    summary_path = save_metrics(summary, "shap_summary", subdir="mlops")
+
+    seconds = time.perf_counter() - start
+    rows_per_sec = rows / seconds if seconds > 0 else float("inf")
+    current_span().set(rows_in=rows, rows_out=rows)
+    console.print(f"[dim]Explained {rows:,} rows in {seconds:.1f}s ({rows_per_sec:,.0f} rows/sec)[/dim]")
+    return {
+        "values_file": paths["shap_values"],
+        "reasons_file": paths["shap_reasons"],
+        "summary_file": summary_path,
+        "rows": rows,
+        "top_features": [features[j] for j in ranking[:10]],
+        "seconds": seconds,
+        "rows_per_sec": rows_per_sec,
+    }
+
+@traced
+def monitor_drift(model_path: str, source: str = "fct_claim", chunk_size: int = 100_000, chart: bool = True) -> dict:
+    """
+    Compares new data with the distribution a model was trained on, using the
+    reference sketch saved by train_model (see drift.py). The source is streamed in
+    chunks into a state with the same bins. Only counts are kept, so time is linear
+    in the new rows and memory is constant.
+
+    Args:
+        model_path: Path to the model artifact returned by train_model (or its content hash).
+        source: A warehouse table name or SELECT statement (e.g. the latest fct_claim
+            batch), or a local CSV/Parquet artifact.
+        chunk_size: Rows per chunk.
+        chart: Also save the vizops drift summary chart.
+
+    Returns:
+        dict: Paths to the drift report JSON (per-feature PSI, KS, category share
+        shifts and status, plus the mergeable state) and chart, the row count, and
+        the drifted/warned features.
+    """
+    import blobstore
+    import drift
+
+    metadata = get_model_metadata(model_path)
+    reference_path = metadata.get("drift_reference")
+    if not reference_path:
+        raise ValueError("Model has no drift reference; retrain it with train_model.")
+    if not os.path.exists(reference_path):
+        blobstore.restore(reference_path)
+    with open(reference_path) as f:
+        reference = json.load(f)
+    settings = CONFIG.get("drift", {})
+
+    state = drift.empty_like(reference)
+    seen = set()
+    start = time.perf_counter()
+    for chunk in _iter_feature_chunks(source, chunk_size):
+        seen.update(chunk.columns)
+        drift.update(state, chunk)
+    columns_missing = [c for c in reference["features"] if c not in seen]
+    for col in columns_missing:
+        state["features"].pop(col)
+
+    features = drift.compare(
+        reference, state,
+        psi_warn=settings.get("psi_warn", 0.1), psi_alert=settings.get("psi_alert", 0.25),
+        ks_alert=settings.get("ks_alert", 0.1), share_alert=settings.get("share_alert", 0.05),
+    )
+    features.sort(key=lambda row: row["psi"], reverse=True)
+    report = {
+        "model_hash": metadata["model_hash"],
+        "reference_file": reference_path,
+        "source": source,
+        "rows_reference": reference["rows"],
+        "rows": state["rows"],
+        "thresholds": {k: settings.get(k, v) for k, v in
+                       {"psi_warn": 0.1, "psi_alert": 0.25, "ks_alert": 0.1, "share_alert": 0.05}.items()},
+        "drifted": [row["feature"] for row in features if row["status"] == "drift"],
+        "warned": [row["feature"] for row in features if row["status"] == "warn"],
+        "columns_missing": columns_missing,
+        "features": features,
+        "state": state,
+    }
+    report_path = save_metrics(report, "drift_report", subdir="mlops")
+    chart_path = None
+    if chart:
+        from vizops import plot_drift_summary
+        chart_path = plot_drift_summary(report_path)
+
+    seconds = time.perf_counter() - start
+    rows_per_sec = state["rows"] / seconds if seconds > 0 else float("inf")
+    current_span().set(rows_in=state["rows"])
+    console.print(f"[dim]Drift check on {state['rows']:,} rows: {len(report['drifted'])} drifted, "
+                  f"{len(report['warned'])} warned ({rows_per_sec:,.0f} rows/sec)[/dim]")
+    return {
+        "report_file": report_path,
+        "chart_file": chart_path,
+        "rows": state["rows"],
+        "drifted": report["drifted"],
+        "warned": report["warned"],
+        "columns_missing": columns_missing,
+        "rows_per_sec": rows_per_sec,
+    }
@@ -1,33 +1,94 @@
 import os
+import json
+import re
 import pandas as pd
-import yaml
 from datetime import datetime
 import hashlib
 import shutil
-import joblib
+import tempfile
+import threading
+import io
+import queue
+import atexit
+import time
+import importlib
+import multiprocessing
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 from rich.console import Console
+import blobstore
+import tracing
+from tracing import traced, current_span
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
 
 # Initialize Rich Console
 console = Console()
 
-# Load config
-def load_config():
+# Config files merged (in order) into CONFIG
+CONFIG_FILES = ["config.yaml", "dataops.yaml"]
+# Parsed config keyed by file mtime/size, so short-lived tool processes skip importing and running YAML
+CONFIG_CACHE = os.path.join("__pycache__", "config_cache.json")
+
+def _config_signature() -> list:
+    signature = []
+    for path in CONFIG_FILES:
+        try:
+            st = os.stat(path)
+            signature.append([path, st.st_mtime_ns, st.st_size])
+        except OSError:
+            signature.append([path, None, None])
+    return signature
+
+def _parse_config_files() -> dict:
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     config = {}
-    # Load main config
-    if os.path.exists("config.yaml"):
-        with open("config.yaml", "r") as f:
-            config.update(yaml.safe_load(f))
-    
-    # Load dataops config
-    if os.path.exists("dataops.yaml"):
-        with open("dataops.yaml", "r") as f:
-            dataops_config = yaml.safe_load(f)
-            if dataops_config:
-                config.update(dataops_config)
-                
+    for path in CONFIG_FILES:
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                parsed = yaml.load(f, Loader=loader)
+            if parsed:
+                config.update(parsed)
+    return config
+
+def load_config(use_cache: bool = True) -> dict:
+    """
+    Loads config.yaml and dataops.yaml (dataops keys win), reusing the parsed result
+    cached in __pycache__ while neither file has changed.
+    """
+    signature = _config_signature()
+    if use_cache:
+        try:
+            with open(CONFIG_CACHE) as f:
+                cached = json.load(f)
+            if cached.get("signature") == signature:
+                return cached["config"]
+        except (OSError, ValueError, AttributeError):
+            pass
+    config = _parse_config_files()
+    if use_cache:
+        try:
+            payload = json.dumps({"signature": signature, "config": config})
+            if json.loads(payload)["config"] != config:
+                # JSON turns non-str keys into strings and tuples into lists: a warm load would differ
+                raise TypeError("config does not round-trip through JSON")
+            os.makedirs(os.path.dirname(CONFIG_CACHE), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".config_cache_", dir=os.path.dirname(CONFIG_CACHE))
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(temp_path, CONFIG_CACHE)
+        except (OSError, TypeError, ValueError):
+            pass  # Read-only checkout or values JSON cannot hold exactly (dates, int keys): parse every time
     return config
 
 CONFIG = load_config()
+if CONFIG.get("tracing", {}).get("enabled", False):
+    tracing.set_enabled(True)
+blobstore.configure_from(CONFIG)
 
 # Global Run Context
 _RUN_CONTEXT = {
@@ -35,143 +96,402 @@ _RUN_CONTEXT = {
     "timestamp": None,
     "step": 0
 }
+_CONTEXT_LOCK = threading.RLock()
+
+# Process pool workers (see process_pool) inherit the parent's run directory through this variable
+RUN_DIR_ENV = "CLASSIFIER_RUN_DIR"
 
 def get_run_context() -> dict:
     """Initializes or retrieves the current run context."""
     global _RUN_CONTEXT
     
-    if _RUN_CONTEXT["dir"] is None:
-        root_dir = CONFIG.get("output", {}).get("root_dir", "output")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        run_dir = os.path.join(root_dir, timestamp)
-        
-        config_dst = os.path.join(run_dir, "config")
-        
-        # Create agent directories
-        os.makedirs(os.path.join(run_dir, "dataops"), exist_ok=True)
-        os.makedirs(os.path.join(run_dir, "mlops"), exist_ok=True)
-        os.makedirs(os.path.join(run_dir, "vizops"), exist_ok=True)
-        
-        if not os.path.exists(config_dst):
-            os.makedirs(config_dst, exist_ok=True)
-            for f in ["config.yaml", "dataops.yaml", "infrastructure.yml"]:
-                if os.path.exists(f):
-                    shutil.copy(f, config_dst)
+    with _CONTEXT_LOCK:
+        if _RUN_CONTEXT["dir"] is None:
+            inherited = os.environ.get(RUN_DIR_ENV)
+            if inherited:
+                run_dir = inherited
+                timestamp = os.path.basename(os.path.normpath(inherited))
+            else:
+                root_dir = CONFIG.get("output", {}).get("root_dir", "output")
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                run_dir = os.path.join(root_dir, timestamp)
             
-        _RUN_CONTEXT["dir"] = run_dir
-        _RUN_CONTEXT["timestamp"] = timestamp
+            config_dst = os.path.join(run_dir, "config")
+            
+            # Agent subdirectories (dataops/, mlops/, ...) are created by their first artifact
+            os.makedirs(run_dir, exist_ok=True)
+            
+            if not os.path.exists(config_dst):
+                os.makedirs(config_dst, exist_ok=True)
+                for f in ["config.yaml", "dataops.yaml", "infrastructure.yml"]:
+                    if os.path.exists(f):
+                        shutil.copy(f, config_dst)
+                
+            _RUN_CONTEXT["dir"] = run_dir
+            _RUN_CONTEXT["timestamp"] = timestamp
         
     return _RUN_CONTEXT
 
-def calculate_file_hash(file_path: str) -> str:
-    """Calculates a hash of a file's content."""
+def _init_worker(run_dir: str, blob_settings: dict):
+    """Process pool initializer: the worker (and its subprocesses) write into the parent's run directory and blob store."""
+    os.environ[RUN_DIR_ENV] = run_dir
+    blobstore.configure(**blob_settings)
+
+def process_pool(max_workers: int = None) -> ProcessPoolExecutor:
+    """Spawn-based process pool whose workers share this process's run directory and step counter."""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker, initargs=(get_run_context()["dir"], blobstore.settings()))
+
+@contextmanager
+def _file_lock(lock_path: str):
+    """Exclusive lock shared by threads and processes (flock on a sidecar lock file)."""
+    with _CONTEXT_LOCK:
+        with open(lock_path, "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+def _next_step() -> int:
+    """
+    Allocates the next step number from a counter file in the run directory,
+    so threads and processes sharing a run never receive the same step.
+    """
+    context = get_run_context()
+    with _file_lock(os.path.join(context["dir"], ".step_counter")) as f:
+        f.seek(0)
+        current = f.read().strip()
+        step = max(int(current) if current else 0, context["step"]) + 1
+        f.seek(0)
+        f.truncate()
+        f.write(str(step))
+        f.flush()
+    context["step"] = step
+    return step
+
+def new_temp_path(prefix: str, extension: str, subdir: str) -> str:
+    """Creates a unique temp file in the run's subdir; the extension is kept last so writers can infer the format."""
+    output_dir = os.path.join(get_run_context()["dir"], subdir)
+    os.makedirs(output_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{prefix}_", suffix=f".tmp.{extension}", dir=output_dir)
+    os.close(fd)
+    return temp_path
+
+# Artifacts are written and hashed in large blocks (hashlib releases the GIL above 2 KB)
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+def _file_sha256(file_path: str) -> str:
     h = hashlib.sha256()
     with open(file_path, 'rb') as f:
-        while chunk := f.read(8192):
+        while chunk := f.read(WRITE_BUFFER_SIZE):
             h.update(chunk)
-    return h.hexdigest()[:8]
+    return h.hexdigest()
+
+def calculate_file_hash(file_path: str) -> str:
+    """Calculates a hash of a file's content."""
+    return _file_sha256(file_path)[:8]
+
+class _HashingFile(io.RawIOBase):
+    """
+    Unbuffered binary sink that feeds every byte written into a SHA-256. Up to
+    spool_bytes are held in memory, so a small artifact that is already in the blob
+    store is never written; past that, it spills to the file from open_file().
+    """
+
+    def __init__(self, open_file, spool_bytes: int = 0):
+        self._open_file = open_file
+        self._f = None
+        self._spool = bytearray()
+        self._spool_bytes = spool_bytes
+        self.sha256 = hashlib.sha256()
+        self._position = 0
+        if not spool_bytes:
+            self._spill()
+
+    def _spill(self):
+        self._f = open(self._open_file(), "wb", buffering=0)
+        self._write_all(self._spool)
+        self._spool = bytearray()
+
+    def _write_all(self, view):
+        written = 0
+        while written < len(view):
+            written += self._f.write(view[written:])
+
+    @property
+    def spooled(self) -> bool:
+        """True while the content is still only in memory."""
+        return self._f is None
+
+    def getvalue(self) -> bytes:
+        return bytes(self._spool)
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        # Lets joblib align memory-mappable arrays without making the stream seekable
+        return self._position
+
+    def write(self, b) -> int:
+        view = memoryview(b).cast("B")
+        self.sha256.update(view)
+        if self._f is None and len(self._spool) + len(view) > self._spool_bytes:
+            self._spill()
+        if self._f is None:
+            self._spool += view
+        else:
+            self._write_all(view)
+        self._position += len(view)
+        return len(view)
+
+    def close(self):
+        if not self.closed and self._f is not None:
+            self._f.close()
+        super().close()
+
+class ArtifactFile:
+    """
+    Write handle for a run artifact whose content hash is computed as it is written,
+    so publishing it needs no second pass over the file. Content already in the blob
+    store is linked instead of stored again (see blobstore.py).
+
+    Usage:
+        artifact = ArtifactFile("query_result", "csv", "dataops", text=True)
+        df.to_csv(artifact.handle, index=False)
+        path = artifact.commit()
+    """
+
+    def __init__(self, prefix: str, extension: str, subdir: str, text: bool = False, label: str = None):
+        self.prefix, self.extension, self.subdir = prefix, extension, subdir
+        self.label = label
+        self.temp_path = None
+        self.bytes_written = 0
+        self._raw = _HashingFile(self._new_temp_path, spool_bytes=blobstore.spool_bytes())
+        buffered = io.BufferedWriter(self._raw, buffer_size=WRITE_BUFFER_SIZE)
+        self.handle = io.TextIOWrapper(buffered, encoding="utf-8", newline="") if text else buffered
+
+    def _new_temp_path(self) -> str:
+        self.temp_path = new_temp_path(self.prefix, self.extension, self.subdir)
+        return self.temp_path
+
+    def commit(self) -> str:
+        """Flushes and closes the handle, then publishes the file under its standardized name."""
+        if not self.handle.closed:
+            self.handle.close()
+        sha256 = self._raw.sha256.hexdigest()
+        if self._raw.spooled:
+            final_path = _artifact_path(self.prefix, self.extension, self.subdir, sha256[:8])
+            self.bytes_written = blobstore.put_bytes(self._raw.getvalue(), sha256, final_path)
+            console.print(f"[dim]Saved {self.label or self.extension.upper()}:[/dim] {final_path}")
+            return final_path
+        self.bytes_written = os.path.getsize(self.temp_path)
+        return register_artifact(self.temp_path, self.prefix, self.extension, self.subdir,
+                                 label=self.label, content_hash=sha256)
+
+    def discard(self):
+        """Closes the handle and removes the partial file."""
+        if not self.handle.closed:
+            self.handle.close()
+        if self.temp_path and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+def write_deduplicated(write_fn, dest: str, text: bool = False) -> int:
+    """
+    Runs write_fn(handle) against a hashing handle and publishes the content as dest, a
+    path chosen by the caller (e.g. incrementer.export), linked into the blob store when
+    enabled. Like ArtifactFile, the hash is computed while writing.
+
+    Returns:
+        int: Bytes added to the store (0 for a duplicate).
+    """
+    directory = os.path.dirname(os.path.abspath(dest))
+    os.makedirs(directory, exist_ok=True)
+    temp_paths = []
+
+    def open_temp():
+        fd, temp_path = tempfile.mkstemp(prefix=".export_", suffix=".tmp", dir=directory)
+        os.close(fd)
+        temp_paths.append(temp_path)
+        return temp_path
+
+    raw = _HashingFile(open_temp, spool_bytes=blobstore.spool_bytes())
+    buffered = io.BufferedWriter(raw, buffer_size=WRITE_BUFFER_SIZE)
+    handle = io.TextIOWrapper(buffered, encoding="utf-8", newline="") if text else buffered
+    try:
+        write_fn(handle)
+        handle.close()
+        sha256 = raw.sha256.hexdigest()
+        if raw.spooled:
+            return blobstore.put_bytes(raw.getvalue(), sha256, dest)
+        return blobstore.put_file(temp_paths[0], sha256, dest)
+    finally:
+        if not handle.closed:
+            handle.close()
+        for temp_path in temp_paths:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+def _write_artifact(write_fn, prefix: str, extension: str, subdir: str, label: str, text: bool = False) -> str:
+    """Runs write_fn(handle) against a hashing artifact handle and publishes the result."""
+    artifact = ArtifactFile(prefix, extension, subdir, text=text, label=label)
+    try:
+        write_fn(artifact.handle)
+    except BaseException:
+        artifact.discard()
+        raise
+    path = artifact.commit()
+    span = current_span()
+    span.add("bytes_written", artifact.bytes_written)
+    span.add("bytes_deduplicated", artifact._raw.tell() - artifact.bytes_written)
+    return path
 
 def _generate_filename(prefix: str, extension: str, content_hash: str) -> str:
     """Generates the standardized filename."""
     context = get_run_context()
-    context["step"] += 1
-    step = context["step"]
+    step = _next_step()
     timestamp = context["timestamp"]
     
     nn = step % 100
     return f"{step:03d}_{timestamp}{nn:02d}_{content_hash}_{prefix}.{extension}"
 
+# Matches the content hash in "NNN_YYYYMMDD_HHMMSSNN_<hash>_<prefix>.<ext>"
+_ARTIFACT_NAME_RE = re.compile(r"^\d{3,}_[^_]+_[^_]+_([0-9a-f]{8})_")
+
+def parse_artifact_hash(file_path: str):
+    """Returns the content hash embedded in a standardized filename, or None."""
+    match = _ARTIFACT_NAME_RE.match(os.path.basename(file_path))
+    return match.group(1) if match else None
+
+def artifact_hash(file_path: str) -> str:
+    """Returns the content hash embedded in a standardized filename, hashing the file if absent."""
+    return parse_artifact_hash(file_path) or calculate_file_hash(file_path)
+
+def _artifact_path(prefix: str, extension: str, subdir: str, content_hash: str) -> str:
+    output_dir = os.path.join(get_run_context()["dir"], subdir)
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, _generate_filename(prefix, extension, content_hash[:8]))
+
+def register_artifact(temp_path: str, prefix: str, extension: str, subdir: str,
+                      label: str = None, content_hash: str = None) -> str:
+    """
+    Publishes a finished temp file (see new_temp_path) under the standardized filename
+    in the run's subdir, as a link into the blob store when enabled. The file is hashed
+    first unless its full SHA-256 is given as content_hash.
+    """
+    if content_hash is None or (blobstore.is_enabled() and len(content_hash) < 64):
+        content_hash = _file_sha256(temp_path)
+    final_path = _artifact_path(prefix, extension, subdir, content_hash)
+    blobstore.put_file(temp_path, content_hash, final_path)
+    console.print(f"[dim]Saved {label or extension.upper()}:[/dim] {final_path}")
+    return final_path
+
+@traced(cat="io")
 def save_dataframe_to_csv(df: pd.DataFrame, prefix: str, subdir: str = "dataops") -> str:
     """Saves DataFrame to CSV with content hash in filename."""
-    context = get_run_context()
-    output_dir = os.path.join(context["dir"], subdir)
-    
-    # Temp filename
-    temp_filename = f"{prefix}_temp.csv"
-    temp_path = os.path.join(output_dir, temp_filename)
-    
-    df.to_csv(temp_path, index=False)
-    
-    # Calculate hash from file
-    content_hash = calculate_file_hash(temp_path)
-    
-    # Final filename
-    final_filename = _generate_filename(prefix, "csv", content_hash)
-    final_path = os.path.join(output_dir, final_filename)
-    
-    os.rename(temp_path, final_path)
-    console.print(f"[dim]Saved CSV:[/dim] {final_path}")
-    return final_path
+    current_span().add("rows_out", len(df))
+    return _write_artifact(lambda f: df.to_csv(f, index=False), prefix, "csv", subdir, "CSV", text=True)
 
+@traced(cat="io")
 def save_model(model, prefix: str, subdir: str = "mlops") -> str:
     """Saves a model object to a file with content hash in filename."""
-    context = get_run_context()
-    output_dir = os.path.join(context["dir"], subdir)
-    
-    # Temp filename
-    temp_filename = f"{prefix}_temp.joblib"
-    temp_path = os.path.join(output_dir, temp_filename)
-    
-    joblib.dump(model, temp_path)
-    
-    # Calculate hash from file
-    content_hash = calculate_file_hash(temp_path)
-    
-    # Final filename
-    final_filename = _generate_filename(prefix, "joblib", content_hash)
-    final_path = os.path.join(output_dir, final_filename)
-    
-    os.rename(temp_path, final_path)
-    console.print(f"[dim]Saved Model:[/dim] {final_path}")
-    return final_path
-
-import json
+    import joblib
+    return _write_artifact(lambda f: joblib.dump(model, f), prefix, "joblib", subdir, "Model")
 
+@traced(cat="io")
 def save_metrics(metrics: dict, prefix: str, subdir: str = "mlops") -> str:
     """Saves metrics dictionary to a JSON file."""
-    context = get_run_context()
-    output_dir = os.path.join(context["dir"], subdir)
-    
-    # Temp filename
-    temp_filename = f"{prefix}_temp.json"
-    temp_path = os.path.join(output_dir, temp_filename)
-    
-    with open(temp_path, "w") as f:
-        json.dump(metrics, f, indent=2)
-    
-    # Calculate hash from file
-    content_hash = calculate_file_hash(temp_path)
-    
-    # Final filename
-    final_filename = _generate_filename(prefix, "json", content_hash)
-    final_path = os.path.join(output_dir, final_filename)
-    
-    os.rename(temp_path, final_path)
-    console.print(f"[dim]Saved Metrics:[/dim] {final_path}")
-    return final_path
+    return _write_artifact(lambda f: json.dump(metrics, f, indent=2), prefix, "json", subdir, "Metrics", text=True)
 
+@traced(cat="io")
 def save_altair_chart(chart, prefix: str, subdir: str = "vizops") -> str:
     """Saves an Altair chart to an HTML file."""
-    context = get_run_context()
-    output_dir = os.path.join(context["dir"], subdir)
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Temp filename
-    temp_filename = f"{prefix}_temp.html"
-    temp_path = os.path.join(output_dir, temp_filename)
-    
-    chart.save(temp_path)
-    
-    # Calculate hash from file
-    content_hash = calculate_file_hash(temp_path)
-    
-    # Final filename
-    final_filename = _generate_filename(prefix, "html", content_hash)
-    final_path = os.path.join(output_dir, final_filename)
-    
-    os.rename(temp_path, final_path)
-    console.print(f"[dim]Saved Chart:[/dim] {final_path}")
-    return final_path
+    return _write_artifact(lambda f: chart.save(f, format="html"), prefix, "html", subdir, "Chart", text=True)
+
+class _BackgroundWriter:
+    """
+    Single writer thread fed by a bounded queue, so compute can continue while the
+    previous artifact is flushed. A full queue blocks the producer (backpressure).
+    """
+
+    def __init__(self, max_pending: int):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            future, context, save_fn, args, kwargs = self._queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    # Run in the submitter's context so the save span nests under its tool
+                    future.set_result(context.run(save_fn, *args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, save_fn, *args, **kwargs) -> Future:
+        future = Future()
+        self._queue.put((future, contextvars.copy_context(), save_fn, args, kwargs))
+        return future
+
+    def join(self):
+        self._queue.join()
+
+_BACKGROUND_WRITER = None
+_PENDING_ARTIFACTS = []
+# Futures queued by the current tool call (set by _call_tool); None outside a tool call
+_CALL_ARTIFACTS = contextvars.ContextVar("call_artifacts", default=None)
+
+def submit_artifact(save_fn, *args, **kwargs) -> Future:
+    """
+    Queues save_fn(*args, **kwargs) (any save_* function) on the background writer when
+    output.background_writes is enabled, otherwise runs it inline. Returns a Future that
+    resolves to the artifact path. The caller must not mutate the object until then.
+    """
+    global _BACKGROUND_WRITER
+    output_config = CONFIG.get("output", {})
+    if not output_config.get("background_writes", False):
+        future = Future()
+        future.set_result(save_fn(*args, **kwargs))
+        return future
+
+    with _CONTEXT_LOCK:
+        if _BACKGROUND_WRITER is None:
+            get_run_context()
+            _BACKGROUND_WRITER = _BackgroundWriter(int(output_config.get("max_pending_writes", 4)))
+    # Enqueue outside the lock: a full queue blocks until the writer (which needs the lock) drains it
+    future = _BACKGROUND_WRITER.submit(save_fn, *args, **kwargs)
+    call_artifacts = _CALL_ARTIFACTS.get()
+    with _CONTEXT_LOCK:
+        _PENDING_ARTIFACTS.append(future)
+        if call_artifacts is not None:
+            call_artifacts.append(future)
+    return future
+
+def wait_for_artifacts() -> list:
+    """
+    Barrier: blocks until queued artifacts are on disk and returns their paths.
+    Inside a tool call (_call_tool) it waits only for that call's artifacts, so
+    concurrent calls never take each other's; elsewhere it waits for every one.
+    Re-raises the first write error.
+    """
+    call_artifacts = _CALL_ARTIFACTS.get()
+    with _CONTEXT_LOCK:
+        if call_artifacts is None:
+            pending = list(_PENDING_ARTIFACTS)
+            _PENDING_ARTIFACTS.clear()
+        else:
+            pending = list(call_artifacts)
+            call_artifacts.clear()
+            _PENDING_ARTIFACTS[:] = [f for f in _PENDING_ARTIFACTS if f not in pending]
+    return [future.result() for future in pending]
+
+atexit.register(wait_for_artifacts)
 
 def log_analysis(hypothesis: str, finding: str, artifacts: list = None, subdir: str = "vizops"):
     """
@@ -184,6 +504,7 @@ def log_analysis(hypothesis: str, finding: str, artifacts: list = None, subdir:
         subdir: Subdirectory to save the log (default: 'vizops').
     """
     context = get_run_context()
+    os.makedirs(os.path.join(context["dir"], subdir), exist_ok=True)
     log_file = os.path.join(context["dir"], subdir, "analysis_log.md")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -196,8 +517,9 @@ def log_analysis(hypothesis: str, finding: str, artifacts: list = None, subdir:
             entry += f"- `{artifact}`\n"
     entry += "---\n"
     
-    with open(log_file, "a") as f:
-        f.write(entry)
+    with _file_lock(os.path.join(context["dir"], subdir, ".analysis_log.lock")):
+        with open(log_file, "a") as f:
+            f.write(entry)
     
     # Output to terminal
     console.print(f"[bold]Analysis Entry:[/bold] {timestamp}")
@@ -209,3 +531,178 @@ def log_analysis(hypothesis: str, finding: str, artifacts: list = None, subdir:
             console.print(f"- {artifact}")
             
     return "Analysis logged successfully."
+
+def _resolve_tool(tool):
+    """Accepts a callable or a 'module.function' string (required for process-pool nodes)."""
+    if callable(tool):
+        return tool
+    module_name, func_name = tool.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), func_name)
+
+def _call_tool(tool, args: list, kwargs: dict, span_name: str = None, parent_span: str = None):
+    """Entry point executed inside pool workers."""
+    token = _CALL_ARTIFACTS.set([])
+    try:
+        with tracing.span(span_name or "tool_call", cat="node", parent_id=parent_span):
+            result = _resolve_tool(tool)(*args, **kwargs)
+            wait_for_artifacts()
+    finally:
+        _CALL_ARTIFACTS.reset(token)
+    if tracing.is_enabled() and multiprocessing.parent_process() is not None:
+        # Pool processes hand their events to the parent through part files in the run dir
+        tracing.flush_events(get_run_context()["dir"])
+    return result
+
+def _node_refs(value) -> set:
+    """Collects node ids referenced as {"$ref": id} anywhere in a node's arguments."""
+    if isinstance(value, dict):
+        if "$ref" in value:
+            return {value["$ref"]}
+        return set().union(*(_node_refs(v) for v in value.values())) if value else set()
+    if isinstance(value, (list, tuple)):
+        return set().union(*(_node_refs(v) for v in value)) if value else set()
+    return set()
+
+def _substitute_refs(value, results: dict):
+    """Replaces {"$ref": id[, "key": k]} with the upstream result (or one key of it)."""
+    if isinstance(value, dict):
+        if "$ref" in value:
+            result = results[value["$ref"]]
+            return result[value["key"]] if "key" in value else result
+        return {k: _substitute_refs(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute_refs(v, results) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_substitute_refs(v, results) for v in value)
+    return value
+
+def run_tool_graph(nodes: list, max_cores: int = None, max_io_workers: int = None,
+                   memory_budget_mb: int = None) -> dict:
+    """
+    Runs a batch of tool invocations as a dependency graph, executing ready nodes concurrently.
+
+    Each node is a dict:
+        {"id": "train_xgb", "tool": "mlops.train_model", "args": [...], "kwargs": {...},
+         "depends_on": ["split"], "kind": "cpu", "cores": 1, "memory_mb": 2000}
+    Arguments may reference upstream results with {"$ref": "split", "key": "train"}; such
+    references are implicit dependencies. "io" nodes (default) run on a thread pool, "cpu"
+    nodes on a process pool (their tool must be a 'module.function' string). A node only
+    starts when its cores and memory_mb fit in the remaining budget; a node larger than the
+    whole budget runs alone. If a node fails, its dependents are skipped.
+
+    Args:
+        nodes: List of node dicts as above.
+        max_cores: Core budget for cpu nodes (default: scheduler.max_cores or all cores).
+        max_io_workers: Thread pool size for io nodes (default: scheduler.max_io_workers or 8).
+        memory_budget_mb: Memory budget across running nodes (default: scheduler.memory_budget_mb, unlimited if unset).
+
+    Returns:
+        dict: results (node id -> result, in dependency order), status and timings per node,
+        the realized critical path, and wall-clock seconds.
+    """
+    scheduler_config = CONFIG.get("scheduler", {})
+    max_cores = max_cores or scheduler_config.get("max_cores") or os.cpu_count()
+    max_io_workers = max_io_workers or scheduler_config.get("max_io_workers", 8)
+    memory_budget_mb = memory_budget_mb or scheduler_config.get("memory_budget_mb")
+
+    by_id = {}
+    deps = {}
+    for node in nodes:
+        if node["id"] in by_id:
+            raise ValueError(f"Duplicate node id: {node['id']}")
+        if node.get("kind", "io") not in ("io", "cpu"):
+            raise ValueError(f"Node '{node['id']}' has unsupported kind: {node.get('kind')}")
+        by_id[node["id"]] = node
+        deps[node["id"]] = set(node.get("depends_on", [])) | _node_refs([node.get("args", []), node.get("kwargs", {})])
+    for node_id, node_deps in deps.items():
+        unknown = node_deps - by_id.keys()
+        if unknown:
+            raise ValueError(f"Node '{node_id}' depends on unknown nodes: {sorted(unknown)}")
+
+    # Topological order (stable with respect to the input order); also detects cycles
+    order, placed = [], set()
+    while len(order) < len(nodes):
+        batch = [n["id"] for n in nodes if n["id"] not in placed and deps[n["id"]] <= placed]
+        if not batch:
+            raise ValueError(f"Dependency cycle among: {sorted(by_id.keys() - placed)}")
+        order.extend(batch)
+        placed.update(batch)
+
+    results, status, timings = {}, {}, {}
+    running = {}
+    used = {"cores": 0, "memory_mb": 0}
+    start = time.perf_counter()
+
+    def fits(node) -> bool:
+        if not running:
+            return True
+        cores = node.get("cores", 1) if node.get("kind", "io") == "cpu" else 0
+        if used["cores"] + cores > max_cores:
+            return False
+        return memory_budget_mb is None or used["memory_mb"] + node.get("memory_mb", 0) <= memory_budget_mb
+
+    def skip_dependents(failed_id):
+        for node_id in order:
+            if node_id not in status and failed_id in deps[node_id]:
+                status[node_id] = "skipped"
+                skip_dependents(node_id)
+
+    with tracing.span("run_tool_graph", cat="scheduler", nodes=len(nodes)) as graph_span, \
+         ThreadPoolExecutor(max_workers=max_io_workers) as io_pool, \
+         process_pool(max_cores) as cpu_pool:
+        while len(status) < len(nodes):
+            for node_id in order:
+                if node_id in status or node_id in running.values():
+                    continue
+                node = by_id[node_id]
+                if not deps[node_id] <= results.keys() or not fits(node):
+                    continue
+                args = _substitute_refs(node.get("args", []), results)
+                kwargs = _substitute_refs(node.get("kwargs", {}), results)
+                cpu = node.get("kind", "io") == "cpu"
+                if cpu:
+                    future = cpu_pool.submit(_call_tool, node["tool"], args, kwargs, node_id, graph_span.key)
+                else:
+                    future = io_pool.submit(contextvars.copy_context().run, _call_tool, node["tool"], args, kwargs, node_id)
+                running[future] = node_id
+                used["cores"] += node.get("cores", 1) if cpu else 0
+                used["memory_mb"] += node.get("memory_mb", 0)
+                timings[node_id] = {"start": time.perf_counter() - start}
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node_id = running.pop(future)
+                node = by_id[node_id]
+                used["cores"] -= node.get("cores", 1) if node.get("kind", "io") == "cpu" else 0
+                used["memory_mb"] -= node.get("memory_mb", 0)
+                timings[node_id]["end"] = time.perf_counter() - start
+                try:
+                    results[node_id] = future.result()
+                    status[node_id] = "done"
+                except Exception as e:
+                    status[node_id] = f"failed: {e}"
+                    console.print(f"[red]Tool node '{node_id}' failed:[/red] {e}")
+                    skip_dependents(node_id)
+
+    # Realized critical path: from the last node to finish, follow the latest-finishing dependency
+    critical_path = []
+    finished = [n for n in order if "end" in timings.get(n, {})]
+    current = max(finished, key=lambda n: timings[n]["end"]) if finished else None
+    while current is not None:
+        critical_path.insert(0, current)
+        upstream = [d for d in deps[current] if "end" in timings.get(d, {})]
+        current = max(upstream, key=lambda d: timings[d]["end"]) if upstream else None
+
+    for node_id, t in timings.items():
+        t["seconds"] = t.get("end", t["start"]) - t["start"]
+
+    return {
+        "results": {node_id: results[node_id] for node_id in order if node_id in results},
+        "status": {node_id: status.get(node_id, "skipped") for node_id in order},
+        "timings": timings,
+        "critical_path": critical_path,
+        "critical_path_seconds": sum(timings[n]["seconds"] for n in critical_path),
+        "wall_seconds": time.perf_counter() - start,
+    }
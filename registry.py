@@ -0,0 +1,181 @@
+"""Model artifact registry with native booster formats and an in-process LRU cache.
+
+Models are keyed by the content hash embedded in their artifact filename
+(`NNN_YYYYMMDD_HHMMSSNN_<hash>_<prefix>.joblib`). Registering a model writes, under
+`<registry.dir>/<hash>/`:
+- `model.ubj` (XGBoost) or `model.txt` (LightGBM): the booster's native binary/text format.
+- `metadata.json`: feature names, dtypes, category maps and the training artifact hash.
+
+`load_model` serves repeated loads of the same model from memory; cold loads prefer
+the native format and fall back to a memory-mapped `joblib.load`.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import pandas as pd
+import blobstore
+from orchestrator import CONFIG, artifact_hash, parse_artifact_hash, console
+from tracing import traced, current_span
+
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_CACHE_STATS = {"hits": 0, "misses": 0}
+
+def _is_hash(model_ref: str) -> bool:
+    return len(model_ref) == 8 and all(c in "0123456789abcdef" for c in model_ref)
+
+def _registry_dir() -> str:
+    root_dir = CONFIG.get("output", {}).get("root_dir", "output")
+    return CONFIG.get("registry", {}).get("dir") or os.path.join(root_dir, "registry")
+
+def _cache_size() -> int:
+    return int(CONFIG.get("registry", {}).get("cache_size", 8))
+
+def _cache_key(model_ref: str) -> str:
+    """
+    Resolves a model path (or bare content hash) to a cache key without reading the file:
+    the hash from a standardized filename, otherwise the path's identity and mtime.
+    """
+    if _is_hash(model_ref):
+        return model_ref
+    content_hash = parse_artifact_hash(model_ref)
+    if content_hash:
+        return content_hash
+    stat = os.stat(model_ref)
+    return f"{os.path.realpath(model_ref)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+def _entry_dir(model_hash: str) -> str:
+    return os.path.join(_registry_dir(), model_hash)
+
+def build_metadata(model, X: pd.DataFrame, train_path: str, algorithm: str, params: dict, target: str) -> dict:
+    """Describes the features and training data a model was fitted on."""
+    category_maps = {
+        col: [str(c) for c in X[col].cat.categories]
+        for col in X.columns if isinstance(X[col].dtype, pd.CategoricalDtype)
+    }
+    return {
+        "algorithm": algorithm,
+        "params": params,
+        "target": target,
+        "feature_names": list(X.columns),
+        "dtypes": {col: str(dtype) for col, dtype in X.dtypes.items()},
+        "category_maps": category_maps,
+        "training_artifact": train_path,
+        "training_artifact_hash": artifact_hash(train_path),
+    }
+
+def register_model(model, model_path: str, metadata: dict = None) -> dict:
+    """
+    Stores a saved model's native booster format and metadata under its content hash,
+    and seeds the in-process cache so the next load is free.
+
+    Args:
+        model: The fitted model object that was saved to model_path.
+        model_path: The artifact path returned by orchestrator.save_model.
+        metadata: Extra metadata (see build_metadata).
+
+    Returns:
+        dict: The registry entry metadata.
+    """
+    model_hash = artifact_hash(model_path)
+    entry_dir = _entry_dir(model_hash)
+    os.makedirs(entry_dir, exist_ok=True)
+
+    native_format = None
+    if hasattr(model, "get_booster"):
+        native_format = "model.ubj"
+        model.save_model(os.path.join(entry_dir, native_format))
+    elif hasattr(model, "booster_"):
+        native_format = "model.txt"
+        model.booster_.save_model(os.path.join(entry_dir, native_format))
+
+    entry = dict(metadata or {})
+    entry.update({
+        "model_hash": model_hash,
+        "model_artifact": model_path,
+        "native_format": native_format,
+        "registered_at": datetime.now().isoformat(timespec="seconds"),
+    })
+    with open(os.path.join(entry_dir, "metadata.json"), "w") as f:
+        json.dump(entry, f, indent=2, default=str)
+
+    _cache_put(model_hash, model)
+    console.print(f"[dim]Registered Model:[/dim] {entry_dir}")
+    return entry
+
+def get_model_metadata(model_ref: str) -> dict:
+    """Returns the registry metadata for a model path or content hash (empty if unregistered)."""
+    model_hash = model_ref if _is_hash(model_ref) else artifact_hash(model_ref)
+    meta_path = os.path.join(_entry_dir(model_hash), "metadata.json")
+    if not os.path.exists(meta_path):
+        return {}
+    with open(meta_path) as f:
+        return json.load(f)
+
+def _cache_put(key: str, model):
+    with _CACHE_LOCK:
+        _CACHE[key] = model
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _cache_size():
+            _CACHE.popitem(last=False)
+
+def _load_from_disk(model_ref: str, key: str):
+    """Cold load: native XGBoost format if registered, otherwise a memory-mapped joblib load."""
+    entry_dir = _entry_dir(key)
+    native_path = os.path.join(entry_dir, "model.ubj")
+    if os.path.exists(native_path):
+        import xgboost as xgb
+        model = xgb.XGBClassifier()
+        model.load_model(native_path)
+        return model
+
+    if _is_hash(model_ref):
+        meta = get_model_metadata(model_ref)
+        if not meta:
+            raise FileNotFoundError(f"Model '{model_ref}' is not in the registry.")
+        model_ref = meta["model_artifact"]
+    if not os.path.exists(model_ref):
+        # The run directory was deleted; the blob store may still hold the content
+        blobstore.restore(model_ref)
+    import joblib
+    # Array-backed estimators map their arrays instead of copying them
+    return joblib.load(model_ref, mmap_mode="r")
+
+@traced(cat="cache")
+def load_model(model_ref: str):
+    """
+    Loads a model by artifact path or content hash, serving repeats from the in-process LRU cache.
+
+    Args:
+        model_ref: Path to a model artifact, or its 8-character content hash.
+
+    Returns:
+        The fitted model object.
+    """
+    key = _cache_key(model_ref)
+    with _CACHE_LOCK:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            _CACHE_STATS["hits"] += 1
+            current_span().add("cache_hits", 1)
+            return _CACHE[key]
+        _CACHE_STATS["misses"] += 1
+    current_span().add("cache_misses", 1)
+
+    model = _load_from_disk(model_ref, key)
+    _cache_put(key, model)
+    return model
+
+def cache_info() -> dict:
+    """Cache hit/miss counters and current size."""
+    with _CACHE_LOCK:
+        return {**_CACHE_STATS, "size": len(_CACHE), "max_size": _cache_size()}
+
+def clear_cache():
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _CACHE_STATS.update(hits=0, misses=0)
@@ -0,0 +1,317 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from orchestrator import save_metrics
+from tracing import traced
+
+# Metrics computed for every bootstrap replicate
+METRICS = ["auc", "f1", "precision", "recall"]
+
+def _load_scores(scores_path: str) -> tuple:
+    """Loads a scored test set written by run_backtest."""
+    df = pd.read_csv(scores_path)
+    missing = {"y_true", "y_prob"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Scored test set '{scores_path}' is missing columns: {sorted(missing)}")
+    return df, df["y_true"].to_numpy(dtype=bool), df["y_prob"].to_numpy(dtype=np.float64)
+
+def _prepare_auc(y_true: np.ndarray, y_prob: np.ndarray) -> dict:
+    """
+    Sorts scores once and precomputes the tie-group boundaries of every positive.
+    Each bootstrap replicate then only needs a cumulative sum over its weights.
+    """
+    order = np.argsort(y_prob, kind="mergesort")
+    s = y_prob[order]
+    y = y_true[order]
+
+    # Tie groups: [start, end) index ranges of equal scores in sorted order
+    boundaries = np.flatnonzero(np.diff(s)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(s)]))
+    group = np.repeat(np.arange(len(starts)), ends - starts)
+
+    pos = np.flatnonzero(y)
+    return {
+        # Already-sorted inputs skip the per-replicate gather
+        "order": None if np.all(np.diff(y_prob) >= 0) else order,
+        "neg": ~y,
+        "pos": pos,
+        "pos_start": starts[group[pos]],
+        "pos_end": ends[group[pos]],
+    }
+
+def _compress(y_true: np.ndarray, y_prob: np.ndarray, threshold: float) -> tuple:
+    """
+    Collapses a single model's test set into weighted cells for the bootstrap.
+
+    Every metric only depends on per-sample weights through sums over runs of
+    samples that share a label, a side of the threshold and (for AUC) a position
+    between positives. A sum of independent Poisson(1) weights is Poisson(size),
+    so drawing one weight per cell is exact and needs far fewer draws than one
+    per sample. Cells are emitted in ascending score order.
+
+    Returns:
+        tuple: (cell sizes, cell labels, cell predictions, AUC preparation).
+    """
+    order = np.argsort(y_prob, kind="mergesort")
+    s = y_prob[order]
+    y = y_true[order]
+
+    # Per tie group: positive/negative counts and threshold side
+    boundaries = np.flatnonzero(np.diff(s)) + 1
+    starts = np.concatenate(([0], boundaries))
+    n_pos = np.add.reduceat(y.astype(np.int64), starts)
+    n_neg = np.diff(np.concatenate((starts, [len(s)]))) - n_pos
+    side = s[starts] >= threshold
+
+    # Merge consecutive pure-negative (or pure-positive) groups on the same side;
+    # mixed groups keep their own run so ties receive half credit
+    mixed = (n_pos > 0) & (n_neg > 0)
+    kind = np.where(mixed, 2, (n_pos > 0).astype(np.int64))
+    new_run = np.ones(len(starts), dtype=bool)
+    new_run[1:] = mixed[1:] | (kind[1:] != kind[:-1]) | (side[1:] != side[:-1])
+    run = np.cumsum(new_run) - 1
+    run_pos = np.bincount(run, weights=n_pos).astype(np.int64)
+    run_neg = np.bincount(run, weights=n_neg).astype(np.int64)
+    run_side = side[new_run]
+
+    # Each run emits a negative cell (if any) followed by a positive cell (if any)
+    has_neg = run_neg > 0
+    has_pos = run_pos > 0
+    cells_per_run = has_neg.astype(np.int64) + has_pos
+    run_first = np.cumsum(cells_per_run) - cells_per_run
+    n_cells = int(cells_per_run.sum())
+
+    sizes = np.empty(n_cells, dtype=np.int64)
+    labels = np.zeros(n_cells, dtype=bool)
+    preds = np.repeat(run_side, cells_per_run)
+    sizes[run_first[has_neg]] = run_neg[has_neg]
+    pos_cells = run_first[has_pos] + has_neg[has_pos]
+    sizes[pos_cells] = run_pos[has_pos]
+    labels[pos_cells] = True
+
+    prep = {
+        "order": None,
+        "neg": ~labels,
+        "pos": pos_cells,
+        "pos_start": run_first[has_pos],
+        "pos_end": pos_cells,
+    }
+    return sizes, labels, preds, prep
+
+def _weighted_auc(W: np.ndarray, prep: dict) -> np.ndarray:
+    """
+    AUC for every row of the weight matrix W (replicates x cells).
+    A positive is credited with the weighted negatives scored strictly below it,
+    plus half of the tied negatives (Mann-Whitney).
+    """
+    Ws = W if prep["order"] is None else W[:, prep["order"]]
+    cum_neg = np.zeros((W.shape[0], W.shape[1] + 1))
+    np.cumsum(Ws * prep["neg"], axis=1, out=cum_neg[:, 1:])
+
+    below = 0.5 * (cum_neg[:, prep["pos_start"]] + cum_neg[:, prep["pos_end"]])
+    pos_w = Ws[:, prep["pos"]]
+    numerator = np.einsum("ij,ij->i", pos_w, below)
+    denominator = pos_w.sum(axis=1) * cum_neg[:, -1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+def _weighted_threshold_metrics(W: np.ndarray, y_true: np.ndarray, y_pred: np.ndarray) -> dict:
+    """F1, precision and recall for every row of W via three matrix-vector products."""
+    tp = W @ (y_pred & y_true).astype(np.float64)
+    fp = W @ (y_pred & ~y_true).astype(np.float64)
+    fn = W @ (~y_pred & y_true).astype(np.float64)
+
+    # Match sklearn's zero_division=0 behaviour
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+    return {"f1": f1, "precision": precision, "recall": recall}
+
+def _score_replicates(W: np.ndarray, y_true: np.ndarray, preps: list, preds: list) -> list:
+    """Computes all metrics for each model against the same weight matrix."""
+    results = []
+    for prep, y_pred in zip(preps, preds):
+        metrics = {"auc": _weighted_auc(W, prep)}
+        metrics.update(_weighted_threshold_metrics(W, y_true, y_pred))
+        results.append(metrics)
+    return results
+
+def _draw_weights(rng: np.random.Generator, n_rows: int, sizes: np.ndarray, method: str) -> np.ndarray:
+    """
+    Draws bootstrap weights per cell: Poisson(size), or exact multinomial
+    resampling of the underlying samples (one bincount per replicate).
+    """
+    if method == "poisson":
+        return rng.poisson(sizes, size=(n_rows, len(sizes))).astype(np.float64)
+    if method == "multinomial":
+        n = int(sizes.sum())
+        cell_of = None if n == len(sizes) else np.repeat(np.arange(len(sizes)), sizes)
+        W = np.empty((n_rows, len(sizes)))
+        for i in range(n_rows):
+            idx = rng.integers(0, n, n)
+            W[i] = np.bincount(idx if cell_of is None else cell_of[idx], minlength=len(sizes))
+        return W
+    raise ValueError(f"Unsupported bootstrap method: {method}")
+
+def _bootstrap(y_true: np.ndarray, probs: list, n_resamples: int, threshold: float,
+               method: str, seed: int, n_jobs: int, max_chunk_mb: int) -> tuple:
+    """
+    Runs the vectorized bootstrap for one or more models scored on the same rows.
+    A single model is first compressed into cells (see _compress); paired models
+    share one weight per sample so the pairing is preserved. Replicates are
+    processed in chunks sized to stay under max_chunk_mb and spread across a
+    thread pool (numpy releases the GIL for the heavy kernels). Each chunk has
+    its own spawned seed, so results do not depend on n_jobs.
+
+    Returns:
+        tuple: (observed metrics per model, replicate metrics per model).
+    """
+    if len(probs) == 1:
+        sizes, labels, pred, prep = _compress(y_true, probs[0], threshold)
+        preps, preds = [prep], [pred]
+    else:
+        # Weights are i.i.d. per sample, so work in the first model's score order
+        order = np.argsort(probs[0], kind="mergesort")
+        y_true, probs = y_true[order], [p[order] for p in probs]
+        sizes, labels = np.ones(len(y_true), dtype=np.int64), y_true
+        preps = [_prepare_auc(y_true, p) for p in probs]
+        preds = [p >= threshold for p in probs]
+    n_cells = len(sizes)
+
+    # ~4 float64 matrices of (chunk x cells) are alive per chunk
+    bytes_per_row = 4 * 8 * (n_cells + 1)
+    chunk = int(max(1, min(n_resamples, (max_chunk_mb * 1024 ** 2) // bytes_per_row)))
+    chunk_sizes = [min(chunk, n_resamples - i) for i in range(0, n_resamples, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+
+    def run_chunk(args):
+        size, child_seed = args
+        W = _draw_weights(np.random.default_rng(child_seed), size, sizes, method)
+        return _score_replicates(W, labels, preps, preds)
+
+    workers = os.cpu_count() if n_jobs in (None, -1) else max(1, n_jobs)
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunk_sizes))) as pool:
+        chunks = list(pool.map(run_chunk, zip(chunk_sizes, seeds)))
+
+    replicates = [
+        {m: np.concatenate([c[i][m] for c in chunks]) for m in METRICS}
+        for i in range(len(probs))
+    ]
+    observed = [
+        {m: float(v[0]) for m, v in r.items()}
+        for r in _score_replicates(sizes[np.newaxis, :].astype(np.float64), labels, preps, preds)
+    ]
+    return observed, replicates
+
+def _interval(values: np.ndarray, alpha: float) -> list:
+    """Percentile confidence interval, ignoring degenerate (NaN) replicates."""
+    lo, hi = np.nanpercentile(values, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+    return [float(lo), float(hi)]
+
+@traced
+def bootstrap_metrics(scores_path: str, n_resamples: int = 1000, alpha: float = 0.05,
+                      threshold: float = 0.5, method: str = "poisson", seed: int = 42,
+                      n_jobs: int = -1, max_chunk_mb: int = 256) -> dict:
+    """
+    Computes bootstrap confidence intervals for AUC, F1, precision and recall.
+
+    Args:
+        scores_path: Path to the scored test set CSV returned by run_backtest ('scores_file').
+        n_resamples: Number of bootstrap replicates.
+        alpha: Significance level; intervals cover 1 - alpha.
+        threshold: Probability threshold for F1/precision/recall.
+        method: 'poisson' (Poisson(1) weights) or 'multinomial' (exact resampling).
+        seed: Random seed.
+        n_jobs: Number of worker threads (-1 uses all cores).
+        max_chunk_mb: Memory bound for a single chunk of replicates.
+
+    Returns:
+        dict: Point estimates, confidence intervals, and the path to the saved JSON.
+    """
+    _, y_true, y_prob = _load_scores(scores_path)
+    observed, replicates = _bootstrap(y_true, [y_prob], n_resamples, threshold,
+                                      method, seed, n_jobs, max_chunk_mb)
+
+    result = {
+        "scores_file": scores_path,
+        "n_samples": int(len(y_true)),
+        "n_resamples": n_resamples,
+        "method": method,
+        "confidence": 1 - alpha,
+        "metrics": {
+            m: {
+                "estimate": observed[0][m],
+                "ci": _interval(replicates[0][m], alpha),
+                "std_error": float(np.nanstd(replicates[0][m], ddof=1)),
+            }
+            for m in METRICS
+        },
+    }
+    result["results_file"] = save_metrics(result, "bootstrap_ci", subdir="reviewer")
+    return result
+
+@traced
+def compare_models(scores_path_a: str, scores_path_b: str, n_resamples: int = 1000,
+                   alpha: float = 0.05, threshold: float = 0.5, method: str = "poisson",
+                   seed: int = 42, n_jobs: int = -1, max_chunk_mb: int = 256) -> dict:
+    """
+    Paired bootstrap comparison of two models scored on the same test set.
+    Both models are evaluated against the same resampling weights, so the
+    difference (B - A) keeps the pairing between predictions.
+
+    Args:
+        scores_path_a: Scored test set CSV for the baseline model (A).
+        scores_path_b: Scored test set CSV for the challenger model (B).
+        n_resamples: Number of bootstrap replicates.
+        alpha: Significance level; intervals cover 1 - alpha.
+        threshold: Probability threshold for F1/precision/recall.
+        method: 'poisson' or 'multinomial'.
+        seed: Random seed.
+        n_jobs: Number of worker threads (-1 uses all cores).
+        max_chunk_mb: Memory bound for a single chunk of replicates.
+
+    Returns:
+        dict: Per-metric estimates for A and B, the difference with its CI and
+        two-sided p-value, and the path to the saved JSON.
+    """
+    df_a, y_a, prob_a = _load_scores(scores_path_a)
+    df_b, y_b, prob_b = _load_scores(scores_path_b)
+
+    if len(df_a) != len(df_b) or not np.array_equal(y_a, y_b):
+        raise ValueError("Scored test sets must contain the same rows in the same order.")
+    id_cols = [c for c in df_a.columns if c in df_b.columns and c not in ("y_true", "y_prob")]
+    if id_cols and not df_a[id_cols].equals(df_b[id_cols]):
+        raise ValueError(f"Scored test sets differ on id columns: {id_cols}")
+
+    observed, replicates = _bootstrap(y_a, [prob_a, prob_b], n_resamples, threshold,
+                                      method, seed, n_jobs, max_chunk_mb)
+
+    comparison = {}
+    for m in METRICS:
+        delta = replicates[1][m] - replicates[0][m]
+        delta = delta[~np.isnan(delta)]
+        # Two-sided p-value: how often the resampled difference crosses zero
+        p_value = min(1.0, 2 * min(np.mean(delta <= 0), np.mean(delta >= 0))) if len(delta) else float("nan")
+        comparison[m] = {
+            "model_a": observed[0][m],
+            "model_b": observed[1][m],
+            "difference": observed[1][m] - observed[0][m],
+            "ci": _interval(delta, alpha) if len(delta) else [float("nan")] * 2,
+            "p_value": float(p_value),
+        }
+
+    result = {
+        "scores_file_a": scores_path_a,
+        "scores_file_b": scores_path_b,
+        "n_samples": int(len(y_a)),
+        "n_resamples": n_resamples,
+        "method": method,
+        "confidence": 1 - alpha,
+        "metrics": comparison,
+    }
+    result["results_file"] = save_metrics(result, "paired_comparison", subdir="reviewer")
+    return result
@@ -0,0 +1,170 @@
+"""Warehouse-side sampling for approximate exploratory queries.
+
+`rewrite` points every reference to one base table (default `fct_claim`) in a query at a
+sample of it, so the warehouse scans and joins only the sampled rows:
+- "member": a hash sample on `member_id`. A member is in or out with all of their claims,
+  so histories (readmissions, prior stays) stay intact. Runs on Postgres (`hashtext`) and
+  on the SQLite stand-in (a registered `sample_bucket` function).
+- "bernoulli" / "system": Postgres `TABLESAMPLE ... REPEATABLE (seed)` on rows or pages.
+
+For a fixed seed every method is nested: the sample at a larger fraction contains the
+sample at a smaller one, so refining only ever adds rows.
+
+`estimate` turns a sample into aggregate estimates (count, sum, mean) with confidence
+intervals. Variances treat the sample as Poisson sampling of clusters: members for
+"member", rows otherwise. "system" samples whole pages, so its row-level intervals are
+optimistic.
+"""
+
+import re
+import zlib
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+METHODS = ["member", "bernoulli", "system"]
+# Hash buckets for member sampling: fractions resolve to multiples of 1e-6
+BUCKETS = 1_000_000
+
+_CLAUSE_KEYWORDS = ("WHERE", "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "CROSS", "NATURAL", "ON", "USING",
+                    "GROUP", "ORDER", "HAVING", "LIMIT", "OFFSET", "FETCH", "UNION", "INTERSECT", "EXCEPT",
+                    "WINDOW", "FOR", "TABLESAMPLE")
+
+def _table_pattern(table: str) -> re.Pattern:
+    keywords = "|".join(_CLAUSE_KEYWORDS)
+    return re.compile(
+        rf'\b(FROM|JOIN)\s+((?:"?\w+"?\.)?"?{re.escape(table)}"?)(?![\w."])'
+        rf'(?:\s+(?:AS\s+)?(?!(?:{keywords})\b)(\w+))?',
+        re.IGNORECASE
+    )
+
+def sample_bucket(value, seed) -> int:
+    """SQLite counterpart of the Postgres member bucket expression."""
+    return zlib.crc32(f"{value}:{seed}".encode()) % BUCKETS
+
+def register_sqlite_functions(dbapi_connection, connection_record=None):
+    """SQLAlchemy "connect" listener that makes `sample_bucket` available to SQLite queries."""
+    dbapi_connection.create_function("sample_bucket", 2, sample_bucket, deterministic=True)
+
+def bucket_threshold(fraction: float) -> int:
+    return max(1, min(BUCKETS, int(round(fraction * BUCKETS))))
+
+def rewrite(query: str, fraction: float, method: str = "member", seed: int = 42, table: str = "fct_claim",
+            key: str = "member_id", dialect: str = "postgresql") -> tuple:
+    """
+    Rewrites a query so every reference to `table` reads a sample of it.
+
+    Args:
+        query: SELECT statement referencing the table in FROM or JOIN.
+        fraction: Sampling fraction in (0, 1].
+        method: "member", "bernoulli" or "system".
+        seed: Sample seed (the same seed gives nested samples across fractions).
+        table: Base table to sample.
+        key: Column hashed by the "member" method.
+        dialect: "postgresql" or "sqlite" (member method only).
+
+    Returns:
+        tuple: (rewritten query, effective fraction).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown sampling method '{method}'. Use one of {METHODS}.")
+    if not 0 < fraction <= 1:
+        raise ValueError("fraction must be in (0, 1].")
+    if fraction == 1:
+        return query, 1.0
+    pattern = _table_pattern(table)
+    if not pattern.search(query):
+        raise ValueError(f"Query does not read from '{table}'; nothing to sample.")
+
+    if method == "member":
+        threshold = bucket_threshold(fraction)
+        if dialect == "postgresql":
+            bucket = f"mod(abs(hashtext({key}::text || ':{int(seed)}')::bigint), {BUCKETS})"
+        else:
+            bucket = f"sample_bucket({key}, {int(seed)})"
+
+        qualified = set()
+
+        def replace(match):
+            keyword, ref, alias = match.groups()
+            if not alias:
+                alias = ref.split(".")[-1].strip('"')
+                if "." in ref:
+                    qualified.add(ref)
+            return f"{keyword} (SELECT * FROM {ref} WHERE {bucket} < {threshold}) {alias}"
+        rewritten = pattern.sub(replace, query)
+        # The subquery is named after the bare table, so `dw.fct_claim.col` becomes `fct_claim.col`
+        for ref in qualified:
+            schema, name = (part.strip('"') for part in ref.split("."))
+            rewritten = re.sub(rf'(?<![\w."])"?{re.escape(schema)}"?\.("?{re.escape(name)}"?\.)', r"\1",
+                               rewritten, flags=re.IGNORECASE)
+        return rewritten, threshold / BUCKETS
+
+    if dialect != "postgresql":
+        raise ValueError(f"TABLESAMPLE {method.upper()} needs Postgres; use method='member' on {dialect}.")
+    percent = round(fraction * 100, 6)
+
+    def replace(match):
+        keyword, ref, alias = match.groups()
+        return f"{keyword} {ref}{f' {alias}' if alias else ''} TABLESAMPLE {method.upper()} ({percent}) REPEATABLE ({int(seed)})"
+    return pattern.sub(replace, query), percent / 100
+
+def _interval(estimate: float, variance: float, z: float) -> dict:
+    half_width = z * float(np.sqrt(max(variance, 0.0)))
+    return {
+        "estimate": float(estimate),
+        "ci_low": float(estimate - half_width),
+        "ci_high": float(estimate + half_width),
+        "relative_ci": float(half_width / abs(estimate)) if estimate else (0.0 if half_width == 0 else float("inf")),
+    }
+
+def _estimate_cell(df: pd.DataFrame, column: str, agg: str, clusters: pd.Series, fraction: float, z: float) -> dict:
+    values = df[column] if column != "*" else pd.Series(1.0, index=df.index)
+    present = values.notna().astype(float)
+    totals = pd.DataFrame({"y": values.fillna(0).astype(float), "n": present}).groupby(clusters.values).sum()
+    weight, finite = 1.0 / fraction, 1.0 - fraction
+    # Horvitz-Thompson totals under Poisson sampling of clusters: Var = (1 - f) / f^2 * sum(t_c^2)
+    if agg == "count":
+        return _interval(weight * totals["n"].sum(), finite * weight**2 * (totals["n"] ** 2).sum(), z)
+    if agg == "sum":
+        return _interval(weight * totals["y"].sum(), finite * weight**2 * (totals["y"] ** 2).sum(), z)
+    if agg == "mean":
+        n_hat = weight * totals["n"].sum()
+        if n_hat == 0:
+            return _interval(float("nan"), 0.0, z)
+        ratio = totals["y"].sum() / totals["n"].sum()
+        residuals = totals["y"] - ratio * totals["n"]
+        return _interval(ratio, finite * weight**2 * (residuals**2).sum() / n_hat**2, z)
+    raise ValueError(f"Unsupported aggregate '{agg}'. Use count, sum or mean.")
+
+def estimate(df: pd.DataFrame, fraction: float, aggregates: dict, group_by: list = None,
+             cluster_col: str = None, confidence: float = 0.95) -> list:
+    """
+    Estimates population aggregates from a sample, with normal-approximation intervals.
+
+    Args:
+        df: Sampled rows.
+        fraction: Effective sampling fraction.
+        aggregates: Column -> aggregate or list of aggregates ("count", "sum", "mean");
+            use "*" for the row count.
+        group_by: Columns to estimate within (domains).
+        cluster_col: Sampling unit column (e.g. member_id); rows are the units when None.
+        confidence: Interval confidence level.
+
+    Returns:
+        list: One dict per group, column and aggregate with estimate, ci_low, ci_high and
+        relative_ci (half-width / |estimate|).
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    clusters = df[cluster_col] if cluster_col and cluster_col in df.columns else pd.Series(np.arange(len(df)), index=df.index)
+    groups = df.groupby(group_by, dropna=False, sort=True) if group_by else [((), df)]
+
+    rows = []
+    for group_key, part in groups:
+        group_key = group_key if isinstance(group_key, tuple) else (group_key,)
+        for column, aggs in aggregates.items():
+            for agg in [aggs] if isinstance(aggs, str) else aggs:
+                cell = _estimate_cell(part, column, agg, clusters.loc[part.index], fraction, z)
+                rows.append({**dict(zip(group_by or [], group_key)), "column": column, "agg": agg, **cell})
+    return rows
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Long-lived local scoring service with micro-batching.
+
+Loads a `train_model` artifact once and serves single-member risk scores over HTTP.
+Concurrent requests are coalesced into micro-batches (up to `max_batch_size` rows,
+waiting at most `max_wait_ms` after the first request) so the booster scores many
+members per call while each request stays under the latency deadline.
+
+Endpoints:
+- POST /score   {"feature_a": 1.0, ...}  -> {"score": 0.12, "model_hash": "...", "latency_ms": 1.4}
+- POST /model   {"model_path": "..."}    -> hot-swaps the model if its content hash changed
+- GET  /metrics                          -> p50/p99 latency, throughput, batch sizes
+- GET  /health
+
+Usage:
+    python scoring_service.py --model output/<run>/mlops/<model>.joblib --port 8765
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+from orchestrator import artifact_hash, console
+from mlops import _model_features, _predict_positive, _private_booster
+from registry import load_model
+
+class ScoringService:
+    """Holds the active model and a batcher thread that scores queued requests."""
+
+    def __init__(self, model_path: str, max_batch_size: int = 256, max_wait_ms: float = 5.0,
+                 n_threads: int = -1, metrics_window: int = 10_000):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.n_threads = os.cpu_count() if n_threads in (None, -1) else n_threads
+
+        self._queue = queue.Queue()
+        self._model_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._latencies = deque(maxlen=metrics_window)
+        self._completed = deque(maxlen=metrics_window)
+        self._batch_sizes = deque(maxlen=metrics_window)
+        self._running = False
+        self._thread = None
+
+        self.model = None
+        self.booster = None
+        self.features = None
+        self.model_hash = None
+        self.model_path = None
+        self.load_model(model_path)
+
+    def load_model(self, model_path: str) -> dict:
+        """Loads a model artifact and swaps it in atomically, unless its content hash is already active."""
+        content_hash = artifact_hash(model_path)
+        if content_hash == self.model_hash:
+            return {"model_hash": content_hash, "swapped": False}
+
+        model = load_model(model_path)
+        features = _model_features(model)
+        booster = _private_booster(model, self.n_threads)
+        with self._model_lock:
+            self.model, self.booster, self.features = model, booster, features
+            self.model_hash, self.model_path = content_hash, model_path
+        console.print(f"[dim]Scoring model loaded:[/dim] {model_path} ({content_hash})")
+        return {"model_hash": content_hash, "swapped": True}
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._batch_loop, name="scoring-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+
+    def submit(self, features: dict) -> Future:
+        """Queues one member's features; the returned future resolves to (score, model_hash)."""
+        future = Future()
+        self._queue.put((time.perf_counter(), features, future))
+        return future
+
+    def score(self, features: dict, timeout: float = 30.0) -> dict:
+        """Scores one member, blocking until its micro-batch completes."""
+        start = time.perf_counter()
+        score, model_hash = self.submit(features).result(timeout=timeout)
+        latency = time.perf_counter() - start
+        with self._metrics_lock:
+            self._latencies.append(latency)
+            self._completed.append(time.perf_counter())
+        return {"score": score, "model_hash": model_hash, "latency_ms": latency * 1000}
+
+    def _batch_loop(self):
+        while self._running:
+            try:
+                enqueued, features, future = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            batch = [(features, future)]
+            deadline = enqueued + self.max_wait
+            while len(batch) < self.max_batch_size:
+                # Always drain what is already queued; only wait while within the deadline
+                try:
+                    _, features, future = self._queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    try:
+                        _, features, future = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                batch.append((features, future))
+
+            self._score_batch(batch)
+
+    def _score_batch(self, batch: list):
+        with self._model_lock:
+            model, booster, feature_names, model_hash = self.model, self.booster, self.features, self.model_hash
+
+        try:
+            rows = [[payload.get(f, np.nan) for f in feature_names] for payload, _ in batch]
+            X = pd.DataFrame(rows, columns=feature_names).apply(pd.to_numeric, errors="coerce")
+            scores = _predict_positive(model, X, self.n_threads, booster)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), score in zip(batch, scores):
+            future.set_result((float(score), model_hash))
+        with self._metrics_lock:
+            self._batch_sizes.append(len(batch))
+
+    def metrics(self) -> dict:
+        """Latency percentiles, throughput and batch sizes over the recent window."""
+        with self._metrics_lock:
+            latencies = np.array(self._latencies)
+            completed = list(self._completed)
+            batch_sizes = np.array(self._batch_sizes)
+
+        throughput = 0.0
+        if len(completed) > 1 and completed[-1] > completed[0]:
+            throughput = (len(completed) - 1) / (completed[-1] - completed[0])
+        return {
+            "model_hash": self.model_hash,
+            "model_path": self.model_path,
+            "requests": int(len(latencies)),
+            "p50_ms": float(np.percentile(latencies, 50) * 1000) if len(latencies) else None,
+            "p99_ms": float(np.percentile(latencies, 99) * 1000) if len(latencies) else None,
+            "throughput_rps": throughput,
+            "batches": int(len(batch_sizes)),
+            "mean_batch_size": float(batch_sizes.mean()) if len(batch_sizes) else None,
+            "queue_depth": self._queue.qsize(),
+        }
+
+class _ScoringHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json({"status": "ok", "model_hash": self.service.model_hash})
+        elif self.path == "/metrics":
+            self._send_json(self.service.metrics())
+        else:
+            self._send_json({"error": f"Unknown path: {self.path}"}, status=404)
+
+    def do_POST(self):
+        try:
+            payload = self._read_json()
+            if self.path == "/score":
+                if not isinstance(payload, dict):
+                    raise ValueError("Expected a JSON object of feature values.")
+                self._send_json(self.service.score(payload))
+            elif self.path == "/model":
+                self._send_json(self.service.load_model(payload["model_path"]))
+            else:
+                self._send_json({"error": f"Unknown path: {self.path}"}, status=404)
+        except Exception as e:
+            self._send_json({"error": str(e)}, status=400)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate latency; metrics cover it instead
+        pass
+
+def create_server(service: ScoringService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Builds an HTTP server bound to the given service (port 0 picks a free port)."""
+    handler = type("ScoringHandler", (_ScoringHandler,), {"service": service})
+    # The default listen backlog of 5 drops connections under concurrent load
+    server_class = type("ScoringServer", (ThreadingHTTPServer,), {"request_queue_size": 1024})
+    server = server_class((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local micro-batching scoring service.")
+    parser.add_argument("--model", required=True, help="Path to a train_model artifact.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=-1)
+    args = parser.parse_args()
+
+    service = ScoringService(args.model, args.max_batch_size, args.max_wait_ms, args.threads)
+    service.start()
+    server = create_server(service, args.host, args.port)
+    console.print(f"[bold]Scoring service listening on http://{args.host}:{server.server_address[1]}[/bold]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""Seeded synthetic star-schema claims generator for benchmarks.
+
+Produces frames with the columns of `fct_claim`, `dim_member`, `dim_plan`,
+`dim_provider`, `dim_date` and `star_claims`. Codes follow skewed (Zipf-like)
+frequencies with realistic cardinalities, and inpatient stays are followed by a
+readmission within 30 days at a rate that rises with member risk (`ra_mm`, high-cost
+flag, age) and with the admitting MDC, so readmission models have signal to learn.
+
+Claims are generated in chunks from a member block per chunk, so any scale (10K to
+50M rows) streams with flat memory and the same seed always yields the same rows.
+
+Usage:
+    tables = load_synthetic_warehouse(engine, n_claims=1_000_000, seed=42)
+"""
+
+import numpy as np
+import pandas as pd
+from orchestrator import console
+import catalog
+
+START_DATE = pd.Timestamp("2022-01-01")
+N_DAYS = 3 * 365
+
+# Dimension cardinalities
+N_PLANS = 60
+N_DIAGNOSIS_CODES = 4_000
+N_PROCEDURE_CODES = 1_500
+N_DRGS = 750
+N_MDCS = 25
+N_DRUGS = 900
+N_CCSR = 530
+
+CLAIMS_PER_MEMBER = 12
+MEMBERS_PER_PROVIDER = 25
+
+CLAIM_TYPES = ["Professional", "Outpatient", "Inpatient", "Pharmacy"]
+CLAIM_TYPE_SHARES = [0.55, 0.22, 0.05, 0.18]
+CLAIM_STATUSES = ["PAID", "DENIED", "PENDING", "ADJUSTED"]
+CLAIM_STATUS_SHARES = [0.86, 0.07, 0.03, 0.04]
+SERVICE_CATEGORIES = {
+    "Professional": "Professional", "Outpatient": "Outpatient Facility",
+    "Inpatient": "Inpatient Facility", "Pharmacy": "Pharmacy",
+}
+CHANNELS = ["Office", "Hospital Outpatient", "Inpatient Hospital", "Emergency Room", "Telehealth", "Retail Pharmacy"]
+SPECIALTIES = ["Family Medicine", "Internal Medicine", "Cardiology", "Orthopedics", "Emergency Medicine",
+               "Oncology", "Pulmonology", "Nephrology", "Psychiatry", "Hospitalist", "General Surgery", "Pharmacy"]
+METAL_TIERS = ["Bronze", "Silver", "Gold", "Platinum", "Catastrophic"]
+REGIONS = ["Northeast", "Southeast", "Midwest", "Southwest", "West"]
+STATES = ["WI", "IL", "MN", "TX", "FL", "GA", "AZ", "CO", "CA", "WA", "NY", "PA", "OH", "MI"]
+CLINICAL_SEGMENTS = ["Healthy", "Chronic Stable", "Chronic Complex", "Behavioral Health", "Maternity", "Oncology"]
+AGE_GROUPS = ["0-17", "18-25", "26-34", "35-44", "45-54", "55-64", "65+"]
+
+FCT_CLAIM_COLUMNS = [
+    "claim_id", "member_id", "provider_id", "plan_id", "claim_date", "claim_amount", "allowed_amount",
+    "paid_amount", "claim_status", "diagnosis_code", "procedure_code", "charges", "allowed",
+    "clean_claim_status", "claim_from", "clean_claim_out", "utilization", "hcg_units_days", "claim_type",
+    "major_service_category", "provider_specialty", "detailed_service_category", "ms_drg",
+    "ms_drg_description", "ms_drg_mdc", "ms_drg_mdc_desc", "cpt", "cpt_consumer_description",
+    "procedure_level_1", "procedure_level_2", "procedure_level_3", "procedure_level_4", "procedure_level_5",
+    "channel", "drug_name", "drug_class", "drug_subclass", "drug", "is_oon", "best_contracting_entity_name",
+    "provider_group_name", "ccsr_system_description", "ccsr_description",
+]
+
+def _zipf_weights(n: int, a: float = 1.1) -> np.ndarray:
+    w = 1.0 / np.arange(1, n + 1) ** a
+    return w / w.sum()
+
+def _codes(prefix: str, n: int, width: int) -> np.ndarray:
+    return np.array([f"{prefix}{i:0{width}d}" for i in range(n)], dtype=object)
+
+def _pick(rng: np.random.Generator, pool: np.ndarray, size: int, weights: np.ndarray = None) -> pd.Categorical:
+    """Draws from a code pool as a categorical (cheap to build and to write)."""
+    codes = rng.choice(len(pool), size=size, p=weights)
+    return pd.Categorical.from_codes(codes, categories=pool)
+
+def _diagnosis_pool() -> np.ndarray:
+    letters = "ABCDEFGHIJKLMNOPQRSTZ"
+    return np.array([f"{letters[i % len(letters)]}{(i // len(letters)) % 100:02d}.{i // (len(letters) * 100)}"
+                     for i in range(N_DIAGNOSIS_CODES)], dtype=object)
+
+def _drg_mdc(drg_index: np.ndarray) -> np.ndarray:
+    return drg_index * N_MDCS // N_DRGS
+
+def generate_members(n_members: int, seed: int = 42) -> pd.DataFrame:
+    """Builds dim_member (one current row per member)."""
+    rng = np.random.default_rng([seed, 0])
+    age = np.clip(rng.gamma(4.0, 11.0, n_members), 0, 95).astype(int)
+    ra_mm = np.round(rng.lognormal(0.0, 0.6, n_members), 3)
+    high_cost = ra_mm > np.quantile(ra_mm, 0.95) if n_members else ra_mm > 0
+    state_idx = rng.integers(0, len(STATES), n_members)
+    return pd.DataFrame({
+        "member_id": np.arange(1, n_members + 1),
+        "first_name": _codes("FIRST", 5_000, 4)[rng.integers(0, 5_000, n_members)],
+        "last_name": _codes("LAST", 20_000, 5)[rng.integers(0, 20_000, n_members)],
+        "date_of_birth": pd.Timestamp("2024-01-01") - pd.to_timedelta(age * 365 + rng.integers(0, 365, n_members), unit="D"),
+        "gender": rng.choice(["F", "M"], n_members),
+        "age_group": pd.cut(age, [-1, 17, 25, 34, 44, 54, 64, 200], labels=AGE_GROUPS).astype(str),
+        "region": np.array(REGIONS)[state_idx % len(REGIONS)],
+        "state": np.array(STATES)[state_idx],
+        "geographic_reporting": np.array(STATES)[state_idx] + "-" + rng.integers(1, 9, n_members).astype(str),
+        "hios_id": np.char.add("HIOS", rng.integers(10_000, 10_000 + N_PLANS, n_members).astype(str)),
+        "plan_network_access_type": rng.choice(["HMO", "PPO", "EPO", "POS"], n_members, p=[0.45, 0.3, 0.2, 0.05]),
+        "plan_metal": rng.choice(METAL_TIERS, n_members, p=[0.3, 0.45, 0.15, 0.05, 0.05]),
+        "enrollment_length_continuous": rng.integers(1, 61, n_members),
+        "clinical_segment": rng.choice(CLINICAL_SEGMENTS, n_members, p=[0.5, 0.2, 0.1, 0.1, 0.05, 0.05]),
+        "high_cost_member": high_cost,
+        "mutually_exclusive_hcc_condition": np.where(ra_mm > 1.5, "HCC" + rng.integers(1, 120, n_members).astype(str), "None"),
+        "wisconsin_area_deprivation_index": rng.integers(1, 11, n_members),
+        "ra_mm": ra_mm,
+        "general_agency_name": _codes("AGENCY", 40, 2)[rng.integers(0, 40, n_members)],
+        "broker_name": _codes("BROKER", 800, 3)[rng.integers(0, 800, n_members)],
+        "sa_contracting_entity_name": _codes("ENTITY", 30, 2)[rng.integers(0, 30, n_members)],
+        "call_count": rng.poisson(1.5, n_members),
+        "app_login_count": rng.poisson(4.0, n_members),
+        "web_login_count": rng.poisson(2.0, n_members),
+        "new_member_in_period": rng.random(n_members) < 0.15,
+        "member_used_app": rng.random(n_members) < 0.4,
+        "member_had_web_login": rng.random(n_members) < 0.3,
+        "member_visited_new_provider_ind": rng.random(n_members) < 0.2,
+        "year": 2024,
+        "validity_start_ts": pd.Timestamp("2022-01-01"),
+        "validity_end_ts": pd.NaT,
+        "is_current": True,
+    })
+
+def generate_plans(seed: int = 42) -> pd.DataFrame:
+    """Builds dim_plan."""
+    rng = np.random.default_rng([seed, 1])
+    tiers = rng.choice(METAL_TIERS, N_PLANS)
+    return pd.DataFrame({
+        "plan_id": np.arange(1, N_PLANS + 1),
+        "plan_name": _codes("PLAN ", N_PLANS, 3),
+        "metal_tier": tiers,
+        "monthly_premium": np.round(rng.uniform(250, 900, N_PLANS), 2),
+        "deductible": rng.choice([500, 1500, 3000, 6000, 9000], N_PLANS),
+        "oop_max": rng.choice([4000, 6500, 9100], N_PLANS),
+        "coinsurance_rate": rng.choice([0.1, 0.2, 0.3, 0.4], N_PLANS),
+        "pcp_copay": rng.choice([0, 20, 35, 50], N_PLANS),
+        "effective_year": 2024,
+    })
+
+def generate_providers(n_providers: int, seed: int = 42) -> pd.DataFrame:
+    """Builds dim_provider."""
+    rng = np.random.default_rng([seed, 2])
+    return pd.DataFrame({
+        "provider_id": np.arange(1, n_providers + 1),
+        "npi": 1_000_000_000 + np.arange(1, n_providers + 1),
+        "provider_name": _codes("PROVIDER ", n_providers, 6),
+        "specialty": rng.choice(SPECIALTIES, n_providers),
+        "street": _codes("STREET ", 1_000, 4)[rng.integers(0, 1_000, n_providers)],
+        "city": _codes("CITY ", 300, 3)[rng.integers(0, 300, n_providers)],
+        "state": rng.choice(STATES, n_providers),
+        "zip": rng.integers(10_000, 99_999, n_providers).astype(str),
+        "phone": rng.integers(2_000_000_000, 9_999_999_999, n_providers).astype(str),
+    })
+
+def generate_dates() -> pd.DataFrame:
+    """Builds dim_date over the synthetic claim window."""
+    d = pd.Series(pd.date_range(START_DATE, periods=N_DAYS + 60, freq="D"))
+    return pd.DataFrame({
+        "date_key": d.dt.year * 10_000 + d.dt.month * 100 + d.dt.day,
+        "full_date": d,
+        "year": d.dt.year,
+        "quarter": d.dt.quarter,
+        "month": d.dt.month,
+        "month_name": d.dt.strftime("%b"),
+        "day": d.dt.day,
+        "day_of_week": d.dt.isocalendar().day.astype(int).to_numpy(),
+        "day_name": d.dt.strftime("%a"),
+        "week_of_year": d.dt.isocalendar().week.astype(int).to_numpy(),
+        "is_weekend": d.dt.weekday >= 5,
+    })
+
+def iter_claims(n_claims: int, n_members: int = None, seed: int = 42, chunk_size: int = 500_000,
+                members: pd.DataFrame = None):
+    """
+    Yields fct_claim chunks totalling n_claims rows.
+
+    Each chunk draws its claims from its own block of members, so every readmission
+    lands in the same chunk as its index stay.
+
+    Args:
+        n_claims: Total rows.
+        n_members: Member count (default: n_claims / 12).
+        seed: Seed; chunk i uses the stream (seed, 100 + i).
+        chunk_size: Rows per chunk.
+        members: dim_member frame (generated from the seed if omitted).
+    """
+    n_members = n_members or max(n_claims // CLAIMS_PER_MEMBER, 1)
+    if members is None:
+        members = generate_members(n_members, seed)
+    n_providers = max(n_members // MEMBERS_PER_PROVIDER, 1)
+    ra_mm = members["ra_mm"].to_numpy()
+    risk = (0.6 * np.log(ra_mm) + 0.8 * members["high_cost_member"].to_numpy()
+            + 0.015 * (members["age_group"].map({g: i for i, g in enumerate(AGE_GROUPS)}).to_numpy() * 10 - 40))
+
+    diagnosis_pool, diagnosis_w = _diagnosis_pool(), _zipf_weights(N_DIAGNOSIS_CODES)
+    procedure_pool, procedure_w = _codes("", N_PROCEDURE_CODES, 5), _zipf_weights(N_PROCEDURE_CODES)
+    drg_pool, drg_w = _codes("", N_DRGS, 3), _zipf_weights(N_DRGS, 0.9)
+    mdc_pool = _codes("MDC ", N_MDCS, 2)
+    drug_pool, drug_w = _codes("DRUG ", N_DRUGS, 4), _zipf_weights(N_DRUGS)
+    ccsr_pool, ccsr_w = _codes("CCSR ", N_CCSR, 3), _zipf_weights(N_CCSR)
+    # Some MDCs (circulatory, respiratory, kidney) readmit far more often
+    mdc_effect = np.random.default_rng([seed, 3]).normal(0.0, 0.5, N_MDCS)
+
+    n_chunks = -(-n_claims // chunk_size)
+    members_per_chunk = -(-n_members // n_chunks)
+    claim_id = 1
+    for i in range(n_chunks):
+        rng = np.random.default_rng([seed, 100 + i])
+        m = min(chunk_size, n_claims - i * chunk_size)
+        lo = min(i * members_per_chunk, n_members - 1)
+        hi = max(min(lo + members_per_chunk, n_members), lo + 1)
+
+        # Sicker members file more claims and are admitted more often
+        weights = np.exp(risk[lo:hi])
+        member_idx = lo + rng.choice(hi - lo, size=m, p=weights / weights.sum())
+        type_p = np.tile(CLAIM_TYPE_SHARES, (m, 1))
+        type_p[:, 2] *= np.exp(0.7 * risk[member_idx])
+        type_p /= type_p.sum(axis=1, keepdims=True)
+        claim_type = (type_p.cumsum(axis=1) > rng.random((m, 1))).argmax(axis=1)
+        day = rng.integers(0, N_DAYS, m)
+        drg = rng.choice(N_DRGS, size=m, p=drg_w)
+
+        # Readmissions: inpatient stays in the first half of the chunk may spawn a return
+        # admission 1-30 days later; those rows replace the (i.i.d.) tail of the chunk
+        inpatient = claim_type == 2
+        logit = -2.0 + risk[member_idx] + mdc_effect[_drg_mdc(drg)]
+        readmit = np.flatnonzero(inpatient[: m // 2] & (rng.random(m // 2) < 1 / (1 + np.exp(-logit[: m // 2]))))
+        if len(readmit):
+            tail = np.arange(m - len(readmit), m)
+            member_idx[tail] = member_idx[readmit]
+            claim_type[tail] = 2
+            day[tail] = day[readmit] + rng.integers(1, 31, len(readmit))
+            # Return stays usually share the index stay's MDC
+            same_mdc = rng.random(len(readmit)) < 0.7
+            drg[tail] = np.where(same_mdc, drg[readmit], rng.choice(N_DRGS, size=len(readmit), p=drg_w))
+
+        inpatient = claim_type == 2
+        los = np.where(inpatient, 1 + rng.poisson(3.0 + ra_mm[member_idx]), 0)
+        base = rng.lognormal([5.0, 6.5, 9.3, 4.2], 0.9, (m, 4))[np.arange(m), claim_type]
+        charges = np.round(base * (1 + 0.3 * los), 2)
+        allowed = np.round(charges * rng.uniform(0.35, 0.8, m), 2)
+        paid = np.round(allowed * rng.uniform(0.6, 1.0, m), 2)
+        status = _pick(rng, np.array(CLAIM_STATUSES, dtype=object), m, CLAIM_STATUS_SHARES)
+        claim_date = START_DATE + pd.to_timedelta(day, unit="D")
+        type_names = np.array(CLAIM_TYPES, dtype=object)[claim_type]
+        drg_idx = np.where(inpatient, drg, -1)
+        mdc_idx = np.where(inpatient, _drg_mdc(drg), -1)
+        pharmacy = claim_type == 3
+        drug = rng.choice(N_DRUGS, size=m, p=drug_w)
+        procedure = _pick(rng, procedure_pool, m, procedure_w)
+        provider_id = 1 + (member_idx * 7 + rng.integers(0, 5, m)) % n_providers
+
+        chunk = pd.DataFrame({
+            "claim_id": np.arange(claim_id, claim_id + m),
+            "member_id": members["member_id"].to_numpy()[member_idx],
+            "provider_id": provider_id,
+            "plan_id": 1 + member_idx % N_PLANS,
+            "claim_date": claim_date,
+            "claim_amount": charges,
+            "allowed_amount": allowed,
+            "paid_amount": paid,
+            "claim_status": status,
+            "diagnosis_code": _pick(rng, diagnosis_pool, m, diagnosis_w),
+            "procedure_code": procedure,
+            "charges": charges,
+            "allowed": allowed,
+            "clean_claim_status": np.where(status == "DENIED", "UNCLEAN", "CLEAN"),
+            "claim_from": claim_date,
+            "clean_claim_out": claim_date + pd.to_timedelta(np.maximum(los, 0) + rng.integers(5, 45, m), unit="D"),
+            "utilization": np.where(inpatient, los, 1),
+            "hcg_units_days": np.where(inpatient, los, rng.integers(1, 3, m)),
+            "claim_type": type_names,
+            "major_service_category": pd.Series(type_names).map(SERVICE_CATEGORIES).to_numpy(),
+            "provider_specialty": np.where(inpatient, "Hospitalist", np.array(SPECIALTIES, dtype=object)[provider_id % len(SPECIALTIES)]),
+            "detailed_service_category": np.where(inpatient, "Medical Inpatient", type_names + " Services"),
+            "ms_drg": pd.Categorical.from_codes(drg_idx, categories=drg_pool),
+            "ms_drg_description": pd.Categorical.from_codes(drg_idx, categories="DRG " + drg_pool),
+            "ms_drg_mdc": pd.Categorical.from_codes(mdc_idx, categories=mdc_pool),
+            "ms_drg_mdc_desc": pd.Categorical.from_codes(mdc_idx, categories=mdc_pool + " DESCRIPTION"),
+            "cpt": procedure,
+            "cpt_consumer_description": pd.Categorical.from_codes(procedure.codes, categories="CPT " + procedure_pool),
+            "procedure_level_1": pd.Categorical.from_codes(procedure.codes % 6, categories=_codes("L1-", 6, 1)),
+            "procedure_level_2": pd.Categorical.from_codes(procedure.codes % 30, categories=_codes("L2-", 30, 2)),
+            "procedure_level_3": pd.Categorical.from_codes(procedure.codes % 120, categories=_codes("L3-", 120, 3)),
+            "procedure_level_4": pd.Categorical.from_codes(procedure.codes % 400, categories=_codes("L4-", 400, 3)),
+            "procedure_level_5": procedure,
+            "channel": np.where(inpatient, "Inpatient Hospital", np.where(pharmacy, "Retail Pharmacy",
+                                np.array(CHANNELS, dtype=object)[rng.choice(5, m, p=[0.55, 0.2, 0.0, 0.1, 0.15])])),
+            "drug_name": pd.Categorical.from_codes(np.where(pharmacy, drug, -1), categories=drug_pool),
+            "drug_class": pd.Categorical.from_codes(np.where(pharmacy, drug % 40, -1), categories=_codes("CLASS ", 40, 2)),
+            "drug_subclass": pd.Categorical.from_codes(np.where(pharmacy, drug % 160, -1), categories=_codes("SUBCLASS ", 160, 3)),
+            "drug": pd.Categorical.from_codes(np.where(pharmacy, drug, -1), categories=drug_pool),
+            "is_oon": rng.random(m) < 0.06,
+            "best_contracting_entity_name": _codes("ENTITY", 30, 2)[provider_id % 30],
+            "provider_group_name": _codes("GROUP", 500, 3)[provider_id % 500],
+            "ccsr_system_description": pd.Categorical.from_codes(rng.choice(N_CCSR, m, p=ccsr_w) % 22, categories=_codes("SYSTEM ", 22, 2)),
+            "ccsr_description": _pick(rng, ccsr_pool, m, ccsr_w),
+        })
+        claim_id += m
+        yield chunk
+
+def star_claims(claims: pd.DataFrame, members: pd.DataFrame, plans: pd.DataFrame, providers: pd.DataFrame) -> pd.DataFrame:
+    """Joins a fct_claim chunk to its dimensions with the columns of star_claims."""
+    star = claims[["claim_id", "claim_date", "member_id", "plan_id", "provider_id", "claim_amount",
+                   "allowed_amount", "paid_amount", "claim_status", "diagnosis_code", "procedure_code"]]
+    star = star.merge(members[["member_id", "first_name", "last_name", "date_of_birth", "gender", "age_group", "region"]]
+                      .rename(columns=lambda c: c if c == "member_id" else f"member_{c}")
+                      .rename(columns={"member_date_of_birth": "member_dob"}), on="member_id", how="left")
+    star = star.merge(plans[["plan_id", "plan_name", "metal_tier", "monthly_premium"]], on="plan_id", how="left")
+    star = star.merge(providers[["provider_id", "provider_name", "specialty"]]
+                      .rename(columns={"specialty": "provider_specialty"}), on="provider_id", how="left")
+    star["claim_full_date"] = star["claim_date"]
+    return star[["claim_id", "claim_date", "claim_full_date", "member_id", "member_first_name", "member_last_name",
+                 "member_dob", "member_gender", "member_age_group", "member_region", "plan_id", "plan_name",
+                 "metal_tier", "monthly_premium", "provider_id", "provider_name", "provider_specialty",
+                 "claim_amount", "allowed_amount", "paid_amount", "claim_status", "diagnosis_code", "procedure_code"]]
+
+def label_readmissions(claims: pd.DataFrame, window_days: int = 30) -> pd.DataFrame:
+    """
+    Returns one row per inpatient stay with `readmission_30d` = another inpatient stay
+    for the same member within window_days after it.
+    """
+    stays = claims[claims["claim_type"] == "Inpatient"].sort_values(["member_id", "claim_date"])
+    next_stay = stays.groupby("member_id")["claim_date"].shift(-1)
+    stays = stays.assign(readmission_30d=((next_stay - stays["claim_date"]).dt.days <= window_days).astype(int))
+    stays["prior_stays"] = stays.groupby("member_id").cumcount()
+    return stays
+
+def load_synthetic_warehouse(engine, n_claims: int, seed: int = 42, chunk_size: int = 500_000,
+                             schema: str = None) -> dict:
+    """
+    Writes fct_claim, dim_member, dim_plan, dim_provider, dim_date and star_claims
+    into a database (Postgres or the embedded SQLite stand-in), streaming claim chunks.
+
+    Args:
+        engine: SQLAlchemy engine (see dataops.get_db_engine).
+        n_claims: fct_claim rows.
+        seed: Generator seed.
+        chunk_size: Rows generated and inserted per chunk.
+        schema: Target schema (None for the connection default).
+
+    Returns:
+        dict: Row counts per table.
+    """
+    n_members = max(n_claims // CLAIMS_PER_MEMBER, 1)
+    members = generate_members(n_members, seed)
+    plans = generate_plans(seed)
+    providers = generate_providers(max(n_members // MEMBERS_PER_PROVIDER, 1), seed)
+    dims = {"dim_member": members, "dim_plan": plans, "dim_provider": providers, "dim_date": generate_dates()}
+    counts = {}
+    for name, df in dims.items():
+        df.to_sql(name, engine, schema=schema, if_exists="replace", index=False, chunksize=50_000)
+        counts[name] = len(df)
+
+    counts["fct_claim"] = counts["star_claims"] = 0
+    for i, chunk in enumerate(iter_claims(n_claims, n_members, seed, chunk_size, members)):
+        mode = "replace" if i == 0 else "append"
+        chunk.to_sql("fct_claim", engine, schema=schema, if_exists=mode, index=False, chunksize=50_000)
+        star_claims(chunk, members, plans, providers).to_sql(
+            "star_claims", engine, schema=schema, if_exists=mode, index=False, chunksize=50_000)
+        counts["fct_claim"] += len(chunk)
+        counts["star_claims"] += len(chunk)
+        console.print(f"[dim]Synthetic claims loaded:[/dim] {counts['fct_claim']:,}/{n_claims:,}")
+    catalog.invalidate(schema)
+    return counts
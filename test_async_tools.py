@@ -0,0 +1,101 @@
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+import pandas as pd
+import orchestrator
+import async_tools
+
+def _slow_read_query(query, statement_timeout_ms=None, on_backend_pid=None):
+    on_backend_pid(4242)
+    time.sleep(0.5)
+    return pd.DataFrame({"x": [1]})
+
+class TestAsyncTools(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.original_context = orchestrator._RUN_CONTEXT.copy()
+        self.original_env = os.environ.get(orchestrator.RUN_DIR_ENV)
+        orchestrator._RUN_CONTEXT = {"dir": None, "timestamp": None, "step": 0}
+        os.environ[orchestrator.RUN_DIR_ENV] = os.path.join(self.output_dir, "20250101_000000")
+
+        self.csv_paths = []
+        for i in range(4):
+            path = os.path.join(self.output_dir, f"data_{i}.csv")
+            pd.DataFrame({"a": range(100), "b": [i] * 100}).to_csv(path, index=False)
+            self.csv_paths.append(path)
+
+    def tearDown(self):
+        async_tools.shutdown_executors()
+        orchestrator._RUN_CONTEXT = self.original_context
+        if self.original_env is None:
+            os.environ.pop(orchestrator.RUN_DIR_ENV, None)
+        else:
+            os.environ[orchestrator.RUN_DIR_ENV] = self.original_env
+        shutil.rmtree(self.output_dir)
+
+    async def _with_heartbeat(self, awaitable):
+        """Awaits while a 5 ms heartbeat runs on the loop; returns (result, seconds, longest gap between beats)."""
+        beats = [time.perf_counter()]
+
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(0.005)
+                beats.append(time.perf_counter())
+
+        beat = asyncio.create_task(heartbeat())
+        try:
+            result = await awaitable
+        finally:
+            beat.cancel()
+        beats.append(time.perf_counter())
+        return result, beats[-1] - beats[0], max(b - a for a, b in zip(beats, beats[1:]))
+
+    async def test_file_tools_run_concurrently_off_the_loop(self):
+        profiles, _, longest_gap = await self._with_heartbeat(
+            asyncio.gather(*(async_tools.profile_dataset_async(p) for p in self.csv_paths)))
+
+        self.assertEqual([p["rows"] for p in profiles], [100] * 4)
+        self.assertLess(longest_gap, 0.1)
+
+    async def test_loop_stays_responsive_during_a_query(self):
+        with mock.patch.object(async_tools.dataops, "_read_query", _slow_read_query):
+            path, seconds, longest_gap = await self._with_heartbeat(async_tools.execute_sql_async("SELECT 1"))
+
+        self.assertEqual(pd.read_csv(path)["x"].tolist(), [1])
+        self.assertGreaterEqual(seconds, 0.5)
+        self.assertLess(longest_gap, 0.1)  # a blocked loop would miss beats for the whole 0.5 s query
+
+    async def test_cpu_tool_runs_in_process_pool(self):
+        scores_path = os.path.join(self.output_dir, "scores.csv")
+        pd.DataFrame({"y_true": [0, 1] * 50, "y_prob": [0.2, 0.8] * 50}).to_csv(scores_path, index=False)
+        result = await async_tools.bootstrap_metrics_async(scores_path, n_resamples=50, timeout=60)
+
+        self.assertEqual(result["metrics"]["auc"]["estimate"], 1.0)
+        self.assertTrue(result["results_file"].startswith(self.output_dir))
+
+    async def test_timeout_cancels_query_in_postgres(self):
+        cancelled = []
+        with mock.patch.object(async_tools.dataops, "_read_query", _slow_read_query), \
+             mock.patch.object(async_tools.dataops, "cancel_backend", cancelled.append):
+            with self.assertRaises(asyncio.TimeoutError):
+                await async_tools.execute_sql_async("SELECT pg_sleep(10)", timeout=0.1)
+        self.assertEqual(cancelled, [4242])
+
+    async def test_cancelled_task_cancels_query(self):
+        cancelled = []
+        with mock.patch.object(async_tools.dataops, "_read_query", _slow_read_query), \
+             mock.patch.object(async_tools.dataops, "cancel_backend", cancelled.append):
+            task = asyncio.create_task(async_tools.execute_sql_async("SELECT pg_sleep(10)"))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+        self.assertEqual(cancelled, [4242])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import os
+import hashlib
+import shutil
+import tempfile
+import pandas as pd
+import orchestrator
+import blobstore
+import incrementer
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.base_dir, "run")
+        self.original_context = orchestrator._RUN_CONTEXT.copy()
+        self.original_settings = dict(blobstore._SETTINGS)
+        orchestrator._RUN_CONTEXT = {"dir": self.output_dir, "timestamp": "20250101_000000", "step": 0}
+        blobstore.configure(enabled=True, dir=os.path.join(self.base_dir, "blobs"), spool_mb=1)
+        self.df = pd.DataFrame({"member_id": range(1_000), "paid": [i * 0.5 for i in range(1_000)]})
+
+    def tearDown(self):
+        orchestrator._RUN_CONTEXT = self.original_context
+        blobstore.configure(**self.original_settings)
+        shutil.rmtree(self.base_dir)
+
+    def test_identical_artifacts_share_one_blob(self):
+        first = orchestrator.save_dataframe_to_csv(self.df, "extract")
+        second = orchestrator.save_dataframe_to_csv(self.df, "extract_again", subdir="mlops")
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(os.stat(first).st_ino, os.stat(second).st_ino)
+        pd.testing.assert_frame_equal(pd.read_csv(second), self.df)
+        stats = blobstore.stats()
+        self.assertEqual((stats["blobs"], stats["referenced"]), (1, 1))
+        self.assertEqual(stats["deduplicated_bytes"], os.path.getsize(first))
+
+    def test_spilled_artifacts_are_deduplicated(self):
+        blobstore.configure(spool_mb=0.001)
+        paths = [orchestrator.save_dataframe_to_csv(self.df, "large") for _ in range(2)]
+        self.assertEqual(os.stat(paths[0]).st_ino, os.stat(paths[1]).st_ino)
+        self.assertEqual(os.stat(paths[0]).st_nlink, 3)
+        self.assertEqual([f for f in os.listdir(os.path.dirname(paths[0])) if ".tmp." in f], [])
+
+    def test_gc_compresses_unreferenced_blobs_and_restores_them(self):
+        path = orchestrator.save_dataframe_to_csv(self.df, "extract")
+        os.remove(path)  # e.g. the run directory was deleted
+
+        result = blobstore.collect(retention_days=30)
+        self.assertEqual(result["compressed"], 1)
+        self.assertEqual(blobstore.stats()["compressed"], 1)
+
+        blobstore.restore(path)
+        pd.testing.assert_frame_equal(pd.read_csv(path), self.df)
+        self.assertEqual(blobstore.stats()["referenced"], 1)
+
+        os.remove(path)
+        self.assertEqual(blobstore.collect(retention_days=0)["deleted"], 1)
+        self.assertEqual(blobstore.stats()["blobs"], 0)
+
+    def test_artifacts_stay_writable_and_replacing_one_keeps_the_blob(self):
+        path = orchestrator.save_dataframe_to_csv(self.df, "extract")
+        self.assertTrue(os.stat(path).st_mode & 0o200)
+        orchestrator.save_dataframe_to_csv(self.df.head(10), "extract")
+        pd.testing.assert_frame_equal(pd.read_csv(path), self.df)
+
+    def test_duplicates_replace_an_existing_destination(self):
+        os.makedirs(self.output_dir)
+        stored, src, dest = (os.path.join(self.output_dir, name) for name in ("stored.csv", "src.csv", "x.csv"))
+        sha = hashlib.sha256(b"new").hexdigest()
+        blobstore.put_bytes(b"new", sha, stored)
+        for put in (lambda: blobstore.put_bytes(b"new", sha, dest), lambda: blobstore.put_file(src, sha, dest)):
+            if os.path.exists(dest):
+                os.remove(dest)  # unlink first: writing through the previous link would change the blob
+            for path, data in ((dest, b"old"), (src, b"new")):
+                with open(path, "wb") as f:
+                    f.write(data)
+            put()
+            with open(dest, "rb") as f:
+                self.assertEqual(f.read(), b"new")
+            self.assertEqual(os.stat(dest).st_ino, os.stat(stored).st_ino)
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ["stored.csv", "x.csv"])
+
+    def test_export_overwrites_a_reused_step_name(self):
+        original = (incrementer._OUTPUT_ROOT, incrementer._STEP_COUNTER)
+        incrementer.set_output_dir(self.output_dir)
+        try:
+            incrementer.export(self.df, "extract")
+            incrementer.export(self.df.head(3), "preview")
+            incrementer._STEP_COUNTER = 0  # the step sequence restarts; the head is already stored
+            incrementer.export(self.df.head(3), "extract")
+        finally:
+            incrementer._OUTPUT_ROOT, incrementer._STEP_COUNTER = original
+        first, second = sorted(os.path.join(self.output_dir, f) for f in os.listdir(self.output_dir))
+        pd.testing.assert_frame_equal(pd.read_csv(first), self.df.head(3))
+        self.assertEqual(os.stat(first).st_ino, os.stat(second).st_ino)
+
+    def test_store_defaults_to_the_output_root(self):
+        blobstore.configure_from({"output": {"root_dir": os.path.join(self.base_dir, "runs")}})
+        self.assertEqual(blobstore.root(), os.path.join(self.base_dir, "runs", "blobs"))
+        blobstore.configure_from({"blobstore": {"dir": os.path.join(self.base_dir, "shared")}})
+        self.assertEqual(blobstore.root(), os.path.join(self.base_dir, "shared"))
+
+    def test_disabled_store_writes_plain_files(self):
+        blobstore.configure(enabled=False)
+        path = orchestrator.save_dataframe_to_csv(self.df, "extract")
+        self.assertEqual(os.stat(path).st_nlink, 1)
+        self.assertEqual(blobstore.stats()["blobs"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+import pandas as pd
+import orchestrator
+import catalog
+import dataops
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.original_context = orchestrator._RUN_CONTEXT.copy()
+        self.original_database = orchestrator.CONFIG.get("database")
+        self.original_catalog = orchestrator.CONFIG.get("catalog")
+        orchestrator._RUN_CONTEXT = {"dir": self.output_dir, "timestamp": "20250101_000000", "step": 0}
+        orchestrator.CONFIG["database"] = {"type": "sqlite", "path": os.path.join(self.output_dir, "warehouse.sqlite")}
+        orchestrator.CONFIG["catalog"] = {"dir": os.path.join(self.output_dir, "catalog"), "ttl_seconds": 900}
+
+        self.engine = dataops.get_db_engine()
+        pd.DataFrame({
+            "member_id": ["M1", "M2", "M3", "M4"],
+            "plan_id": ["P1", "P1", "P2", None],
+            "visits": pd.array([1, None, 3, 4], dtype="Int64"),
+            "paid": [10.5, 20.0, 30.25, 0.0],
+        }).to_sql("dim_member", self.engine, index=False)
+
+    def tearDown(self):
+        catalog.invalidate()
+        self.engine.dispose()
+        orchestrator._RUN_CONTEXT = self.original_context
+        orchestrator.CONFIG["database"] = self.original_database
+        orchestrator.CONFIG["catalog"] = self.original_catalog
+        shutil.rmtree(self.output_dir)
+
+    def test_schema_is_reflected_once_and_served_from_cache(self):
+        self.assertEqual(dataops.get_table_schema("dim_member"),
+                         {"member_id": "TEXT", "plan_id": "TEXT", "visits": "BIGINT", "paid": "FLOAT"})
+
+        # Within the TTL neither this process nor a fresh one (disk cache) touches the database
+        catalog._CATALOGS.clear()
+        with mock.patch.object(dataops, "get_db_engine", side_effect=AssertionError("database contacted")):
+            self.assertIn("visits", dataops.get_table_schema("dim_member"))
+            self.assertEqual(catalog.pandas_dtypes("dim_member")["visits"], "Int64")
+
+    def test_expired_catalog_is_revalidated_by_ddl_fingerprint(self):
+        first = catalog.get_catalog()
+        orchestrator.CONFIG["catalog"]["ttl_seconds"] = 0
+
+        revalidated = catalog.get_catalog()
+        self.assertEqual(revalidated["reflected_at"], first["reflected_at"])
+
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("ALTER TABLE dim_member ADD COLUMN tier TEXT")
+        self.assertIn("tier", catalog.table_columns("dim_member"))
+
+    def test_unknown_tables_and_columns_fail_before_querying(self):
+        with self.assertRaises(ValueError):
+            dataops.get_table_schema("no_such_table")
+        with self.assertRaises(ValueError):
+            dataops.extract_table("dim_member", columns=["member_id", "no_such_column"])
+
+    def test_extract_table_pushes_down_columns_and_filters(self):
+        result = dataops.extract_table("dim_member", columns=["member_id", "visits"],
+                                       filters={"plan_id": ["P1", "P2"]}, report=True)
+        df = pd.read_csv(result["path"])
+
+        self.assertEqual(list(df.columns), ["member_id", "visits"])
+        self.assertEqual(sorted(df["member_id"]), ["M1", "M2", "M3"])
+        # Integer column with a NULL stays integer (no 3.0 upcast in the artifact)
+        with open(result["path"]) as f:
+            self.assertNotIn("3.0", f.read())
+        self.assertEqual(result["execution"]["rows"], 3)
+        self.assertEqual(result["execution"]["columns"], 2)
+
+        nulls = pd.read_csv(dataops.extract_table("dim_member", filters={"plan_id": None}))
+        self.assertEqual(list(nulls["member_id"]), ["M4"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import orchestrator
+import registry
+import mlops
+import drift
+
+def make_claims(n: int, seed: int, age_shift: float = 0.0, inpatient_share: float = 0.3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "member_id": [f"M{i}" for i in range(n)],
+        "age": rng.normal(50 + age_shift, 12, n),
+        "prior_admits": rng.poisson(1, n),
+        "claim_type": np.where(rng.random(n) < inpatient_share, "IP", rng.choice(["OP", "RX"], n)),
+        "readmission_30d": rng.integers(0, 2, n),
+    })
+    df.loc[rng.random(n) < 0.05, "age"] = np.nan
+    return df
+
+class TestDriftSketches(unittest.TestCase):
+    def setUp(self):
+        self.train = make_claims(5_000, seed=0).drop(columns=["member_id", "readmission_30d"])
+        self.reference = drift.build_reference(self.train, psi_bins=10, ks_bins=100, max_categories=5)
+
+    def test_states_merge_exactly(self):
+        new = make_claims(9_000, seed=1, age_shift=3)
+        whole = drift.update(drift.empty_like(self.reference), new)
+        parts = [drift.update(drift.empty_like(self.reference), new.iloc[i:i + 2_000]) for i in range(0, 9_000, 2_000)]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged = drift.merge(merged, part)
+
+        self.assertEqual(merged["rows"], 9_000)
+        self.assertEqual(merged["features"]["claim_type"]["counts"], whole["features"]["claim_type"]["counts"])
+        self.assertEqual(merged["features"]["age"]["ks_counts"], whole["features"]["age"]["ks_counts"])
+        self.assertAlmostEqual(merged["features"]["age"]["sum"], whole["features"]["age"]["sum"], places=6)
+
+    def test_binned_ks_tracks_the_exact_statistic(self):
+        new = make_claims(20_000, seed=2, age_shift=4)
+        rows = drift.compare(self.reference, drift.update(drift.empty_like(self.reference), new))
+        age = next(r for r in rows if r["feature"] == "age")
+
+        a, b = np.sort(self.train["age"].dropna()), np.sort(new["age"].dropna())
+        grid = np.concatenate([a, b])
+        exact = np.max(np.abs(np.searchsorted(a, grid, side="right") / len(a) -
+                              np.searchsorted(b, grid, side="right") / len(b)))
+        self.assertLessEqual(age["ks"], exact + 1e-9)
+        self.assertLess(exact - age["ks"], 0.02)
+        self.assertAlmostEqual(age["missing_rate_current"], new["age"].isna().mean())
+
+    def test_unseen_categories_are_pooled(self):
+        new = pd.DataFrame({"claim_type": ["IP", "OP", "DME", "SNF", "HH", "ER", "LAB"]})
+        state = drift.update(drift.empty_like(self.reference), new)
+        counts = state["features"]["claim_type"]["counts"]
+        self.assertEqual(len(counts), 6)  # IP/OP/RX, two unseen levels, and the pooled rest
+        self.assertEqual((counts["RX"], counts[drift.OTHER]), (0, 3))
+
+    def test_reference_levels_survive_many_unseen_levels(self):
+        unseen = pd.DataFrame({"claim_type": [f"NEW{i}" for i in range(10)]})
+        known = pd.DataFrame({"claim_type": ["IP"] * 30 + ["OP"] * 50 + ["RX"] * 20})
+        whole = drift.update(drift.update(drift.empty_like(self.reference), unseen), known)
+        parts = [drift.update(drift.empty_like(self.reference), unseen.iloc[i:i + 2]) for i in range(0, 10, 2)]
+        merged = drift.update(drift.empty_like(self.reference), known)
+        for part in parts:
+            merged = drift.merge(merged, part)
+
+        for state in (whole, merged):
+            counts = state["features"]["claim_type"]["counts"]
+            self.assertEqual([counts[k] for k in ("IP", "OP", "RX")], [30, 50, 20])
+            self.assertEqual(len(counts), 6)  # capped at max_categories + "__other__"
+            self.assertEqual(counts[drift.OTHER], 8)
+
+class TestMonitorDrift(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.output_dir = tempfile.mkdtemp()
+        cls.original_context = orchestrator._RUN_CONTEXT.copy()
+        cls.original_registry = orchestrator.CONFIG.get("registry")
+        cls.original_data = orchestrator.CONFIG.get("data")
+        orchestrator._RUN_CONTEXT = {"dir": cls.output_dir, "timestamp": "20250101_000000", "step": 0}
+        orchestrator.CONFIG["registry"] = {"dir": os.path.join(cls.output_dir, "registry"), "cache_size": 2}
+        orchestrator.CONFIG["data"] = {"id_columns": ["member_id"]}
+        registry.clear_cache()
+
+        train_path = os.path.join(cls.output_dir, "train.csv")
+        make_claims(5_000, seed=0).to_csv(train_path, index=False)
+        cls.model_path = mlops.train_model(train_path, "readmission_30d", "xgboost", {"n_estimators": 5, "max_depth": 2})
+
+    @classmethod
+    def tearDownClass(cls):
+        orchestrator._RUN_CONTEXT = cls.original_context
+        orchestrator.CONFIG["registry"] = cls.original_registry
+        orchestrator.CONFIG["data"] = cls.original_data
+        registry.clear_cache()
+        shutil.rmtree(cls.output_dir)
+
+    def _batch(self, name: str, df: pd.DataFrame) -> str:
+        path = os.path.join(self.output_dir, f"{name}.csv")
+        df.to_csv(path, index=False)
+        return path
+
+    def test_reference_is_linked_in_the_registry(self):
+        metadata = registry.get_model_metadata(self.model_path)
+        with open(metadata["drift_reference"]) as f:
+            reference = json.load(f)
+        self.assertEqual(reference["rows"], 5_000)
+        self.assertEqual(set(reference["features"]), {"age", "prior_admits", "claim_type"})
+
+    def test_same_distribution_is_stable(self):
+        result = mlops.monitor_drift(self.model_path, self._batch("stable", make_claims(20_000, seed=5)),
+                                     chunk_size=3_000, chart=False)
+        self.assertEqual((result["drifted"], result["warned"]), ([], []))
+        self.assertEqual(result["rows"], 20_000)
+
+    def test_shifted_claims_are_flagged_and_charted(self):
+        shifted = make_claims(20_000, seed=6, age_shift=8, inpatient_share=0.5).drop(columns=["prior_admits"])
+        result = mlops.monitor_drift(self.model_path, self._batch("shifted", shifted), chunk_size=3_000)
+
+        self.assertEqual(sorted(result["drifted"]), ["age", "claim_type"])
+        self.assertEqual(result["columns_missing"], ["prior_admits"])
+        self.assertTrue(os.path.exists(result["chart_file"]))
+        with open(result["report_file"]) as f:
+            report = json.load(f)
+        claim_type = next(r for r in report["features"] if r["feature"] == "claim_type")
+        self.assertEqual(claim_type["shifts"][0]["category"], "IP")
+        self.assertAlmostEqual(claim_type["shifts"][0]["delta"], 0.2, delta=0.03)
+
+if __name__ == '__main__':
+    unittest.main()
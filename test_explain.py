@@ -0,0 +1,149 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from unittest import mock
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from sklearn.ensemble import RandomForestClassifier
+import orchestrator
+import registry
+import mlops
+import vizops
+
+class TestExplainPredictions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.output_dir = tempfile.mkdtemp()
+        cls.original_context = orchestrator._RUN_CONTEXT.copy()
+        cls.original_registry = orchestrator.CONFIG.get("registry")
+        cls.original_data = orchestrator.CONFIG.get("data")
+        orchestrator._RUN_CONTEXT = {"dir": cls.output_dir, "timestamp": "20250101_000000", "step": 0}
+        orchestrator.CONFIG["registry"] = {"dir": os.path.join(cls.output_dir, "registry"), "cache_size": 4}
+        orchestrator.CONFIG["data"] = {"id_columns": ["member_id"]}
+        registry.clear_cache()
+
+        rng = np.random.default_rng(0)
+        n = 5_000
+        df = pd.DataFrame({
+            "member_id": [f"M{i}" for i in range(n)],
+            "prior_admits": rng.poisson(1, n),
+            "age": rng.integers(20, 90, n).astype(float),
+            "noise": rng.random(n),
+        })
+        df.loc[rng.random(n) < 0.1, "age"] = np.nan
+        logit = -2 + 1.2 * df["prior_admits"] + 0.02 * (df["age"].fillna(50) - 50)
+        df["readmission_30d"] = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int)
+        cls.data_path = os.path.join(cls.output_dir, "data.csv")
+        df.to_csv(cls.data_path, index=False)
+
+        cls.models = {
+            "xgboost": mlops.train_model(cls.data_path, "readmission_30d", "xgboost", {"n_estimators": 30, "max_depth": 3}),
+            "lightgbm": mlops.train_model(cls.data_path, "readmission_30d", "lightgbm",
+                                          {"n_estimators": 30, "max_depth": 3, "verbose": -1}),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        orchestrator._RUN_CONTEXT = cls.original_context
+        orchestrator.CONFIG["registry"] = cls.original_registry
+        orchestrator.CONFIG["data"] = cls.original_data
+        registry.clear_cache()
+        shutil.rmtree(cls.output_dir)
+
+    def test_contributions_add_up_to_the_scored_probabilities(self):
+        for algorithm, model_path in self.models.items():
+            with self.subTest(algorithm=algorithm):
+                scores_path = mlops.run_backtest(model_path, self.data_path)["scores_file"]
+                result = mlops.explain_predictions(model_path, self.data_path, scores_path=scores_path,
+                                                   chunk_size=1_500, n_threads=2)
+                reasons = pd.read_parquet(result["reasons_file"])
+
+                self.assertEqual(result["rows"], 5_000)
+                np.testing.assert_allclose(reasons["score"], reasons["y_prob"], atol=1e-5)
+                self.assertEqual(result["top_features"][0], "prior_admits")
+                self.assertEqual(result["top_features"][-1], "noise")
+
+    def test_outputs_are_float32_columnar_and_thread_independent(self):
+        model_path = self.models["xgboost"]
+        single = mlops.explain_predictions(model_path, self.data_path, chunk_size=10_000, n_threads=1)
+        threaded = mlops.explain_predictions(model_path, self.data_path, chunk_size=1_000, n_threads=4)
+
+        schema = pq.read_schema(single["values_file"])
+        self.assertEqual(schema.names, ["member_id", "prior_admits", "age", "noise", "base_value"])
+        self.assertTrue(all(str(schema.field(c).type) == "float" for c in schema.names[1:]))
+        pd.testing.assert_frame_equal(pd.read_parquet(single["values_file"]),
+                                      pd.read_parquet(threaded["values_file"]))
+
+        with open(threaded["summary_file"]) as f:
+            summary = json.load(f)
+        ranking = [g["mean_abs_shap"] for g in summary["global"]]
+        self.assertEqual(ranking, sorted(ranking, reverse=True))
+        age_bins = summary["dependence"]["age"]
+        self.assertEqual(sum(b["rows"] for b in age_bins), 5_000)
+        self.assertTrue(any(b["missing"] for b in age_bins))
+        self.assertTrue(vizops.plot_shap_summary(threaded["summary_file"]).endswith(".html"))
+
+    def test_slice_threads_are_set_on_a_private_booster(self):
+        model_path = self.models["xgboost"]
+        cached = registry.load_model(model_path).get_booster()
+        before = json.loads(cached.save_config())["learner"]["generic_param"]["nthread"]
+        with mock.patch.object(mlops, "_private_booster", wraps=mlops._private_booster) as private_booster:
+            mlops.explain_predictions(model_path, self.data_path, chunk_size=10_000, n_threads=4)
+
+        # 5,000 rows -> 4 slices of 1 thread, one booster copy shared by the slices
+        self.assertEqual(private_booster.call_count, 1)
+        self.assertEqual(private_booster.call_args.args[1], 1)
+        self.assertEqual(json.loads(cached.save_config())["learner"]["generic_param"]["nthread"], before)
+
+    def test_reason_codes_are_ordered_risk_increasing_features(self):
+        result = mlops.explain_predictions(self.models["lightgbm"], self.data_path, top_k=2)
+        reasons = pd.read_parquet(result["reasons_file"])
+        values = pd.read_parquet(result["values_file"])
+
+        self.assertTrue((reasons["reason_1_shap"].dropna() > 0).all())
+        both = reasons.dropna(subset=["reason_1_shap", "reason_2_shap"])
+        self.assertTrue((both["reason_1_shap"] >= both["reason_2_shap"]).all())
+        self.assertEqual(reasons["reason_2"].isna().sum(), reasons["reason_2_shap"].isna().sum())
+
+        row = reasons.dropna(subset=["reason_1"]).iloc[0]
+        member = values[values["member_id"] == row["member_id"]].iloc[0]
+        self.assertEqual(member[["prior_admits", "age", "noise"]].astype(float).idxmax(), row["reason_1"])
+
+    def test_scores_are_matched_by_member_not_position(self):
+        model_path = self.models["lightgbm"]
+        scores = pd.read_csv(mlops.run_backtest(model_path, self.data_path)["scores_file"])
+        shuffled = os.path.join(self.output_dir, "shuffled_scores.csv")
+        scores.sample(frac=1, random_state=0).to_csv(shuffled, index=False)
+        result = mlops.explain_predictions(model_path, self.data_path, scores_path=shuffled, chunk_size=1_500)
+        reasons = pd.read_parquet(result["reasons_file"])
+        np.testing.assert_allclose(reasons["score"], reasons["y_prob"], atol=1e-5)
+
+        filtered = os.path.join(self.output_dir, "filtered_scores.csv")
+        scores.iloc[1:].to_csv(filtered, index=False)
+        with self.assertRaises(ValueError):
+            mlops.explain_predictions(model_path, self.data_path, scores_path=filtered)
+        with self.assertRaises(ValueError):
+            mlops.explain_predictions(model_path, self.data_path, top_k=0)
+
+    def test_id_columns_used_as_features_keep_both_columns(self):
+        df = pd.read_csv(self.data_path)
+        df["member_id"] = df["member_id"].str[1:].astype(int)
+        numeric_ids = os.path.join(self.output_dir, "numeric_ids.csv")
+        df.to_csv(numeric_ids, index=False)
+        model_path = mlops.train_model(numeric_ids, "readmission_30d", "xgboost", {"n_estimators": 5, "max_depth": 2})
+        values = pd.read_parquet(mlops.explain_predictions(model_path, numeric_ids)["values_file"])
+        self.assertEqual(list(values.columns), ["member_id", "member_id_shap", "prior_admits", "age", "noise", "base_value"])
+        self.assertEqual(values["member_id"].tolist(), df["member_id"].astype(str).tolist())
+
+    def test_non_tree_models_are_rejected(self):
+        df = pd.read_csv(self.data_path).fillna(0)
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(
+            df[["prior_admits", "age", "noise"]], df["readmission_30d"])
+        with self.assertRaises(ValueError):
+            mlops.explain_predictions(orchestrator.save_model(model, "forest"), self.data_path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+import numpy as np
+import pandas as pd
+import orchestrator
+import governor
+import dataops
+
+RSS_MB = 200.0
+
+class TestMemoryGovernor(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.original_context = orchestrator._RUN_CONTEXT.copy()
+        self.original_memory = orchestrator.CONFIG.get("memory")
+        orchestrator._RUN_CONTEXT = {"dir": self.output_dir, "timestamp": "20250101_000000", "step": 0}
+
+        rng = np.random.default_rng(0)
+        n = 20_000
+        self.left_path = os.path.join(self.output_dir, "left.csv")
+        self.right_path = os.path.join(self.output_dir, "right.csv")
+        pd.DataFrame({
+            "k": rng.integers(0, 2_000, n),
+            "g": rng.choice(list("abcde"), n),
+            "v": rng.random(n),
+        }).to_csv(self.left_path, index=False)
+        pd.DataFrame({"k": np.arange(0, 2_500), "w": rng.random(2_500)}).to_csv(self.right_path, index=False)
+
+    def tearDown(self):
+        orchestrator._RUN_CONTEXT = self.original_context
+        if self.original_memory is None:
+            orchestrator.CONFIG.pop("memory", None)
+        else:
+            orchestrator.CONFIG["memory"] = self.original_memory
+        shutil.rmtree(self.output_dir)
+
+    def _run_with_budget(self, budget_mb, tool, *args, **kwargs):
+        orchestrator.CONFIG["memory"] = {"budget_mb": budget_mb}
+        # Pin RSS so the headroom (budget - RSS) does not move with the allocator
+        with mock.patch.object(governor, "current_rss_mb", return_value=RSS_MB):
+            return tool(*args, report=True, **kwargs)
+
+    def _assert_same_rows(self, a, b):
+        df_a, df_b = pd.read_csv(a), pd.read_csv(b)[list(pd.read_csv(a).columns)]
+        cols = list(df_a.columns)
+        pd.testing.assert_frame_equal(df_a.sort_values(cols).reset_index(drop=True),
+                                      df_b.sort_values(cols).reset_index(drop=True), check_dtype=False)
+
+    def test_estimate_tracks_in_memory_size(self):
+        estimate = governor.estimate_csv(self.left_path)
+        actual_mb = pd.read_csv(self.left_path).memory_usage(deep=True, index=False).sum() / 2**20
+        self.assertAlmostEqual(estimate["rows"], 20_000, delta=1_000)
+        self.assertAlmostEqual(estimate["mb"], actual_mb, delta=actual_mb * 0.1)
+
+    def test_over_budget_tools_fall_back_with_identical_results(self):
+        tight = RSS_MB + 0.5
+        cases = [
+            (dataops.join_datasets, (self.left_path, self.right_path, ["k"], "outer"), "partitioned_join"),
+            (dataops.aggregate_dataset, (self.left_path, ["g"], {"v": "mean", "k": "count"}), "chunked_aggregate"),
+            (dataops.aggregate_dataset, (self.left_path, ["g"], {"v": "median"}), "partitioned_aggregate"),
+            (dataops.create_derived_feature, (self.left_path, "v * 2", "v2"), "streamed"),
+            (dataops.bin_numeric_feature, (self.left_path, "v", 5), "streamed"),
+        ]
+        for tool, args, strategy in cases:
+            with self.subTest(tool=tool.__name__, strategy=strategy):
+                unbounded = self._run_with_budget(None, tool, *args)
+                governed = self._run_with_budget(tight, tool, *args)
+                self.assertEqual(unbounded["execution"]["strategy"], "in_memory")
+                self.assertEqual(governed["execution"]["strategy"], strategy)
+                self.assertIn("actual_peak_mb", governed["execution"])
+                self._assert_same_rows(unbounded["path"], governed["path"])
+
+        self.assertEqual([f for f in os.listdir(self.output_dir) if f.startswith(".spill_")], [])
+
+    def test_high_cardinality_aggregate_spills_instead_of_growing_partials(self):
+        args = (self.left_path, ["v"], {"k": "sum", "g": "count"})  # one group per row
+        unbounded = self._run_with_budget(None, dataops.aggregate_dataset, *args)
+        governed = self._run_with_budget(RSS_MB + 0.5, dataops.aggregate_dataset, *args)
+        self.assertEqual(governed["execution"]["strategy"], "partitioned_aggregate")
+        self._assert_same_rows(unbounded["path"], governed["path"])
+
+    def test_profile_is_sampled_over_budget(self):
+        orchestrator.CONFIG["memory"] = {"budget_mb": RSS_MB + 0.5}
+        with mock.patch.object(governor, "current_rss_mb", return_value=RSS_MB):
+            profile = dataops.profile_dataset(self.left_path)
+        orchestrator.CONFIG["memory"] = {"budget_mb": None}
+        exact = dataops.profile_dataset(self.left_path)
+
+        self.assertEqual(profile["execution"]["strategy"], "sampled")
+        self.assertEqual(profile["rows"], exact["rows"])
+        self.assertEqual(profile["null_counts"], exact["null_counts"])
+        self.assertAlmostEqual(profile["numeric_stats"]["v"]["mean"], exact["numeric_stats"]["v"]["mean"])
+        self.assertAlmostEqual(profile["numeric_stats"]["v"]["std"], exact["numeric_stats"]["v"]["std"])
+
+if __name__ == '__main__':
+    unittest.main()
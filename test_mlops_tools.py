@@ -1,6 +1,9 @@
+import json
 import pandas as pd
+import numpy as np
 import os
-from mlops import split_data_time_series, train_model, run_backtest, optimize_hyperparameters
+from mlops import split_data_time_series, train_model, run_backtest, optimize_hyperparameters, score_population
+from registry import load_model
 from rich.console import Console
 
 console = Console()
@@ -57,6 +60,23 @@ def test_mlops():
     best_params = optimize_hyperparameters(splits['train'], "target", n_trials=2)
     console.print(f"Best Params: {best_params}")
     
+    # 5. Score Population
+    console.print("\n[bold]Step 5: Scoring Population...[/bold]")
+    cached_booster = load_model(model_path).get_booster()
+    nthread_before = json.loads(cached_booster.save_config())["learner"]["generic_param"]["nthread"]
+    scoring = score_population(model_path, dummy_path, id_cols=["date"], chunk_size=30, n_threads=1)
+    console.print(f"Scores: {scoring['destination']} ({scoring['rows_per_sec']:,.0f} rows/sec)")
+    scores = pd.read_parquet(scoring['destination'])
+    dummy = pd.read_csv(dummy_path)
+    expected = load_model(model_path).predict_proba(dummy[["feature1", "feature2"]])[:, 1]
+    assert scoring['rows'] == 100 and len(scores) == 100
+    assert list(scores['date']) == list(dummy['date'].astype(str))
+    np.testing.assert_allclose(scores['score'], expected, rtol=1e-6)
+    assert (scores['model_hash'] == scoring['model_hash']).all()
+    # Scoring uses a private booster copy; the registry-cached model keeps its settings
+    assert json.loads(cached_booster.save_config())["learner"]["generic_param"]["nthread"] == nthread_before
+    console.print("[green]✓ Population scored[/green]")
+    
     # Cleanup
     if os.path.exists("dummy_data.csv"):
         os.remove("dummy_data.csv")
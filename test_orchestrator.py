@@ -0,0 +1,187 @@
+import unittest
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import pandas as pd
+import orchestrator
+import blobstore
+
+def _save_frames(n):
+    """Worker for the process pool: saves n small frames into the inherited run directory."""
+    return [
+        orchestrator.save_dataframe_to_csv(pd.DataFrame({"i": [i]}), "worker", subdir="dataops")
+        for i in range(n)
+    ]
+
+def _use_blob_store(settings):
+    """Initializer for the plain process pool: only the run directory comes from the environment."""
+    blobstore.configure(**settings)
+
+def _add(a, b):
+    return a + b
+
+def _fail():
+    raise RuntimeError("boom")
+
+class TestArtifactWriter(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.run_dir = os.path.join(self.output_dir, "20250101_000000")
+
+        self.original_context = orchestrator._RUN_CONTEXT.copy()
+        self.original_env = os.environ.get(orchestrator.RUN_DIR_ENV)
+        orchestrator._RUN_CONTEXT = {"dir": None, "timestamp": None, "step": 0}
+        os.environ[orchestrator.RUN_DIR_ENV] = self.run_dir
+
+    def tearDown(self):
+        orchestrator._RUN_CONTEXT = self.original_context
+        if self.original_env is None:
+            os.environ.pop(orchestrator.RUN_DIR_ENV, None)
+        else:
+            os.environ[orchestrator.RUN_DIR_ENV] = self.original_env
+        shutil.rmtree(self.output_dir)
+
+    def _steps(self, paths):
+        return [int(re.match(r"^(\d+)_", os.path.basename(p)).group(1)) for p in paths]
+
+    def test_threads_get_unique_steps(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            paths = list(pool.map(
+                lambda i: orchestrator.save_dataframe_to_csv(pd.DataFrame({"i": [i]}), "query_result"),
+                range(80)
+            ))
+        self.assertEqual(sorted(self._steps(paths)), list(range(1, 81)))
+        for i, path in enumerate(paths):
+            self.assertEqual(pd.read_csv(path)["i"].tolist(), [i])
+        leftovers = [f for f in os.listdir(os.path.join(self.run_dir, "dataops")) if ".tmp." in f]
+        self.assertEqual(leftovers, [])
+
+    def test_processes_share_run_dir_and_step_counter(self):
+        orchestrator.save_dataframe_to_csv(pd.DataFrame({"i": [0]}), "parent")
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=3, mp_context=ctx, initializer=_use_blob_store,
+                                 initargs=(blobstore.settings(),)) as pool:
+            paths = [p for batch in pool.map(_save_frames, [5, 5, 5]) for p in batch]
+
+        self.assertTrue(all(os.path.dirname(os.path.dirname(p)) == self.run_dir for p in paths))
+        self.assertEqual(sorted(self._steps(paths)), list(range(2, 17)))
+
+    def test_run_dir_reaches_pool_workers_without_touching_the_environment(self):
+        os.environ.pop(orchestrator.RUN_DIR_ENV)
+        orchestrator._RUN_CONTEXT = {"dir": self.run_dir, "timestamp": "20250101_000000", "step": 0}
+        with orchestrator.process_pool(2) as pool:
+            paths = [p for batch in pool.map(_save_frames, [2, 2]) for p in batch]
+
+        self.assertTrue(all(os.path.dirname(os.path.dirname(p)) == self.run_dir for p in paths))
+        self.assertNotIn(orchestrator.RUN_DIR_ENV, os.environ)
+
+    def test_hash_while_writing_matches_file_content(self):
+        df = pd.DataFrame({"a": range(50_000), "b": ["x"] * 50_000})
+        paths = [
+            orchestrator.save_dataframe_to_csv(df, "big"),
+            orchestrator.save_metrics({"auc": 0.7}, "metrics"),
+            orchestrator.save_model({"weights": list(range(10))}, "model"),
+        ]
+        for path in paths:
+            self.assertEqual(orchestrator.parse_artifact_hash(path), orchestrator.calculate_file_hash(path))
+        self.assertEqual(len(pd.read_csv(paths[0])), 50_000)
+
+    def test_background_writes_and_barrier(self):
+        output_config = orchestrator.CONFIG.setdefault("output", {})
+        original = dict(output_config)
+        output_config.update(background_writes=True, max_pending_writes=2)
+        try:
+            futures = [
+                orchestrator.submit_artifact(orchestrator.save_metrics, {"i": i}, "metrics", subdir="mlops")
+                for i in range(6)
+            ]
+            paths = orchestrator.wait_for_artifacts()
+        finally:
+            output_config.clear()
+            output_config.update(original)
+
+        self.assertEqual(paths, [f.result() for f in futures])
+        self.assertEqual(sorted(self._steps(paths)), list(range(1, 7)))
+        self.assertTrue(all(os.path.exists(p) for p in paths))
+
+    def test_concurrent_tool_calls_wait_only_for_their_own_artifacts(self):
+        output_config = orchestrator.CONFIG.setdefault("output", {})
+        original = dict(output_config)
+        output_config.update(background_writes=True, max_pending_writes=2)
+        gate, submitted, a_finished = threading.Event(), threading.Event(), threading.Event()
+
+        def slow_save():
+            gate.wait(timeout=10)
+            return orchestrator.save_metrics({"slow": True}, "slow")
+
+        def tool_b():
+            artifact = orchestrator.submit_artifact(slow_save)
+            submitted.set()
+            a_finished.wait(timeout=10)
+            return artifact
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                b = pool.submit(orchestrator._call_tool, tool_b, [], {})
+                submitted.wait(timeout=10)
+                a = pool.submit(orchestrator._call_tool, _add, [1, 2], {})
+                # A has nothing queued: it must not wait on (or take) B's pending artifact
+                self.assertEqual(a.result(timeout=2), 3)
+                a_finished.set()
+                time.sleep(0.1)
+                self.assertFalse(b.done())
+                gate.set()
+                # B returns only once its own artifact is on disk
+                artifact = b.result(timeout=10)
+                self.assertTrue(artifact.done() and os.path.exists(artifact.result()))
+        finally:
+            gate.set()
+            output_config.clear()
+            output_config.update(original)
+
+    def test_tool_graph_resolves_refs_and_runs_in_dependency_order(self):
+        nodes = [
+            {"id": "frames", "tool": "test_orchestrator._save_frames", "args": [2], "kind": "cpu"},
+            {"id": "a", "tool": _add, "args": [1, 2]},
+            {"id": "b", "tool": _add, "args": [{"$ref": "a"}, 10]},
+            {"id": "c", "tool": _add, "args": [{"$ref": "a"}, 100]},
+            {"id": "d", "tool": _add, "kwargs": {"a": {"$ref": "b"}, "b": {"$ref": "c"}}},
+        ]
+        report = orchestrator.run_tool_graph(nodes)
+
+        self.assertEqual(report["results"]["d"], 116)
+        self.assertEqual(list(report["results"])[-1], "d")
+        self.assertTrue(all(s == "done" for s in report["status"].values()))
+        # The critical path ends at the last node to finish and follows dependencies back
+        path = report["critical_path"]
+        self.assertEqual(path[-1], max(report["timings"], key=lambda n: report["timings"][n]["end"]))
+        self.assertIn(path, (["frames"], ["a", "b", "d"], ["a", "c", "d"]))
+        # The process-pool node wrote into this run's directory
+        self.assertEqual(sorted(self._steps(report["results"]["frames"])), [1, 2])
+
+    def test_tool_graph_skips_dependents_of_failed_nodes(self):
+        nodes = [
+            {"id": "bad", "tool": _fail},
+            {"id": "after_bad", "tool": _add, "args": [1, 1], "depends_on": ["bad"]},
+            {"id": "ok", "tool": _add, "args": [2, 2], "memory_mb": 10},
+        ]
+        report = orchestrator.run_tool_graph(nodes, memory_budget_mb=5)
+
+        self.assertTrue(report["status"]["bad"].startswith("failed"))
+        self.assertEqual(report["status"]["after_bad"], "skipped")
+        self.assertEqual(report["results"], {"ok": 4})
+
+    def test_tool_graph_rejects_cycles(self):
+        nodes = [
+            {"id": "x", "tool": _add, "args": [{"$ref": "y"}, 1]},
+            {"id": "y", "tool": _add, "args": [{"$ref": "x"}, 1]},
+        ]
+        with self.assertRaises(ValueError):
+            orchestrator.run_tool_graph(nodes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+import lightgbm as lgb
+import orchestrator
+import registry
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.output_dir, "mlops"))
+
+        self.original_context = orchestrator._RUN_CONTEXT.copy()
+        orchestrator._RUN_CONTEXT = {
+            "dir": self.output_dir,
+            "timestamp": "20250101_000000",
+            "step": 0
+        }
+        self.original_registry = orchestrator.CONFIG.get("registry")
+        orchestrator.CONFIG["registry"] = {"dir": os.path.join(self.output_dir, "registry"), "cache_size": 2}
+        registry.clear_cache()
+
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame({"feature1": rng.random(100), "feature2": rng.random(100)})
+        self.y = (self.X["feature1"] > 0.5).astype(int)
+        self.train_path = os.path.join(self.output_dir, "train.csv")
+        self.X.assign(target=self.y).to_csv(self.train_path, index=False)
+
+    def tearDown(self):
+        orchestrator._RUN_CONTEXT = self.original_context
+        if self.original_registry is None:
+            orchestrator.CONFIG.pop("registry", None)
+        else:
+            orchestrator.CONFIG["registry"] = self.original_registry
+        registry.clear_cache()
+        shutil.rmtree(self.output_dir)
+
+    def _save(self, model, algorithm):
+        path = orchestrator.save_model(model, f"{algorithm}_model")
+        meta = registry.build_metadata(model, self.X, self.train_path, algorithm, {}, "target")
+        registry.register_model(model, path, meta)
+        return path
+
+    def test_xgboost_native_roundtrip(self):
+        model = xgb.XGBClassifier(n_estimators=5, max_depth=2).fit(self.X, self.y)
+        path = self._save(model, "xgboost")
+        model_hash = orchestrator.parse_artifact_hash(path)
+
+        meta = registry.get_model_metadata(path)
+        self.assertEqual(meta["native_format"], "model.ubj")
+        self.assertEqual(meta["feature_names"], ["feature1", "feature2"])
+        self.assertEqual(meta["dtypes"], {"feature1": "float64", "feature2": "float64"})
+
+        # Cold load goes through the native format
+        registry.clear_cache()
+        loaded = registry.load_model(path)
+        np.testing.assert_allclose(loaded.predict_proba(self.X), model.predict_proba(self.X), rtol=1e-6)
+
+        # Repeats (by path or by hash) are served from memory
+        self.assertIs(registry.load_model(path), loaded)
+        self.assertIs(registry.load_model(model_hash), loaded)
+        self.assertEqual(registry.cache_info()["hits"], 2)
+
+    def test_lightgbm_and_lru_eviction(self):
+        paths = [
+            self._save(lgb.LGBMClassifier(n_estimators=n, verbose=-1).fit(self.X, self.y), "lightgbm")
+            for n in (3, 4, 5)
+        ]
+        self.assertTrue(os.path.exists(os.path.join(
+            self.output_dir, "registry", orchestrator.parse_artifact_hash(paths[0]), "model.txt")))
+        self.assertEqual(registry.cache_info()["size"], 2)
+
+        registry.load_model(paths[0])
+        self.assertEqual(registry.cache_info()["misses"], 1)
+        registry.load_model(paths[0])
+        self.assertEqual(registry.cache_info()["hits"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score, f1_score
+import reviewer
+import orchestrator
+
+class TestReviewerTools(unittest.TestCase):
+    def setUp(self):
+        self.input_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+
+        self.original_context = orchestrator._RUN_CONTEXT.copy()
+        orchestrator._RUN_CONTEXT = {
+            "dir": self.output_dir,
+            "timestamp": "TEST",
+            "step": 0
+        }
+        os.makedirs(os.path.join(self.output_dir, "reviewer"), exist_ok=True)
+
+        rng = np.random.default_rng(0)
+        n = 2000
+        self.y_true = rng.integers(0, 2, n)
+        # Rounded scores so ties are exercised
+        self.prob_a = np.round(np.clip(0.3 * self.y_true + rng.random(n) * 0.7, 0, 1), 2)
+        self.prob_b = np.round(np.clip(0.5 * self.y_true + rng.random(n) * 0.5, 0, 1), 2)
+
+        self.path_a = os.path.join(self.input_dir, "scored_a.csv")
+        self.path_b = os.path.join(self.input_dir, "scored_b.csv")
+        pd.DataFrame({"member_id": range(n), "y_true": self.y_true, "y_prob": self.prob_a}).to_csv(self.path_a, index=False)
+        pd.DataFrame({"member_id": range(n), "y_true": self.y_true, "y_prob": self.prob_b}).to_csv(self.path_b, index=False)
+
+    def tearDown(self):
+        orchestrator._RUN_CONTEXT = self.original_context
+        shutil.rmtree(self.input_dir)
+        shutil.rmtree(self.output_dir)
+
+    def test_weighted_auc_matches_sklearn(self):
+        prep = reviewer._prepare_auc(self.y_true.astype(bool), self.prob_a)
+        rng = np.random.default_rng(1)
+        W = rng.poisson(1.0, size=(3, len(self.y_true))).astype(np.float64)
+        aucs = reviewer._weighted_auc(W, prep)
+        for row, auc in zip(W, aucs):
+            expected = roc_auc_score(self.y_true, self.prob_a, sample_weight=row)
+            self.assertAlmostEqual(auc, expected, places=10)
+
+    def test_bootstrap_metrics(self):
+        result = reviewer.bootstrap_metrics(self.path_a, n_resamples=200, max_chunk_mb=1)
+        auc = result["metrics"]["auc"]
+        self.assertAlmostEqual(auc["estimate"], roc_auc_score(self.y_true, self.prob_a), places=10)
+        self.assertAlmostEqual(result["metrics"]["f1"]["estimate"], f1_score(self.y_true, self.prob_a >= 0.5), places=10)
+        self.assertLess(auc["ci"][0], auc["estimate"])
+        self.assertGreater(auc["ci"][1], auc["estimate"])
+        self.assertTrue(os.path.exists(result["results_file"]))
+
+    def test_bootstrap_is_independent_of_n_jobs(self):
+        a = reviewer.bootstrap_metrics(self.path_a, n_resamples=100, n_jobs=1, max_chunk_mb=1)
+        b = reviewer.bootstrap_metrics(self.path_a, n_resamples=100, n_jobs=4, max_chunk_mb=1)
+        self.assertEqual(a["metrics"], b["metrics"])
+
+    def test_compare_models(self):
+        result = reviewer.compare_models(self.path_a, self.path_b, n_resamples=200)
+        auc = result["metrics"]["auc"]
+        self.assertGreater(auc["difference"], 0)
+        self.assertLess(auc["p_value"], 0.05)
+
+        same = reviewer.compare_models(self.path_a, self.path_a, n_resamples=50)
+        self.assertEqual(same["metrics"]["auc"]["p_value"], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import shutil
+import tempfile
+import pandas as pd
+import orchestrator
+import synthetic
+import sampling
+import dataops
+
+class TestSampling(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.output_dir = tempfile.mkdtemp()
+        cls.original_context = orchestrator._RUN_CONTEXT.copy()
+        cls.original_database = orchestrator.CONFIG.get("database")
+        orchestrator._RUN_CONTEXT = {"dir": cls.output_dir, "timestamp": "20250101_000000", "step": 0}
+        orchestrator.CONFIG["database"] = {"type": "sqlite", "path": os.path.join(cls.output_dir, "warehouse.sqlite")}
+        synthetic.load_synthetic_warehouse(dataops.get_db_engine(), 20_000, seed=3, chunk_size=10_000)
+        cls.claims = pd.read_csv(dataops.execute_sql("SELECT member_id, claim_type, paid_amount FROM fct_claim"))
+
+    @classmethod
+    def tearDownClass(cls):
+        orchestrator._RUN_CONTEXT = cls.original_context
+        orchestrator.CONFIG["database"] = cls.original_database
+        shutil.rmtree(cls.output_dir)
+
+    def test_tablesample_rewrite_keeps_aliases(self):
+        query = "SELECT c.paid_amount FROM dw.fct_claim c JOIN dim_member m ON c.member_id = m.member_id"
+        rewritten, fraction = sampling.rewrite(query, 0.05, "bernoulli", seed=7)
+        self.assertIn("FROM dw.fct_claim c TABLESAMPLE BERNOULLI (5.0) REPEATABLE (7) JOIN", rewritten)
+        self.assertEqual(fraction, 0.05)
+        with self.assertRaises(ValueError):
+            sampling.rewrite("SELECT * FROM dim_member", 0.05)
+        with self.assertRaises(ValueError):
+            sampling.rewrite(query, 0.05, "system", dialect="sqlite")
+
+    def test_member_sample_is_nested_and_keeps_histories_whole(self):
+        query = "SELECT c.member_id, c.claim_type, c.paid_amount FROM fct_claim c"
+        small = pd.read_csv(dataops.sample_sql(query, fraction=0.1)["path"])
+        large = pd.read_csv(dataops.sample_sql(query, fraction=0.3)["path"])
+
+        self.assertTrue(set(small["member_id"]) <= set(large["member_id"]))
+        full_counts = self.claims["member_id"].value_counts()
+        sampled_counts = large["member_id"].value_counts()
+        self.assertTrue((sampled_counts == full_counts[sampled_counts.index]).all())
+
+    def test_member_sample_keeps_schema_qualified_columns_usable(self):
+        query = "SELECT dw.fct_claim.paid_amount FROM dw.fct_claim WHERE dw.fct_claim.claim_type = 'IP'"
+        rewritten, _ = sampling.rewrite(query, 0.1)
+        self.assertTrue(rewritten.startswith("SELECT fct_claim.paid_amount FROM (SELECT * FROM dw.fct_claim WHERE "))
+        self.assertTrue(rewritten.endswith(") fct_claim WHERE fct_claim.claim_type = 'IP'"))
+
+        qualified = "SELECT main.fct_claim.member_id, main.fct_claim.paid_amount FROM main.fct_claim"
+        aliased = "SELECT c.member_id, c.paid_amount FROM fct_claim c"
+        pd.testing.assert_frame_equal(pd.read_csv(dataops.sample_sql(qualified, fraction=0.2)["path"]),
+                                      pd.read_csv(dataops.sample_sql(aliased, fraction=0.2)["path"]))
+
+    def test_estimates_cover_truth_and_scale_aggregates(self):
+        query = "SELECT member_id, claim_type, paid_amount FROM fct_claim"
+        result = dataops.sample_sql(query, fraction=0.25, aggregates={"*": "count", "paid_amount": ["sum", "mean"]})
+        estimates = {(e["column"], e["agg"]): e for e in result["estimates"]}
+        self.assertEqual(result["cluster"], "member_id")
+        self.assertAlmostEqual(result["scale_factor"], 4.0)
+
+        truth = {("*", "count"): len(self.claims), ("paid_amount", "sum"): self.claims["paid_amount"].sum(),
+                 ("paid_amount", "mean"): self.claims["paid_amount"].mean()}
+        for cell, value in truth.items():
+            # 95% intervals; a 3x margin keeps this deterministic sample well inside
+            half_width = (estimates[cell]["ci_high"] - estimates[cell]["ci_low"]) / 2
+            self.assertLess(abs(estimates[cell]["estimate"] - value), 3 * half_width)
+
+        grouped = dataops.sample_sql("SELECT claim_type, COUNT(*) AS n FROM fct_claim GROUP BY claim_type",
+                                     fraction=0.25, scale_columns=["n"])
+        scaled_total = pd.read_csv(grouped["path"])["n"].sum()
+        self.assertAlmostEqual(scaled_total / len(self.claims), 1.0, delta=0.15)
+
+    def test_refinement_grows_fraction_until_target(self):
+        result = dataops.sample_sql("SELECT member_id, paid_amount FROM fct_claim", fraction=0.01,
+                                    aggregates={"paid_amount": "mean"}, target_relative_ci=0.05)
+        fractions = [h["fraction"] for h in result["history"]]
+        self.assertEqual(fractions, sorted(fractions))
+        self.assertTrue(result["history"][-1]["max_relative_ci"] <= 0.05 or fractions[-1] == 1.0)
+        self.assertGreater(len(fractions), 1)
+
+if __name__ == '__main__':
+    unittest.main()
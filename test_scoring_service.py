@@ -0,0 +1,76 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import joblib
+import xgboost as xgb
+from scoring_service import ScoringService, create_server
+
+class TestScoringService(unittest.TestCase):
+    def setUp(self):
+        self.input_dir = tempfile.mkdtemp()
+
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame({"feature1": rng.random(200), "feature2": rng.random(200)})
+        y = (self.X["feature1"] > 0.5).astype(int)
+
+        self.model = xgb.XGBClassifier(n_estimators=10, max_depth=2).fit(self.X, y)
+        self.model_path = os.path.join(self.input_dir, "model_a.joblib")
+        joblib.dump(self.model, self.model_path)
+
+        other = xgb.XGBClassifier(n_estimators=5, max_depth=1).fit(self.X, 1 - y)
+        self.other_path = os.path.join(self.input_dir, "model_b.joblib")
+        joblib.dump(other, self.other_path)
+
+        self.service = ScoringService(self.model_path, max_batch_size=64, max_wait_ms=20)
+        self.service.start()
+        self.server = create_server(self.service, port=0)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.stop()
+        shutil.rmtree(self.input_dir)
+
+    def _post(self, path, payload):
+        request = urllib.request.Request(f"{self.url}{path}", data=json.dumps(payload).encode())
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def _get(self, path):
+        with urllib.request.urlopen(f"{self.url}{path}") as response:
+            return json.loads(response.read())
+
+    def test_concurrent_requests_are_batched(self):
+        rows = self.X.to_dict(orient="records")
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda r: self._post("/score", r), rows))
+
+        expected = self.model.predict_proba(self.X)[:, 1]
+        np.testing.assert_allclose([r["score"] for r in results], expected, rtol=1e-6)
+
+        metrics = self._get("/metrics")
+        self.assertEqual(metrics["requests"], len(rows))
+        self.assertLess(metrics["batches"], len(rows))
+        self.assertIsNotNone(metrics["p99_ms"])
+
+    def test_hot_swap_by_content_hash(self):
+        before = self._get("/health")["model_hash"]
+        self.assertFalse(self._post("/model", {"model_path": self.model_path})["swapped"])
+
+        swapped = self._post("/model", {"model_path": self.other_path})
+        self.assertTrue(swapped["swapped"])
+        self.assertNotEqual(swapped["model_hash"], before)
+        self.assertEqual(self._post("/score", {"feature1": 0.9, "feature2": 0.1})["model_hash"], swapped["model_hash"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOL_MODULES = ["dataops", "mlops", "vizops", "reviewer", "registry", "governor", "async_tools"]
+# Frameworks that must load on first use, not when a tool module is imported
+HEAVY_MODULES = ["xgboost", "lightgbm", "optuna", "sklearn", "altair", "sqlalchemy", "joblib", "yaml", "pyarrow.parquet"]
+# Cold-start budget for importing every tool module (pandas included); override on slow machines
+IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 2000))
+
+def _import_in_subprocess(code: str, cwd: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    env.pop("CLASSIFIER_RUN_DIR", None)
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=env,
+                          capture_output=True, text=True, timeout=60)
+
+def _cumulative_us(importtime_log: str) -> dict:
+    """Cumulative microseconds per top-level import from `-X importtime` output."""
+    times = {}
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  ") and cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        for name in ["config.yaml", "dataops.yaml"]:
+            shutil.copy(os.path.join(REPO_DIR, name), self.work_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_tool_modules_import_within_budget(self):
+        code = (f"import sys; import {', '.join(TOOL_MODULES)}; "
+                f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+        _import_in_subprocess(code, self.work_dir)  # warm the config cache and bytecode
+        result = _import_in_subprocess(code, self.work_dir)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+        self.assertEqual(result.stdout.strip(), "", "heavy frameworks imported eagerly")
+        total_ms = sum(_cumulative_us(result.stderr).values()) / 1000
+        self.assertLess(total_ms, IMPORT_BUDGET_MS)
+
+    def test_import_does_not_create_run_directory(self):
+        result = _import_in_subprocess(f"import {', '.join(TOOL_MODULES)}", self.work_dir)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertFalse(os.path.exists(os.path.join(self.work_dir, "output")))
+
+    def test_config_cache_matches_yaml_and_tracks_edits(self):
+        code = "import orchestrator; print(orchestrator.CONFIG['output']['root_dir'])"
+        self.assertEqual(_import_in_subprocess(code, self.work_dir).stdout.strip(), "output")
+        self.assertTrue(os.path.exists(os.path.join(self.work_dir, "__pycache__", "config_cache.json")))
+
+        with open(os.path.join(self.work_dir, "config.yaml"), "a") as f:
+            f.write("\noutput:\n  root_dir: \"elsewhere\"\n")
+        self.assertEqual(_import_in_subprocess(code, self.work_dir).stdout.strip(), "elsewhere")
+
+    def test_config_that_json_cannot_hold_is_not_cached(self):
+        with open(os.path.join(self.work_dir, "config.yaml"), "a") as f:
+            f.write("\nretry_codes:\n  500: \"server\"\n")
+        code = "import orchestrator; print(orchestrator.CONFIG['retry_codes'])"
+        cold, warm = (_import_in_subprocess(code, self.work_dir).stdout.strip() for _ in range(2))
+        self.assertEqual(cold, "{500: 'server'}")
+        self.assertEqual(warm, cold)
+        self.assertFalse(os.path.exists(os.path.join(self.work_dir, "__pycache__", "config_cache.json")))
+
+if __name__ == "__main__":
+    unittest.main()
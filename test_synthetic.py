@@ -0,0 +1,51 @@
+import unittest
+import os
+import re
+import shutil
+import tempfile
+import pandas as pd
+import orchestrator
+import synthetic
+import dataops
+
+def fct_claim_model_columns() -> list:
+    """The column list selected by the dbt model fct_claim.sql."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "fct_claim.sql")) as f:
+        return re.findall(r"^\s*c\.(\w+),?\s*$", f.read(), flags=re.MULTILINE)
+
+class TestSynthetic(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.original_context = orchestrator._RUN_CONTEXT.copy()
+        self.original_database = orchestrator.CONFIG.get("database")
+        orchestrator._RUN_CONTEXT = {"dir": self.output_dir, "timestamp": "20250101_000000", "step": 0}
+        orchestrator.CONFIG["database"] = {"type": "sqlite", "path": os.path.join(self.output_dir, "warehouse.sqlite")}
+
+    def tearDown(self):
+        orchestrator._RUN_CONTEXT = self.original_context
+        orchestrator.CONFIG["database"] = self.original_database
+        shutil.rmtree(self.output_dir)
+
+    def test_claims_are_seeded_and_match_fct_claim(self):
+        first = pd.concat(synthetic.iter_claims(20_000, seed=7, chunk_size=5_000))
+        second = pd.concat(synthetic.iter_claims(20_000, seed=7, chunk_size=5_000))
+
+        self.assertEqual(list(first.columns), fct_claim_model_columns())
+        self.assertEqual(len(first), 20_000)
+        self.assertTrue(first.equals(second))
+        self.assertTrue(first["claim_id"].is_unique)
+
+        stays = synthetic.label_readmissions(first)
+        self.assertTrue(0.05 < stays["readmission_30d"].mean() < 0.4)
+
+    def test_warehouse_loads_into_embedded_stand_in(self):
+        counts = synthetic.load_synthetic_warehouse(dataops.get_db_engine(), 6_000, seed=1, chunk_size=2_000)
+        self.assertEqual(counts["fct_claim"], 6_000)
+
+        self.assertIn("ms_drg", dataops.get_table_schema("fct_claim"))
+        star = pd.read_csv(dataops.execute_sql("SELECT * FROM star_claims"))
+        self.assertEqual(len(star), 6_000)
+        self.assertIn("metal_tier", star.columns)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import orchestrator
+import tracing
+import dataops
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.original_context = orchestrator._RUN_CONTEXT.copy()
+        orchestrator._RUN_CONTEXT = {"dir": self.output_dir, "timestamp": "20250101_000000", "step": 0}
+        self.csv_path = os.path.join(self.output_dir, "input.csv")
+        pd.DataFrame({"g": [1, 1, 2], "v": [1.0, 2.0, 3.0]}).to_csv(self.csv_path, index=False)
+        self.was_enabled = tracing.is_enabled()
+        tracing.clear()
+
+    def tearDown(self):
+        tracing.set_enabled(self.was_enabled)
+        tracing.clear()
+        orchestrator._RUN_CONTEXT = self.original_context
+        shutil.rmtree(self.output_dir)
+
+    def test_off_mode_records_nothing(self):
+        tracing.set_enabled(False)
+        dataops.aggregate_dataset(self.csv_path, ["g"], {"v": "sum"})
+        self.assertEqual(tracing.events(), [])
+        self.assertIs(tracing.span("anything"), tracing.current_span())
+
+    def test_tool_spans_nest_and_write_trace(self):
+        tracing.set_enabled(True)
+        path = dataops.aggregate_dataset(self.csv_path, ["g"], {"v": "sum"})
+
+        spans = {e["name"]: e for e in tracing.events()}
+        tool, save = spans["aggregate_dataset"], spans["save_dataframe_to_csv"]
+        self.assertEqual(save["args"]["parent_id"], tool["args"]["span_id"])
+        self.assertEqual(tool["args"]["rows_in"], 3)
+        self.assertEqual(tool["args"]["bytes_read"], os.path.getsize(self.csv_path))
+        self.assertEqual(save["args"]["rows_out"], 2)
+        # A repeat of identical content is linked from the blob store instead of written
+        self.assertEqual(save["args"]["bytes_written"] + save["args"]["bytes_deduplicated"],
+                         os.path.getsize(path))
+
+        paths = tracing.write_trace(self.output_dir)
+        with open(paths["trace"]) as f:
+            trace = json.load(f)
+        self.assertEqual({e["ph"] for e in trace["traceEvents"]}, {"X"})
+        with open(paths["summary"]) as f:
+            self.assertIn("aggregate_dataset", f.read())
+
+    def test_rss_delta_is_measured_within_each_span(self):
+        tracing.set_enabled(True)
+        # An earlier, larger peak must not hide later spans' growth (ru_maxrss would)
+        big = np.ones(80 * 2**20 // 8)
+        del big
+        with tracing.span("outer"):
+            held = np.ones(40 * 2**20 // 8)
+            with tracing.span("inner"):
+                time.sleep(0.05)
+            del held
+
+        spans = {e["name"]: e["args"]["peak_rss_delta_mb"] for e in tracing.events()}
+        self.assertGreater(spans["outer"], 30)
+        self.assertLess(spans["inner"], 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,302 @@
+"""Per-tool performance tracing.
+
+Every tool and `orchestrator.save_*` call opens a span that records wall and CPU time,
+the peak RSS above the RSS at span start (sampled while the span is open), and counters
+the tool reports (rows in/out, bytes read/written, cache hits, DB vs client time).
+Spans nest through a context variable, so work done inside a tool (saves, queries,
+model loads) appears beneath it, and spans from thread or process pools are linked to
+the span that scheduled them.
+
+When a run ends, `write_trace` writes into `output/<timestamp>/`:
+- `trace.json`: Chrome trace events (open in chrome://tracing or ui.perfetto.dev).
+- `trace_summary.md`: per-span-name totals.
+
+Tracing is off unless `tracing.enabled` is set in config.yaml (or CLASSIFIER_TRACE=1);
+when off, `@traced` costs one flag check and `span()` returns a shared no-op object.
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage or /proc, RSS deltas are not recorded
+    resource = None
+
+# Child processes (process pools) inherit the parent's tracing switch
+TRACE_ENV = "CLASSIFIER_TRACE"
+
+_ENABLED = os.environ.get(TRACE_ENV) == "1"
+_EVENTS = []
+_EVENTS_LOCK = threading.Lock()
+_CURRENT = contextvars.ContextVar("trace_span", default=None)
+_IDS = iter(range(1, 1 << 62))
+
+# Counters summed per span name in the summary table
+COUNTERS = ["rows_in", "rows_out", "bytes_read", "bytes_written", "bytes_deduplicated", "cache_hits", "cache_misses", "db_ms", "client_ms"]
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# RSS sampling period while any span (or benchmark step) is open
+RSS_SAMPLE_INTERVAL = 0.01
+
+def current_rss_mb() -> float:
+    """Resident set size of this process right now (falls back to the lifetime peak)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 2**20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else 0.0
+
+class RssWatch:
+    """
+    Peak RSS above the RSS at creation, until `stop`. One shared background thread
+    samples the current RSS for every open watch, so nested and concurrent spans each
+    see the peak within their own lifetime (ru_maxrss is the lifetime peak and would
+    report 0 after an earlier, larger step). Spans, benchmark steps and
+    `governor.track` all use it, so one process has one sampler thread.
+    """
+
+    def __init__(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        _watch(self)
+
+    def sample(self, mb: float):
+        if mb > self.peak_mb:
+            self.peak_mb = mb
+
+    def stop(self) -> float:
+        """Unregisters the watch and returns the peak increase in MB."""
+        with _WATCHES_LOCK:
+            _WATCHES.discard(self)
+        self.sample(current_rss_mb())
+        return self.peak_mb - self.start_mb
+
+_WATCHES = set()
+_WATCHES_LOCK = threading.Lock()
+_SAMPLER = None
+
+def _sample_rss():
+    while True:
+        time.sleep(RSS_SAMPLE_INTERVAL)
+        with _WATCHES_LOCK:
+            if _WATCHES:
+                mb = current_rss_mb()
+                for watch in _WATCHES:
+                    watch.sample(mb)
+
+def _watch(watch: RssWatch):
+    global _SAMPLER
+    with _WATCHES_LOCK:
+        _WATCHES.add(watch)
+        if _SAMPLER is None:
+            _SAMPLER = threading.Thread(target=_sample_rss, name="rss-sampler", daemon=True)
+            _SAMPLER.start()
+
+def set_enabled(enabled: bool):
+    """Turns tracing on or off for this process and any process it spawns."""
+    global _ENABLED
+    _ENABLED = bool(enabled)
+    os.environ[TRACE_ENV] = "1" if _ENABLED else "0"
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+class _NullSpan:
+    """Shared no-op span used while tracing is off."""
+    key = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def add(self, key: str, value):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    """A timed region; use as a context manager (see `span`)."""
+
+    def __init__(self, name: str, cat: str, attrs: dict, parent_id: str = None):
+        self.name, self.cat = name, cat
+        self.attrs = attrs
+        self.key = f"{os.getpid()}:{next(_IDS)}"
+        self.parent_id = parent_id
+        self._token = None
+
+    def set(self, **attrs):
+        """Records attributes (e.g. rows_out=len(df)) on this span."""
+        self.attrs.update(attrs)
+
+    def add(self, key: str, value):
+        """Accumulates a counter (e.g. bytes_written) on this span."""
+        self.attrs[key] = self.attrs.get(key, 0) + value
+
+    def __enter__(self):
+        if self.parent_id is None:
+            parent = _CURRENT.get()
+            self.parent_id = parent.key if parent is not None else None
+        self._token = _CURRENT.set(self)
+        self._rss = RssWatch()
+        self._cpu = time.process_time()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        _CURRENT.reset(self._token)
+        args = dict(self.attrs)
+        args["cpu_ms"] = (time.process_time() - self._cpu) * 1000
+        args["peak_rss_delta_mb"] = self._rss.stop()
+        args["span_id"], args["parent_id"] = self.key, self.parent_id
+        if exc_type is not None:
+            args["error"] = f"{exc_type.__name__}: {exc}"
+        event = {
+            "name": self.name, "cat": self.cat, "ph": "X",
+            "ts": self._start / 1000, "dur": (end - self._start) / 1000,
+            "pid": os.getpid(), "tid": threading.get_native_id(), "args": args,
+        }
+        with _EVENTS_LOCK:
+            _EVENTS.append(event)
+        return False
+
+def span(name: str, cat: str = "tool", parent_id=None, **attrs):
+    """
+    Opens a span: `with span("db.execute", cat="db") as s: ...; s.set(rows_out=n)`.
+
+    Args:
+        name: Span name (tools use their function name).
+        cat: Category shown in the trace viewer ("tool", "io", "db", "cache", ...).
+        parent_id: Explicit parent span key for work handed to another process.
+        **attrs: Initial attributes.
+    """
+    if not _ENABLED:
+        return _NULL_SPAN
+    return Span(name, cat, attrs, parent_id)
+
+def current_span():
+    """The innermost open span (a no-op span when tracing is off or none is open)."""
+    return (_CURRENT.get() if _ENABLED else None) or _NULL_SPAN
+
+def _path_size(value) -> int:
+    if isinstance(value, str) and len(value) < 4096:
+        try:
+            return os.path.getsize(value) if os.path.isfile(value) else 0
+        except (OSError, ValueError):
+            return 0
+    return 0
+
+def traced(func=None, *, name: str = None, cat: str = "tool"):
+    """
+    Decorator that runs a tool inside a span. Arguments that are file paths count
+    towards bytes_read.
+    """
+    if func is None:
+        return functools.partial(traced, name=name, cat=cat)
+    span_name = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _ENABLED:
+            return func(*args, **kwargs)
+        with Span(span_name, cat, {}) as s:
+            bytes_read = sum(_path_size(v) for v in (*args, *kwargs.values()))
+            if bytes_read:
+                s.add("bytes_read", bytes_read)
+            return func(*args, **kwargs)
+    return wrapper
+
+def events() -> list:
+    """A copy of the events recorded in this process so far."""
+    with _EVENTS_LOCK:
+        return list(_EVENTS)
+
+def clear():
+    with _EVENTS_LOCK:
+        _EVENTS.clear()
+
+def _parts_dir(run_dir: str) -> str:
+    return os.path.join(run_dir, ".trace")
+
+def flush_events(run_dir: str):
+    """Appends this process's events to a per-pid part file (used by pool workers)."""
+    with _EVENTS_LOCK:
+        pending = list(_EVENTS)
+        _EVENTS.clear()
+    if not pending:
+        return
+    os.makedirs(_parts_dir(run_dir), exist_ok=True)
+    with open(os.path.join(_parts_dir(run_dir), f"{os.getpid()}.jsonl"), "a") as f:
+        for event in pending:
+            f.write(json.dumps(event, default=str) + "\n")
+
+def summarize(trace_events: list) -> list:
+    """Aggregates events by span name: calls, wall/CPU time, peak RSS delta and counters."""
+    rows = {}
+    for event in trace_events:
+        args = event["args"]
+        row = rows.setdefault(event["name"], {
+            "span": event["name"], "cat": event["cat"], "calls": 0, "wall_ms": 0.0,
+            "cpu_ms": 0.0, "max_rss_delta_mb": 0.0, **{c: 0 for c in COUNTERS}
+        })
+        row["calls"] += 1
+        row["wall_ms"] += event["dur"] / 1000
+        row["cpu_ms"] += args.get("cpu_ms", 0.0)
+        row["max_rss_delta_mb"] = max(row["max_rss_delta_mb"], args.get("peak_rss_delta_mb", 0.0))
+        for counter in COUNTERS:
+            row[counter] += args.get(counter, 0)
+    return sorted(rows.values(), key=lambda r: r["wall_ms"], reverse=True)
+
+def write_trace(run_dir: str = None) -> dict:
+    """
+    Writes trace.json and trace_summary.md into the run directory, merging events
+    flushed by pool workers.
+
+    Args:
+        run_dir: Run directory (default: the current run, if one was created).
+
+    Returns:
+        dict: Paths of the trace and summary files (empty if nothing was recorded).
+    """
+    if run_dir is None:
+        import orchestrator
+        run_dir = orchestrator._RUN_CONTEXT["dir"]
+    trace_events = events()
+    parts_dir = _parts_dir(run_dir) if run_dir else None
+    if parts_dir and os.path.isdir(parts_dir):
+        for part in sorted(os.listdir(parts_dir)):
+            with open(os.path.join(parts_dir, part)) as f:
+                trace_events.extend(json.loads(line) for line in f if line.strip())
+    if not run_dir or not trace_events:
+        return {}
+
+    trace_path = os.path.join(run_dir, "trace.json")
+    with open(trace_path, "w") as f:
+        json.dump({"traceEvents": sorted(trace_events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}, f, default=str)
+
+    from tabulate import tabulate
+    summary = summarize(trace_events)
+    summary_path = os.path.join(run_dir, "trace_summary.md")
+    with open(summary_path, "w") as f:
+        f.write("# Trace Summary\n\n")
+        f.write(tabulate(summary, headers="keys", tablefmt="github", floatfmt=".1f"))
+        f.write("\n")
+    return {"trace": trace_path, "summary": summary_path}
+
+def _write_trace_at_exit():
+    # Pool workers flush part files instead; the process that owns the run writes the trace
+    if _ENABLED and multiprocessing.parent_process() is None:
+        write_trace()
+
+atexit.register(_write_trace_at_exit)
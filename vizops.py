@@ -1,15 +1,17 @@
 import pandas as pd
-import altair as alt
-import joblib
-from sklearn.metrics import roc_curve, confusion_matrix
-from sklearn.calibration import calibration_curve
 from orchestrator import save_altair_chart
+from registry import load_model
+from tracing import traced
 
+@traced
 def plot_roc_curve(model_path: str, test_path: str, output_dir: str = "vizops", target_col: str = "readmission_30d") -> str:
     """
     Generates a ROC curve chart and returns the path.
     """
-    model = joblib.load(model_path)
+    import altair as alt
+    from sklearn.metrics import roc_curve
+
+    model = load_model(model_path)
     df = pd.read_csv(test_path)
     
     if target_col not in df.columns:
@@ -45,11 +47,15 @@ def plot_roc_curve(model_path: str, test_path: str, output_dir: str = "vizops",
     
     return save_altair_chart(chart, "roc_curve", subdir=output_dir)
 
+@traced
 def plot_confusion_matrix(model_path: str, test_path: str, output_dir: str = "vizops", target_col: str = "readmission_30d", threshold: float = 0.5) -> str:
     """
     Generates a confusion matrix chart.
     """
-    model = joblib.load(model_path)
+    import altair as alt
+    from sklearn.metrics import confusion_matrix
+
+    model = load_model(model_path)
     df = pd.read_csv(test_path)
     
     if target_col not in df.columns:
@@ -88,11 +94,14 @@ def plot_confusion_matrix(model_path: str, test_path: str, output_dir: str = "vi
     
     return save_altair_chart(chart + text, "confusion_matrix", subdir=output_dir)
 
+@traced
 def plot_feature_importance(model_path: str, output_dir: str = "vizops") -> str:
     """
     Generates a feature importance bar chart.
     """
-    model = joblib.load(model_path)
+    import altair as alt
+
+    model = load_model(model_path)
     
     # Handle different model types if necessary, assuming XGBoost/LGBM/Sklearn with feature_importances_
     if hasattr(model, 'feature_importances_'):
@@ -120,11 +129,15 @@ def plot_feature_importance(model_path: str, output_dir: str = "vizops") -> str:
     else:
         raise ValueError("Model does not support feature importance.")
 
+@traced
 def plot_calibration_curve(model_path: str, test_path: str, output_dir: str = "vizops", target_col: str = "readmission_30d") -> str:
     """
     Generates a calibration plot.
     """
-    model = joblib.load(model_path)
+    import altair as alt
+    from sklearn.calibration import calibration_curve
+
+    model = load_model(model_path)
     df = pd.read_csv(test_path)
     
     if target_col not in df.columns:
@@ -159,3 +172,78 @@ def plot_calibration_curve(model_path: str, test_path: str, output_dir: str = "v
     chart = (points + line + diagonal).properties(title='Calibration Curve')
     
     return save_altair_chart(chart, "calibration_curve", subdir=output_dir)
+
+@traced
+def plot_shap_summary(summary_path: str, output_dir: str = "vizops", top_n: int = 20) -> str:
+    """
+    Charts an explain_predictions summary: global mean |SHAP| ranking next to the
+    dependence summaries (mean SHAP per value bin) of the top features.
+    """
+    import json
+    import altair as alt
+
+    with open(summary_path) as f:
+        summary = json.load(f)
+
+    ranking = pd.DataFrame(summary["global"]).head(top_n)
+    bars = alt.Chart(ranking).mark_bar().encode(
+        x=alt.X('mean_abs_shap:Q', title='Mean |SHAP| (log-odds)'),
+        y=alt.Y('feature:N', sort='-x', title=None),
+        tooltip=['rank', 'feature', 'mean_abs_shap', 'mean_shap']
+    ).properties(title='Global Feature Importance (SHAP)')
+
+    dependence = pd.DataFrame([
+        {"feature": feature, **b} for feature, bins in summary["dependence"].items()
+        for b in bins if not b["missing"]
+    ])
+    if dependence.empty:
+        return save_altair_chart(bars, "shap_summary", subdir=output_dir)
+
+    lines = alt.Chart(dependence).mark_line(point=True).encode(
+        x=alt.X('mean_value:Q', title='Feature value (bin mean)'),
+        y=alt.Y('mean_shap:Q', title='Mean SHAP'),
+        tooltip=['feature', 'bin_low', 'bin_high', 'rows', 'mean_value', 'mean_shap', 'std_shap']
+    ).properties(width=180, height=120).facet(
+        facet=alt.Facet('feature:N', sort=list(summary["dependence"])), columns=3
+    ).resolve_scale(x='independent', y='independent').properties(title='SHAP Dependence')
+
+    return save_altair_chart(alt.hconcat(bars, lines), "shap_summary", subdir=output_dir)
+
+@traced
+def plot_drift_summary(report_path: str, output_dir: str = "vizops") -> str:
+    """
+    Charts a monitor_drift report: PSI and KS per feature, colored by drift status,
+    with the alert thresholds as rules.
+    """
+    import json
+    import altair as alt
+
+    with open(report_path) as f:
+        report = json.load(f)
+
+    df = pd.DataFrame([
+        {"feature": row["feature"], "kind": row["kind"], "status": row["status"],
+         "PSI": row["psi"], "KS": row["ks"]}
+        for row in report["features"]
+    ])
+    status_color = alt.Color('status:N', scale=alt.Scale(
+        domain=['stable', 'warn', 'drift', 'no_data'], range=['#4c78a8', '#f2a541', '#e45756', '#bab0ac']
+    ))
+    thresholds = report["thresholds"]
+
+    def panel(metric: str, threshold: float):
+        bars = alt.Chart(df.dropna(subset=[metric])).mark_bar().encode(
+            x=alt.X(f'{metric}:Q'),
+            y=alt.Y('feature:N', sort=list(df["feature"]), title=None),
+            color=status_color,
+            tooltip=['feature', 'kind', 'status', 'PSI', 'KS']
+        )
+        rule = alt.Chart(pd.DataFrame({metric: [threshold]})).mark_rule(
+            color='gray', strokeDash=[5, 5]
+        ).encode(x=f'{metric}:Q')
+        return (bars + rule).properties(title=f'{metric} vs. training reference')
+
+    chart = alt.hconcat(panel("PSI", thresholds["psi_alert"]), panel("KS", thresholds["ks_alert"])).properties(
+        title=f"Drift: {report['rows']:,} rows from {report['source']}"
+    )
+    return save_altair_chart(chart, "drift_summary", subdir=output_dir)